@@ -1,10 +1,17 @@
+import logging
+
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from django.contrib.auth.models import User
+from django.urls import reverse
+from mahasiswa import bulk_import
 from mahasiswa.models import Mahasiswa
 from mahasiswa.serializers import MahasiswaSerializer
+from mahasiswa.fieldsets import Fieldset, apply_fieldset
+
+logger = logging.getLogger(__name__)
 
 
 @api_view(['GET'])
@@ -21,7 +28,7 @@ def admin_check(request):
 @permission_classes([IsAuthenticated, IsAdminUser])
 def admin_get_all_mahasiswa(request):
     """Get all mahasiswa profiles for admin"""
-    mahasiswa = Mahasiswa.objects.all().select_related('user').prefetch_related('skills', 'pengalaman')
+    mahasiswa = Mahasiswa.objects.all()
     
     # Filter by search query if provided
     search = request.GET.get('search', '')
@@ -45,7 +52,11 @@ def admin_get_all_mahasiswa(request):
     order_by = request.GET.get('order_by', '-created_at')
     mahasiswa = mahasiswa.order_by(order_by)
     
-    serializer = MahasiswaSerializer(mahasiswa, many=True)
+    # Kolom & relasi sesuai ?fields= / ?expand=
+    fieldset = Fieldset.from_request(request)
+    mahasiswa = apply_fieldset(mahasiswa, fieldset)
+    
+    serializer = MahasiswaSerializer(mahasiswa, many=True, fieldset=fieldset)
     return Response({
         'count': mahasiswa.count(),
         'results': serializer.data
@@ -92,3 +103,37 @@ def admin_statistics(request):
         'total_users': total_users,
         'total_skills': total_skills
     })
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def admin_import_mahasiswa(request):
+    """
+    Bulk import mahasiswa dari file CSV / JSONL (multipart field 'file').
+    File diproses `import_mahasiswa` di proses terpisah (hashing password per row terlalu lama
+    untuk satu request); response 202 berisi job_id, progres & hasil lewat admin_import_status.
+    """
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'error': 'File is required'}, status=status.HTTP_400_BAD_REQUEST)
+    file_format = request.data.get('format') or bulk_import.detect_format(upload.name)
+    if file_format not in bulk_import.FORMATS:
+        return Response({'error': f'Format must be one of {", ".join(bulk_import.FORMATS)}'}, status=status.HTTP_400_BAD_REQUEST)
+
+    job_id = bulk_import.start_job(upload, file_format)
+    logger.info('Import mahasiswa %s dimulai oleh %s (%s, %d byte)', job_id, request.user.username, upload.name, upload.size)
+    return Response({
+        'job_id': job_id,
+        'status': 'queued',
+        'status_url': request.build_absolute_uri(reverse('admin_import_status', args=[job_id])),
+    }, status=status.HTTP_202_ACCEPTED)
+
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdminUser])
+def admin_import_status(request, job_id):
+    """Status job import: queued / running / done / failed, plus created, failed & errors per row"""
+    job = bulk_import.job_status(job_id)
+    if job is None:
+        return Response({'error': 'Import job not found'}, status=status.HTTP_404_NOT_FOUND)
+    return Response({'job_id': job_id, **job})
@@ -1,3 +1,55 @@
-from django.test import TestCase
+import os
+import tempfile
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from mahasiswa import bulk_import
+from mahasiswa.models import Mahasiswa
+
+
+class AdminImportTest(TestCase):
+    """Import dari admin diproses command import_mahasiswa di proses terpisah, status lewat job_id"""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        settings_override = override_settings(BULK_IMPORT_DIR=self.directory.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.client = APIClient()
+        self.client.force_authenticate(User.objects.create(username='admin', is_staff=True))
+
+    def upload(self, body):
+        csv_file = SimpleUploadedFile('angkatan.csv', ('username,email,nama,nim,prodi\n' + body).encode())
+        with mock.patch.object(bulk_import.subprocess, 'Popen') as popen:
+            response = self.client.post(reverse('admin_import_mahasiswa'), {'file': csv_file}, format='multipart')
+        return response, popen
+
+    def test_import_runs_in_separate_process(self):
+        response, popen = self.upload('ani,ani@example.com,Ani,L200001,Informatika\n')
+        self.assertEqual(response.status_code, 202)
+        status_url = reverse('admin_import_status', args=[response.data['job_id']])
+        self.assertEqual(self.client.get(status_url).data['status'], 'queued')
+        # Request tidak membuat user; jalankan command persis seperti yang di-spawn
+        self.assertFalse(Mahasiswa.objects.exists())
+        command = popen.call_args.args[0]
+        self.assertEqual(command[2], 'import_mahasiswa')
+        with open(os.devnull, 'w') as devnull:
+            call_command(*command[2:], stdout=devnull)
+
+        job = self.client.get(status_url).data
+        self.assertEqual((job['status'], job['created'], job['failed']), ('done', 1, 0))
+        self.assertTrue(Mahasiswa.objects.filter(nim='L200001').exists())
+        self.assertEqual(sorted(os.listdir(self.directory.name)), [f"{response.data['job_id']}.{name}" for name in ('json', 'log')])
+
+    def test_unknown_job_is_not_found(self):
+        for job_id in ('0' * 32, '..%2F..%2Fetc%2Fpasswd'):
+            response = self.client.get(reverse('admin_import_status', args=[job_id]))
+            self.assertEqual(response.status_code, 404)
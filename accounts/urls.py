@@ -11,6 +11,8 @@ urlpatterns = [
     # Admin endpoints
     path('admin/check/', admin_views.admin_check, name='admin_check'),
     path('admin/mahasiswa/', admin_views.admin_get_all_mahasiswa, name='admin_mahasiswa'),
+    path('admin/mahasiswa/import/', admin_views.admin_import_mahasiswa, name='admin_import_mahasiswa'),
+    path('admin/mahasiswa/import/<str:job_id>/', admin_views.admin_import_status, name='admin_import_status'),
     path('admin/mahasiswa/<int:pk>/toggle/', admin_views.admin_toggle_mahasiswa_status, name='admin_toggle_status'),
     path('admin/statistics/', admin_views.admin_statistics, name='admin_statistics'),
 ]
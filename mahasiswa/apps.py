@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class MahasiswaConfig(AppConfig):
     name = 'mahasiswa'
+
+    def ready(self):
+        from . import signals  # noqa: F401
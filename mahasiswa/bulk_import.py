@@ -0,0 +1,395 @@
+"""
+Bulk import mahasiswa per angkatan dari CSV / JSONL (user + profil + skills + pengalaman).
+
+File dibaca secara streaming dan diproses per chunk, jadi memory tidak bergantung
+pada jumlah row:
+
+1. Validasi field per row (validator model, tanpa query) lalu cek duplikat
+   username / email / NIM untuk seluruh chunk dalam tiga query.
+2. Password di-hash (PBKDF2) paralel di thread pool; hashlib melepas GIL.
+   Row tanpa password mendapat unusable password (reset lewat alur lupa password).
+3. User, Profile, Mahasiswa, Skill dan Pengalaman satu chunk dibuat dengan
+   bulk_create di dalam satu transaksi. Jika chunk gagal karena konflik (import lain
+   berjalan bersamaan), chunk itu diulang per row dengan savepoint supaya row lain
+   tetap masuk.
+
+Row yang gagal dilaporkan (nomor row + error per field) tanpa menghentikan import.
+
+Import dari endpoint admin tidak dijalankan di request (hashing password ribuan row
+melewati timeout worker): file disimpan di BULK_IMPORT_DIR lalu diproses command
+import_mahasiswa di proses terpisah (start_job), progres dibaca lewat job_status.
+
+Kolom: username, email, password, nama, nim, prodi, angkatan, fakultas, telepon,
+alamat, bio, linkedin, github, instagram, website, tanggal_lahir (YYYY-MM-DD),
+skills (list JSON atau dipisah ';') dan pengalaman (list JSON berisi posisi,
+organisasi, tahun_mulai, tahun_selesai, deskripsi).
+"""
+import csv
+import io
+import json
+import os
+import re
+import shutil
+import subprocess
+import sys
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models.functions import Lower
+
+from . import cache, minhash
+from .models import Mahasiswa, Pengalaman
+
+CSV = 'csv'
+JSONL = 'jsonl'
+FORMATS = (CSV, JSONL)
+DEFAULT_CHUNK_SIZE = 500
+# Error yang disimpan di hasil (semua error tetap dihitung & dikirim ke on_error)
+MAX_REPORTED_ERRORS = 1000
+
+MAHASISWA_FIELDS = (
+    'nama', 'nim', 'prodi', 'angkatan', 'fakultas', 'email', 'telepon', 'alamat', 'bio',
+    'linkedin', 'github', 'instagram', 'website',
+)
+PENGALAMAN_FIELDS = ('posisi', 'organisasi', 'tahun_mulai', 'tahun_selesai', 'deskripsi')
+SKILL_SEPARATOR = ';'
+JOB_ID_RE = re.compile(r'^[0-9a-f]{32}$')
+
+
+class RowError(Exception):
+    def __init__(self, errors):
+        super().__init__(errors)
+        self.errors = errors
+
+
+@dataclass
+class ImportResult:
+    created: int = 0
+    failed: int = 0
+    errors: list = field(default_factory=list)
+
+    def add_error(self, error):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append(error)
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'errors': self.errors,
+            'errors_truncated': self.failed > len(self.errors),
+        }
+
+
+def detect_format(filename):
+    return JSONL if filename.lower().endswith(('.jsonl', '.ndjson')) else CSV
+
+
+def read_rows(stream, file_format):
+    """Yield (nomor row, dict) dari stream teks; row JSON yang tidak valid di-yield sebagai RowError"""
+    if file_format == CSV:
+        for number, row in enumerate(csv.DictReader(stream), start=1):
+            yield number, row
+        return
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+            if not isinstance(row, dict):
+                raise ValueError('Expected a JSON object')
+        except ValueError as e:
+            row = RowError({'row': [f'Invalid JSON: {e}']})
+        yield number, row
+
+
+def open_upload(uploaded_file):
+    """Stream teks UTF-8 (BOM diabaikan) dari file upload / file biner"""
+    return io.TextIOWrapper(uploaded_file, encoding='utf-8-sig', newline='')
+
+
+def _text(row, name):
+    value = row.get(name)
+    return '' if value is None else str(value).strip()
+
+
+def _list(value):
+    if value in (None, ''):
+        return []
+    if isinstance(value, str):
+        value = value.strip()
+        if value.startswith('['):
+            value = json.loads(value)
+        else:
+            return [part.strip() for part in value.split(SKILL_SEPARATOR) if part.strip()]
+    if not isinstance(value, list):
+        raise ValueError('Expected a list')
+    return value
+
+
+def _validate(instance, exclude=()):
+    try:
+        instance.clean_fields(exclude=exclude)
+    except ValidationError as e:
+        raise RowError(e.message_dict)
+
+
+def build_row(row):
+    """Validasi satu row; return dict berisi instance (belum disimpan) atau RowError"""
+    from skills.models import normalize_skill_name
+
+    if isinstance(row, RowError):
+        raise row
+    username, email = _text(row, 'username'), _text(row, 'email')
+    user = User(username=username, email=email, is_active=True)
+    _validate(user, exclude=['password'])
+    if not email:
+        raise RowError({'email': ['This field is required.']})
+
+    mahasiswa = Mahasiswa(**{name: _text(row, name) for name in MAHASISWA_FIELDS})
+    for name in ('linkedin', 'github', 'instagram', 'website'):
+        setattr(mahasiswa, name, getattr(mahasiswa, name) or None)
+    tanggal_lahir = _text(row, 'tanggal_lahir')
+    if tanggal_lahir:
+        try:
+            mahasiswa.tanggal_lahir = date.fromisoformat(tanggal_lahir)
+        except ValueError:
+            raise RowError({'tanggal_lahir': ['Use YYYY-MM-DD.']})
+    mahasiswa.email = mahasiswa.email or email
+    _validate(mahasiswa, exclude=['user', 'foto_profil'])
+
+    try:
+        skills = [' '.join(str(name).split()) for name in _list(row.get('skills'))]
+        entries = _list(row.get('pengalaman'))
+    except ValueError as e:
+        raise RowError({'skills/pengalaman': [str(e)]})
+    pengalaman = []
+    for entry in entries:
+        if not isinstance(entry, dict) or not entry.get('posisi') or not entry.get('organisasi'):
+            raise RowError({'pengalaman': ['Each entry needs posisi and organisasi.']})
+        experience = Pengalaman(**{name: str(entry.get(name) or '') for name in PENGALAMAN_FIELDS})
+        _validate(experience, exclude=['mahasiswa'])
+        pengalaman.append(experience)
+
+    unique_skills = {}
+    for name in skills:
+        if normalize_skill_name(name):
+            unique_skills.setdefault(normalize_skill_name(name), name)
+
+    return {
+        'user': user,
+        'password': _text(row, 'password') or None,
+        'mahasiswa': mahasiswa,
+        'skills': unique_skills,
+        'pengalaman': pengalaman,
+    }
+
+
+def _duplicates(records):
+    """Error duplikat username / email / NIM, di dalam chunk maupun dengan data yang sudah ada"""
+    taken = {
+        'username': set(User.objects.filter(
+            username__in=[record['user'].username for _, record in records]
+        ).values_list('username', flat=True)),
+        # Email dibandingkan tanpa membedakan huruf besar/kecil (NIM & username disimpan apa adanya,
+        # sama seperti registrasi)
+        'email': set(User.objects.annotate(email_lower=Lower('email')).filter(
+            email_lower__in=[record['user'].email.lower() for _, record in records]
+        ).values_list('email_lower', flat=True)),
+        'nim': set(Mahasiswa.objects.filter(
+            nim__in=[record['mahasiswa'].nim for _, record in records]
+        ).values_list('nim', flat=True)),
+    }
+    errors = {}
+    for number, record in records:
+        values = {
+            'username': record['user'].username,
+            'email': record['user'].email.lower(),
+            'nim': record['mahasiswa'].nim,
+        }
+        row_errors = {name: ['Already exists.'] for name, value in values.items() if value in taken[name]}
+        if row_errors:
+            errors[number] = row_errors
+        else:
+            for name, value in values.items():
+                taken[name].add(value)
+    return errors
+
+
+def _save(records):
+    """bulk_create satu kelompok record yang sudah valid (dipanggil di dalam transaksi)"""
+    from skills.models import Skill, SkillTag
+
+    Profile = apps.get_model('accounts', 'Profile')
+
+    users = User.objects.bulk_create([record['user'] for record in records])
+    if any(user.pk is None for user in users):
+        # Database tanpa RETURNING pada bulk insert
+        ids = dict(User.objects.filter(username__in=[user.username for user in users]).values_list('username', 'pk'))
+        for user in users:
+            user.pk = ids[user.username]
+    Profile.objects.bulk_create([Profile(user=user, is_mahasiswa=True, is_admin=False) for user in users])
+
+    profiles = []
+    for record, user in zip(records, users):
+        record['mahasiswa'].user = user
+        profiles.append(record['mahasiswa'])
+    profiles = Mahasiswa.objects.bulk_create(profiles)
+    if any(profile.pk is None for profile in profiles):
+        ids = dict(Mahasiswa.objects.filter(nim__in=[profile.nim for profile in profiles]).values_list('nim', 'pk'))
+        for profile in profiles:
+            profile.pk = ids[profile.nim]
+
+    tags = SkillTag.objects.resolve(name for record in records for name in record['skills'].values())
+    skills, experiences = [], []
+    for record, profile in zip(records, profiles):
+        # bulk_create melewati Skill.save(): nama_normalized & tag diisi di sini
+        for normalized, name in record['skills'].items():
+            skills.append(Skill(mahasiswa=profile, nama=name, nama_normalized=normalized, tag=tags.get(normalized)))
+        for experience in record['pengalaman']:
+            experience.mahasiswa = profile
+            experiences.append(experience)
+    Skill.objects.bulk_create(skills, batch_size=1000)
+    Pengalaman.objects.bulk_create(experiences, batch_size=1000)
+    return [profile.pk for profile in profiles], {skill.tag_id for skill in skills if skill.tag_id}
+
+
+def _after_import(mahasiswa_ids, tag_ids):
+    """Efek samping yang biasanya dijalankan signal (bulk_create tidak mengirim signal)"""
+    from skills import leaderboards
+
+    cache.invalidate(
+        *cache.HOMEPAGE_NAMESPACES, cache.FACETS, cache.SUGGEST, cache.SKILL_SUGGEST
+    )
+    minhash.refresh(mahasiswa_ids)
+    leaderboards.refresh(mahasiswa_ids, tag_ids)
+
+
+def _import_chunk(chunk, hasher, result, on_error):
+    records = []
+    for number, row in chunk:
+        try:
+            records.append((number, build_row(row)))
+        except RowError as e:
+            _fail(result, on_error, number, row, e.errors)
+
+    duplicates = _duplicates(records) if records else {}
+    for number, record in records:
+        if number in duplicates:
+            _fail(result, on_error, number, record, duplicates[number])
+    records = [(number, record) for number, record in records if number not in duplicates]
+    if not records:
+        return
+
+    passwords = hasher.map(make_password, [record['password'] for _, record in records])
+    for (_, record), password in zip(records, passwords):
+        record['user'].password = password
+
+    try:
+        with transaction.atomic():
+            ids, tag_ids = _save([record for _, record in records])
+    except IntegrityError:
+        # Konflik dengan import / registrasi yang berjalan bersamaan: ulang per row
+        ids, tag_ids = [], set()
+        for number, record in records:
+            try:
+                with transaction.atomic():
+                    row_ids, row_tags = _save([record])
+                ids += row_ids
+                tag_ids |= row_tags
+            except IntegrityError as e:
+                _fail(result, on_error, number, record, {'row': [str(e)]})
+    result.created += len(ids)
+    if ids:
+        _after_import(ids, tag_ids)
+
+
+def _fail(result, on_error, number, row, errors):
+    if isinstance(row, dict) and 'mahasiswa' in row:
+        nim = row['mahasiswa'].nim
+    else:
+        nim = _text(row, 'nim') if isinstance(row, dict) else ''
+    error = {'row': number, 'nim': nim, 'errors': errors}
+    result.add_error(error)
+    if on_error is not None:
+        on_error(error)
+
+
+def import_rows(rows, chunk_size=DEFAULT_CHUNK_SIZE, workers=None, on_error=None, on_chunk=None):
+    """
+    Import iterable (nomor row, dict) per chunk. `on_error(error)` dipanggil untuk setiap
+    row yang gagal, `on_chunk(result)` setelah setiap chunk. Return ImportResult.
+    """
+    result = ImportResult()
+    workers = workers or min(8, os.cpu_count() or 1)
+    with ThreadPoolExecutor(max_workers=workers) as hasher:
+        chunk = []
+        for item in rows:
+            chunk.append(item)
+            if len(chunk) >= chunk_size:
+                _import_chunk(chunk, hasher, result, on_error)
+                chunk = []
+                if on_chunk is not None:
+                    on_chunk(result)
+        if chunk:
+            _import_chunk(chunk, hasher, result, on_error)
+            if on_chunk is not None:
+                on_chunk(result)
+    return result
+
+
+# ----------------------------------------------------------------------
+# Job import di latar belakang (endpoint admin)
+# ----------------------------------------------------------------------
+def _job_path(job_id, suffix):
+    return os.path.join(settings.BULK_IMPORT_DIR, f'{job_id}{suffix}')
+
+
+def write_status(path, status, **data):
+    """Tulis file status job secara atomik (tmp + rename) supaya pembaca tidak melihat JSON setengah jadi"""
+    tmp = f'{path}.tmp'
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump({'status': status, **data}, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def start_job(uploaded_file, file_format):
+    """Simpan upload lalu jalankan `import_mahasiswa` di proses terpisah; return job id"""
+    os.makedirs(settings.BULK_IMPORT_DIR, exist_ok=True)
+    job_id = uuid.uuid4().hex
+    path, status_path = _job_path(job_id, f'.{file_format}'), _job_path(job_id, '.json')
+    with open(path, 'wb') as f:
+        shutil.copyfileobj(uploaded_file, f)
+    write_status(status_path, 'queued')
+
+    with open(_job_path(job_id, '.log'), 'ab') as log:
+        subprocess.Popen(
+            [
+                sys.executable, os.path.join(settings.BASE_DIR, 'manage.py'), 'import_mahasiswa', path,
+                '--format', file_format, '--status-file', status_path, '--delete-input',
+            ],
+            stdout=log, stderr=subprocess.STDOUT, stdin=subprocess.DEVNULL,
+            # Tetap berjalan walaupun worker web di-restart
+            start_new_session=True,
+        )
+    return job_id
+
+
+def job_status(job_id):
+    """Isi file status job (status queued / running / done / failed + ImportResult); None jika tidak ada"""
+    if not JOB_ID_RE.match(job_id or ''):
+        return None
+    try:
+        with open(_job_path(job_id, '.json'), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
@@ -0,0 +1,69 @@
+"""
+Cache helpers untuk endpoint listing mahasiswa.
+
+Setiap namespace (mis. 'latest', 'most_viewed') punya nomor versi sendiri di
+cache. Key data selalu memuat versi tersebut, jadi invalidasi cukup menaikkan
+versi - entry lama otomatis tidak terpakai dan habis oleh TTL.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from rest_framework.response import Response
+
+LATEST = 'latest'
+MOST_VIEWED = 'most_viewed'
+FACETS = 'facets'
+SUGGEST = 'suggest'
+SKILL_SUGGEST = 'skill_suggest'
+TRENDING = 'trending'
+HOMEPAGE_NAMESPACES = (LATEST, MOST_VIEWED, TRENDING)
+
+
+def _version_key(namespace):
+    return f'mahasiswa:{namespace}:version'
+
+
+def get_version(namespace):
+    version = cache.get(_version_key(namespace))
+    if version is None:
+        cache.add(_version_key(namespace), 1, timeout=None)
+        version = cache.get(_version_key(namespace), 1)
+    return version
+
+
+def make_key(namespace, *parts):
+    suffix = ':'.join(str(part) for part in parts)
+    return f'mahasiswa:{namespace}:v{get_version(namespace)}:{suffix}'
+
+
+def invalidate(*namespaces):
+    """Naikkan versi namespace setelah transaksi commit (tidak ada data lama yang ter-cache ulang)"""
+    def bump():
+        for namespace in namespaces:
+            try:
+                cache.incr(_version_key(namespace))
+            except ValueError:
+                cache.set(_version_key(namespace), 1, timeout=None)
+
+    transaction.on_commit(bump)
+
+
+class CachedListMixin:
+    """
+    Cache response list API per namespace + query string.
+    Subclass wajib mengisi `cache_namespace`.
+    """
+    cache_namespace = None
+
+    def get_cache_timeout(self):
+        return getattr(settings, 'HOMEPAGE_CACHE_TIMEOUT', 300)
+
+    def list(self, request, *args, **kwargs):
+        key = make_key(self.cache_namespace, request.get_host(), request.query_params.urlencode())
+        data = cache.get(key)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        cache.set(key, response.data, self.get_cache_timeout())
+        return response
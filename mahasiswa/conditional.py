@@ -0,0 +1,71 @@
+"""
+Conditional GET (ETag / Last-Modified) untuk detail profil mahasiswa.
+
+Validator dihitung dengan satu query agregat: updated_at, views_count & unique_viewers
+profil (keduanya ditulis flush buffer tanpa menyentuh updated_at), plus jumlah dan
+waktu modifikasi terakhir skills, endorsements, talents dan pengalaman. Jumlah row
+ikut di-hash supaya penghapusan child row juga mengubah ETag.
+"""
+import hashlib
+
+from django.db.models import Count, Max, OuterRef, Subquery
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+from .models import Mahasiswa, Pengalaman
+
+
+def _child_aggregate(queryset, path, aggregate):
+    return Subquery(
+        queryset.filter(**{path: OuterRef('pk')})
+        .order_by().values(path).annotate(value=aggregate).values('value')
+    )
+
+
+def get_profile_validators(mahasiswa, request):
+    """Return (etag, last_modified) untuk representasi detail profil"""
+    from skills.models import Skill, SkillEndorsement
+    from talents.models import Talent
+
+    children = {
+        'skills': (Skill.objects.all(), 'mahasiswa', 'updated_at'),
+        'endorsements': (SkillEndorsement.objects.all(), 'skill__mahasiswa', 'created_at'),
+        'talents': (Talent.objects.all(), 'mahasiswa', 'updated_at'),
+        'pengalaman': (Pengalaman.objects.all(), 'mahasiswa', 'updated_at'),
+    }
+    annotations = {}
+    for name, (queryset, path, timestamp_field) in children.items():
+        annotations[f'{name}_count'] = _child_aggregate(queryset, path, Count('pk'))
+        annotations[f'{name}_modified'] = _child_aggregate(queryset, path, Max(timestamp_field))
+
+    state = Mahasiswa.objects.filter(pk=mahasiswa.pk).annotate(**annotations).values(
+        'updated_at', 'views_count', 'unique_viewers', *annotations.keys()
+    ).get()
+
+    timestamps = [state['updated_at']] + [
+        state[f'{name}_modified'] for name in children if state[f'{name}_modified']
+    ]
+    last_modified = max(timestamps)
+
+    # Query string ikut di-hash: representasi bisa berbeda per parameter request
+    fingerprint = '|'.join(
+        [str(mahasiswa.pk), request.META.get('QUERY_STRING', '')]
+        + [str(state[key]) for key in sorted(state)]
+    )
+    etag = 'W/"%s"' % hashlib.md5(fingerprint.encode()).hexdigest()
+    return etag, last_modified
+
+
+def conditional_response(request, etag, last_modified):
+    """304 Not Modified jika If-None-Match / If-Modified-Since cocok, selain itu None"""
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=int(last_modified.timestamp()),
+    )
+
+
+def set_validator_headers(response, etag, last_modified):
+    response['ETag'] = etag
+    response['Last-Modified'] = http_date(last_modified.timestamp())
+    return response
@@ -0,0 +1,59 @@
+"""
+Facet counts (prodi, fakultas, angkatan, top skills) untuk direktori mahasiswa.
+
+Setiap facet dihitung dengan satu query GROUP BY atas himpunan mahasiswa yang
+sudah difilter, dan hasilnya di-cache per kombinasi filter.
+"""
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache as django_cache
+from django.db.models import Count
+
+from . import cache
+
+FACET_FIELDS = ['prodi', 'fakultas', 'angkatan']
+TOP_SKILLS_LIMIT = 20
+
+
+def compute_facets(queryset):
+    """Hitung facet dari queryset yang sudah difilter (ordering & annotation diabaikan)"""
+    from skills.models import Skill
+
+    matching_ids = queryset.order_by().values('pk')
+    facets = {}
+    for field in FACET_FIELDS:
+        rows = (
+            queryset.model.objects.filter(pk__in=matching_ids)
+            .exclude(**{field: ''})
+            .values(field)
+            .annotate(count=Count('pk'))
+            .order_by('-count', field)
+        )
+        facets[field] = [{'value': row[field], 'count': row['count']} for row in rows]
+
+    # Group by integer tag_id (SkillTag kanonik), bukan nama skill free text
+    skill_rows = (
+        Skill.objects.filter(mahasiswa__in=matching_ids, tag__isnull=False)
+        .values('tag', 'tag__nama')
+        .annotate(count=Count('mahasiswa', distinct=True))
+        .order_by('-count', 'tag__nama')[:TOP_SKILLS_LIMIT]
+    )
+    facets['skills'] = [
+        {'value': row['tag__nama'], 'tag': row['tag'], 'count': row['count']} for row in skill_rows
+    ]
+    return facets
+
+
+def get_facets(queryset, filter_params):
+    """
+    Facet counts dengan cache per kombinasi filter.
+    `filter_params` adalah list (key, values) parameter filter yang dipakai request.
+    """
+    digest = hashlib.md5(repr(sorted(filter_params)).encode()).hexdigest()
+    key = cache.make_key(cache.FACETS, digest)
+    facets = django_cache.get(key)
+    if facets is None:
+        facets = compute_facets(queryset)
+        django_cache.set(key, facets, getattr(settings, 'FACETS_CACHE_TIMEOUT', 300))
+    return facets
@@ -0,0 +1,102 @@
+"""
+Sparse fieldsets (?fields=) dan opt-in expansion (?expand=) untuk MahasiswaSerializer.
+
+Tanpa kedua parameter representasi lengkap dipertahankan (skills + endorsements,
+talents, pengalaman) supaya client lama tidak berubah. Jika salah satunya dikirim,
+relasi nested hanya disertakan bila disebut di ?expand= (atau ?fields=), dan
+endorsement terbaru per skill hanya lewat `skills.endorsements`.
+
+Contoh: ?fields=id,nama,prodi,foto_profil  atau  ?fields=id,nama&expand=skills
+"""
+from django.db.models import Prefetch, prefetch_related_objects
+
+NESTED_FIELDS = ('skills', 'talents', 'pengalaman')
+SKILL_ENDORSEMENTS = 'skills.endorsements'
+EXPANDABLE = set(NESTED_FIELDS) | {SKILL_ENDORSEMENTS}
+
+
+def _split(value):
+    return {part.strip() for part in value.split(',') if part.strip()}
+
+
+class Fieldset:
+    """Field & relasi yang diminta client; None berarti parameter tidak dikirim"""
+
+    def __init__(self, fields=None, expand=None):
+        self.fields = fields
+        self.expand = expand
+
+    @classmethod
+    def from_request(cls, request):
+        # Hanya untuk read: request write selalu memakai semua field serializer
+        if request is None or request.method not in ('GET', 'HEAD'):
+            return cls()
+        params = getattr(request, 'query_params', request.GET)
+        fields = params.get('fields')
+        expand = params.get('expand')
+        return cls(
+            _split(fields) if fields is not None else None,
+            _split(expand) if expand is not None else None,
+        )
+
+    @property
+    def is_default(self):
+        return self.fields is None and self.expand is None
+
+    @property
+    def requested(self):
+        return (self.fields or set()) | (self.expand or set())
+
+    def nested(self):
+        """Relasi nested yang disertakan"""
+        if self.is_default:
+            return set(NESTED_FIELDS)
+        return {name.split('.')[0] for name in self.requested & EXPANDABLE}
+
+    def include_endorsements(self):
+        return self.is_default or SKILL_ENDORSEMENTS in self.requested
+
+    def includes(self, name):
+        if name in NESTED_FIELDS:
+            return name in self.nested()
+        return self.fields is None or name in self.fields
+
+
+def apply_fieldset(queryset, fieldset):
+    """Sempitkan queryset Mahasiswa sesuai fieldset: only() + prefetch hanya untuk relasi yang diminta"""
+    if fieldset.fields is not None:
+        concrete = {field.name for field in queryset.model._meta.concrete_fields}
+        columns = ['id'] + sorted(name for name in fieldset.fields if name in concrete)
+        if 'username' in fieldset.fields:
+            columns.append('user__username')
+        queryset = queryset.only(*columns)
+
+    if fieldset.includes('username'):
+        queryset = queryset.select_related('user')
+    return queryset.prefetch_related(*_prefetches(fieldset))
+
+
+def prefetch_fieldset(instances, fieldset):
+    """Prefetch relasi fieldset untuk instance yang sudah dimuat (mis. response create/update)"""
+    for instance in instances:
+        # Cache lama (sebelum sync skills/pengalaman) dibuang
+        instance._prefetched_objects_cache = {}
+    prefetch_related_objects(instances, *_prefetches(fieldset))
+
+
+def _prefetches(fieldset):
+    from skills.models import Skill, recent_endorsements_prefetch
+
+    lookups = []
+    nested = fieldset.nested()
+    if 'skills' in nested:
+        if fieldset.include_endorsements():
+            skills = Skill.objects.prefetch_related(recent_endorsements_prefetch())
+        else:
+            # endorsement_count tersimpan di kolom Skill: tidak perlu COUNT per skill
+            skills = Skill.objects.all()
+        lookups.append(Prefetch('skills', queryset=skills))
+    for name in ('talents', 'pengalaman'):
+        if name in nested:
+            lookups.append(name)
+    return lookups
@@ -0,0 +1,78 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from mahasiswa.models import ProfileRecommendation
+from mahasiswa.recommendations import BATCH_BYTES_PER_SCORE, load_skill_matrix, top_k_similar
+
+WRITE_BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        'Hitung top-k profil mirip (cosine similarity vektor skill) untuk semua mahasiswa aktif '
+        'dan simpan ke tabel ProfileRecommendation yang dibaca endpoint recommendations'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top-k', type=int, default=10)
+        parser.add_argument('--memory-mb', type=int, default=256,
+                            help='Batas memory matriks skor + index argpartition per batch (menentukan jumlah baris per batch)')
+        parser.add_argument('--min-score', type=float, default=0.0)
+
+    def handle(self, *args, **options):
+        try:
+            import numpy as np  # noqa: F401
+            import scipy  # noqa: F401
+        except ImportError:
+            raise CommandError('compute_recommendations membutuhkan numpy dan scipy (pip install numpy scipy)')
+
+        started = time.monotonic()
+        matrix, mahasiswa_ids = load_skill_matrix()
+        total = matrix.shape[0]
+        self.stdout.write(f'Matriks {total} mahasiswa x {matrix.shape[1]} skill ({matrix.nnz} entri)')
+
+        # Batch: batch_size x total x (skor float32 + index int64) <= memory-mb
+        batch_bytes = options['memory_mb'] * 1024 * 1024
+        batch_size = max(1, min(total or 1, batch_bytes // (BATCH_BYTES_PER_SCORE * max(total, 1))))
+        computed_at = timezone.now()
+
+        written = 0
+        pending_ids, pending_rows = [], []
+
+        def write():
+            nonlocal written
+            with transaction.atomic():
+                ProfileRecommendation.objects.filter(mahasiswa_id__in=pending_ids).delete()
+                ProfileRecommendation.objects.bulk_create(pending_rows, batch_size=1000)
+            written += len(pending_rows)
+            pending_ids.clear()
+            pending_rows.clear()
+
+        for row, similar in top_k_similar(matrix, options['top_k'], batch_size, options['min_score']):
+            mahasiswa_id = int(mahasiswa_ids[row])
+            pending_ids.append(mahasiswa_id)
+            pending_rows.extend(
+                ProfileRecommendation(
+                    mahasiswa_id=mahasiswa_id,
+                    recommended_id=int(mahasiswa_ids[column]),
+                    score=score,
+                    rank=rank,
+                    computed_at=computed_at,
+                )
+                for rank, (column, score) in enumerate(similar, start=1)
+            )
+            if len(pending_ids) >= min(batch_size, WRITE_BATCH_SIZE):
+                write()
+        if pending_ids:
+            write()
+
+        # Rekomendasi lama (profil nonaktif / tanpa skill lagi) tidak diperbarui run ini
+        stale, _ = ProfileRecommendation.objects.filter(computed_at__lt=computed_at).delete()
+
+        self.stdout.write(self.style.SUCCESS(
+            f'{written} rekomendasi untuk {total} mahasiswa disimpan, {stale} rekomendasi lama dihapus '
+            f'({time.monotonic() - started:.1f} detik)'
+        ))
@@ -0,0 +1,66 @@
+import json
+import os
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from mahasiswa import bulk_import
+
+
+class Command(BaseCommand):
+    help = 'Import mahasiswa (user, profil, skills, pengalaman) dari file CSV / JSONL secara streaming per chunk'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File CSV / JSONL, atau '-' untuk stdin")
+        parser.add_argument('--format', choices=bulk_import.FORMATS, help='Default: dari ekstensi file')
+        parser.add_argument('--chunk-size', type=int, default=bulk_import.DEFAULT_CHUNK_SIZE)
+        parser.add_argument('--workers', type=int, help='Thread untuk hashing password')
+        parser.add_argument('--errors-file', help='Tulis row yang gagal sebagai JSONL ke file ini')
+        parser.add_argument('--status-file', help='Tulis progres & hasil sebagai JSON ke file ini (job import admin)')
+        parser.add_argument('--delete-input', action='store_true', help='Hapus file input setelah selesai')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or bulk_import.detect_format(path)
+        try:
+            stream = sys.stdin if path == '-' else open(path, encoding='utf-8-sig', newline='')
+        except OSError as e:
+            raise CommandError(str(e))
+        errors_file = open(options['errors_file'], 'w', encoding='utf-8') if options['errors_file'] else None
+        status_file = options['status_file']
+
+        def on_error(error):
+            if errors_file is not None:
+                errors_file.write(json.dumps(error, ensure_ascii=False) + '\n')
+            else:
+                self.stderr.write(f"Row {error['row']} ({error['nim']}): {json.dumps(error['errors'], ensure_ascii=False)}")
+
+        def on_chunk(result):
+            self.stdout.write(f'{result.created} dibuat, {result.failed} gagal')
+            if status_file:
+                bulk_import.write_status(status_file, 'running', **result.as_dict())
+
+        try:
+            result = bulk_import.import_rows(
+                bulk_import.read_rows(stream, file_format),
+                chunk_size=options['chunk_size'],
+                workers=options['workers'],
+                on_error=on_error,
+                on_chunk=on_chunk,
+            )
+        except Exception as e:
+            if status_file:
+                bulk_import.write_status(status_file, 'failed', error=str(e))
+            raise
+        finally:
+            if stream is not sys.stdin:
+                stream.close()
+                if options['delete_input']:
+                    os.remove(path)
+            if errors_file is not None:
+                errors_file.close()
+
+        if status_file:
+            bulk_import.write_status(status_file, 'done', **result.as_dict())
+
+        self.stdout.write(self.style.SUCCESS(f'{result.created} mahasiswa diimport, {result.failed} row gagal'))
@@ -0,0 +1,51 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from mahasiswa import retention
+
+
+class Command(BaseCommand):
+    help = (
+        'Retensi ProfileView: ringkas user_agent/referrer row lama, rollup + arsip (opsional) '
+        'lalu hapus row melewati masa retensi per batch. Aman dijalankan saat traffic live.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=settings.PROFILE_VIEW_RETENTION_DAYS,
+                            help='Hapus ProfileView yang lebih tua dari N hari')
+        parser.add_argument('--compact-after', type=int, default=settings.PROFILE_VIEW_COMPACT_AFTER_DAYS,
+                            help='Ringkas user_agent/referrer row yang lebih tua dari N hari (0 = nonaktif)')
+        parser.add_argument('--hourly-days', type=int, default=settings.PROFILE_VIEW_HOURLY_RETENTION_DAYS,
+                            help='Hapus rollup per jam yang lebih tua dari N hari (0 = nonaktif)')
+        parser.add_argument('--archive-dir', default=settings.PROFILE_VIEW_ARCHIVE_DIR or None,
+                            help='Tulis row yang dihapus ke file JSONL gzip di direktori ini')
+        parser.add_argument('--batch-size', type=int, default=1000)
+        parser.add_argument('--sleep', type=float, default=0.05,
+                            help='Jeda antar batch (detik) supaya tidak membebani database')
+
+    def handle(self, *args, **options):
+        if options['days'] <= 0 or options['batch_size'] <= 0:
+            raise CommandError('--days dan --batch-size harus lebih dari 0')
+        now = timezone.now()
+        batch_size, pause = options['batch_size'], options['sleep']
+
+        if options['compact_after'] > 0:
+            cutoff = now - timedelta(days=options['compact_after'])
+            changed = retention.compact(cutoff, batch_size, pause)
+            self.stdout.write(f'{changed} row ProfileView diringkas (sebelum {cutoff:%Y-%m-%d})')
+
+        hourly_cutoff = now - timedelta(days=options['hourly_days']) if options['hourly_days'] > 0 else None
+        cutoff = now - timedelta(days=options['days'])
+        deleted, archive_path = retention.prune(cutoff, batch_size, options['archive_dir'], pause, hourly_cutoff)
+        if archive_path:
+            self.stdout.write(f'Arsip: {archive_path}')
+        self.stdout.write(f'{deleted} row ProfileView dihapus (sebelum {cutoff:%Y-%m-%d})')
+
+        if hourly_cutoff is not None:
+            deleted_hourly = retention.prune_hourly_rollups(hourly_cutoff, batch_size, pause)
+            self.stdout.write(f'{deleted_hourly} rollup per jam dihapus (sebelum {hourly_cutoff:%Y-%m-%d})')
+
+        self.stdout.write(self.style.SUCCESS('Retensi ProfileView selesai'))
@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from mahasiswa import minhash
+from mahasiswa.models import Mahasiswa
+
+
+class Command(BaseCommand):
+    help = 'Bangun ulang signature MinHash & band LSH semua profil (perubahan skill sudah diperbarui otomatis)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        ids = list(Mahasiswa.objects.order_by('pk').values_list('pk', flat=True))
+        changed = 0
+        for start in range(0, len(ids), batch_size):
+            changed += minhash.refresh(ids[start:start + batch_size])
+        self.stdout.write(self.style.SUCCESS(f'{len(ids)} profil diproses, {changed} signature berubah'))
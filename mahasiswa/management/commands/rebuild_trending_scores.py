@@ -0,0 +1,36 @@
+import math
+from collections import defaultdict
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from mahasiswa import cache, trending
+from mahasiswa.models import Mahasiswa, ProfileViewHourly
+
+
+class Command(BaseCommand):
+    help = 'Hitung ulang Mahasiswa.trending_score dari rollup view per jam (mis. setelah deploy pertama)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=30, help='Jumlah hari rollup yang dipakai (default 30)')
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(days=options['days'])
+        terms = defaultdict(list)
+        rows = ProfileViewHourly.objects.filter(bucket__gte=since).values_list('mahasiswa_id', 'bucket', 'views')
+        for mahasiswa_id, bucket, views in rows.iterator():
+            if views:
+                # View dalam satu bucket dianggap terjadi di tengah jam
+                terms[mahasiswa_id].append(trending.log_increment(views, bucket + timedelta(minutes=30)))
+
+        scores = {}
+        for mahasiswa_id, values in terms.items():
+            top = max(values)
+            scores[mahasiswa_id] = top + math.log(sum(math.exp(value - top) for value in values))
+
+        Mahasiswa.objects.exclude(pk__in=scores.keys()).update(trending_score=None)
+        profiles = [Mahasiswa(pk=pk, trending_score=score) for pk, score in scores.items()]
+        Mahasiswa.objects.bulk_update(profiles, ['trending_score'], batch_size=500)
+        cache.invalidate(cache.TRENDING)
+        self.stdout.write(self.style.SUCCESS(f'Skor trending {len(scores)} profil dihitung ulang'))
@@ -0,0 +1,38 @@
+from collections import defaultdict
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from mahasiswa import rollups
+from mahasiswa.hll import hash_value
+from mahasiswa.models import ProfileView
+from mahasiswa.view_tracking import viewer_key
+
+
+class Command(BaseCommand):
+    help = 'Isi sketch HyperLogLog viewer unik (harian & lifetime) dari row ProfileView yang sudah ada'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        batch = defaultdict(set)
+        pending = 0
+        total = 0
+        rows = ProfileView.objects.order_by().values_list(
+            'mahasiswa_id', 'viewed_by_user_id', 'session_key', 'created_at'
+        )
+        for mahasiswa_id, user_id, session_key, created_at in rows.iterator(chunk_size=options['batch_size']):
+            if user_id is None and not session_key:
+                continue
+            key = (mahasiswa_id, timezone.localdate(created_at))
+            batch[key].add(hash_value(viewer_key((user_id, session_key))))
+            pending += 1
+            if pending >= options['batch_size']:
+                rollups.record_viewers(batch)
+                total += pending
+                batch, pending = defaultdict(set), 0
+        rollups.record_viewers(batch)
+        total += pending
+        # HyperLogLog idempotent: menjalankan ulang tidak menggandakan hitungan
+        self.stdout.write(self.style.SUCCESS(f'{total} viewer dimasukkan ke sketch'))
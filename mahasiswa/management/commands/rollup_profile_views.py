@@ -0,0 +1,24 @@
+from datetime import datetime, time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from mahasiswa import rollups
+
+
+class Command(BaseCommand):
+    help = 'Backfill tabel rollup view per jam/hari dari row ProfileView yang sudah ada'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Hanya ProfileView sejak tanggal ini (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = timezone.make_aware(datetime.combine(datetime.strptime(options['since'], '%Y-%m-%d'), time.min))
+            except ValueError:
+                raise CommandError('--since harus berformat YYYY-MM-DD')
+
+        processed = rollups.backfill(since)
+        self.stdout.write(self.style.SUCCESS(f'{processed} bucket rollup diproses'))
@@ -0,0 +1,105 @@
+from django.db import migrations
+
+# ----------------------------------------------------------------------------
+# PostgreSQL: tsvector column + GIN index, maintained by triggers.
+# Skill changes are handled per statement (transition tables) so that bulk
+# inserts/deletes of skills refresh each affected profile only once.
+# ----------------------------------------------------------------------------
+POSTGRES_FORWARD = [
+    "ALTER TABLE mahasiswa_mahasiswa ADD COLUMN IF NOT EXISTS search_vector tsvector",
+    """
+    CREATE OR REPLACE FUNCTION mahasiswa_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('simple', coalesce(NEW.nama, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(NEW.nim, '')), 'A') ||
+            setweight(to_tsvector('simple', coalesce(NEW.prodi, '')), 'B') ||
+            setweight(to_tsvector('simple', coalesce(
+                (SELECT string_agg(s.nama, ' ') FROM skills_skill s WHERE s.mahasiswa_id = NEW.id), ''
+            )), 'B') ||
+            setweight(to_tsvector('simple', coalesce(NEW.bio, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER mahasiswa_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF nama, nim, prodi, bio, search_vector ON mahasiswa_mahasiswa
+    FOR EACH ROW EXECUTE FUNCTION mahasiswa_search_vector_update()
+    """,
+    """
+    CREATE OR REPLACE FUNCTION skills_skill_search_vector_touch() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE mahasiswa_mahasiswa SET search_vector = NULL
+            WHERE id IN (SELECT mahasiswa_id FROM new_rows);
+        ELSIF TG_OP = 'DELETE' THEN
+            UPDATE mahasiswa_mahasiswa SET search_vector = NULL
+            WHERE id IN (SELECT mahasiswa_id FROM old_rows);
+        ELSE
+            UPDATE mahasiswa_mahasiswa SET search_vector = NULL
+            WHERE id IN (SELECT mahasiswa_id FROM new_rows UNION SELECT mahasiswa_id FROM old_rows);
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE TRIGGER skills_skill_search_insert_trigger
+    AFTER INSERT ON skills_skill REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION skills_skill_search_vector_touch()
+    """,
+    """
+    CREATE TRIGGER skills_skill_search_update_trigger
+    AFTER UPDATE ON skills_skill REFERENCING NEW TABLE AS new_rows OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION skills_skill_search_vector_touch()
+    """,
+    """
+    CREATE TRIGGER skills_skill_search_delete_trigger
+    AFTER DELETE ON skills_skill REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION skills_skill_search_vector_touch()
+    """,
+    # Backfill existing rows (fires mahasiswa_search_vector_trigger)
+    "UPDATE mahasiswa_mahasiswa SET search_vector = NULL",
+    "CREATE INDEX IF NOT EXISTS mahasiswa_search_vector_gin ON mahasiswa_mahasiswa USING GIN (search_vector)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP TRIGGER IF EXISTS skills_skill_search_insert_trigger ON skills_skill",
+    "DROP TRIGGER IF EXISTS skills_skill_search_update_trigger ON skills_skill",
+    "DROP TRIGGER IF EXISTS skills_skill_search_delete_trigger ON skills_skill",
+    "DROP FUNCTION IF EXISTS skills_skill_search_vector_touch()",
+    "DROP TRIGGER IF EXISTS mahasiswa_search_vector_trigger ON mahasiswa_mahasiswa",
+    "DROP FUNCTION IF EXISTS mahasiswa_search_vector_update()",
+    "DROP INDEX IF EXISTS mahasiswa_search_vector_gin",
+    "ALTER TABLE mahasiswa_mahasiswa DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements:
+        schema_editor.execute(statement, params=None)
+
+
+# SQLite (local runs) memakai FTS5 yang dipasang ulang setiap selesai migrate,
+# lihat mahasiswa.search.install_sqlite_search.
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_FORWARD)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        _run(schema_editor, POSTGRES_REVERSE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mahasiswa', '0005_profileview'),
+        ('skills', '0002_alter_skill_options_skillendorsement'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
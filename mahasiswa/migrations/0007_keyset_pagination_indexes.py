@@ -0,0 +1,27 @@
+# Generated by Django 5.2.9 on 2026-10-18 17:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mahasiswa', '0006_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='mahasiswa',
+            index=models.Index(fields=['created_at', 'id'], name='mahasiswa_m_created_f82bb8_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mahasiswa',
+            index=models.Index(fields=['views_count', 'id'], name='mahasiswa_m_views_c_344c47_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mahasiswa',
+            index=models.Index(fields=['nama', 'id'], name='mahasiswa_m_nama_3cf781_idx'),
+        ),
+    ]
@@ -0,0 +1,35 @@
+from django.db import migrations
+
+# Prefix match NIM memakai index varchar_pattern_ops yang sudah dibuat Django
+# untuk field unique `nim` (mahasiswa_mahasiswa_nim_..._like).
+POSTGRES_FORWARD = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS mahasiswa_nama_trgm ON mahasiswa_mahasiswa USING GIN (nama gin_trgm_ops)",
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS mahasiswa_nama_trgm",
+]
+
+
+def create_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for statement in POSTGRES_FORWARD:
+            schema_editor.execute(statement, params=None)
+
+
+def drop_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for statement in POSTGRES_REVERSE:
+            schema_editor.execute(statement, params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mahasiswa', '0008_pengalaman_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_index, drop_trigram_index),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mahasiswa', '0009_suggest_trigram_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileViewDaily',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('bucket', models.DateField(help_text='Tanggal (TIME_ZONE project)')),
+                ('mahasiswa', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='mahasiswa.mahasiswa')),
+            ],
+            options={
+                'verbose_name': 'Profile View (Daily)',
+                'verbose_name_plural': 'Profile Views (Daily)',
+                'ordering': ['bucket'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['bucket'], name='mahasiswa_p_bucket_bade6b_idx')],
+                'constraints': [models.UniqueConstraint(fields=('mahasiswa', 'bucket'), name='unique_profile_view_daily')],
+            },
+        ),
+        migrations.CreateModel(
+            name='ProfileViewHourly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('views', models.PositiveIntegerField(default=0)),
+                ('bucket', models.DateTimeField(help_text='Awal jam (UTC)')),
+                ('mahasiswa', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='mahasiswa.mahasiswa')),
+            ],
+            options={
+                'verbose_name': 'Profile View (Hourly)',
+                'verbose_name_plural': 'Profile Views (Hourly)',
+                'ordering': ['bucket'],
+                'abstract': False,
+                'indexes': [models.Index(fields=['bucket'], name='mahasiswa_p_bucket_5ec0a6_idx')],
+                'constraints': [models.UniqueConstraint(fields=('mahasiswa', 'bucket'), name='unique_profile_view_hourly')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:12
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mahasiswa', '0010_profile_view_rollups'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mahasiswa',
+            name='trending_score',
+            field=models.FloatField(blank=True, editable=False, help_text='Log skor views dengan time decay (lihat mahasiswa.trending)', null=True),
+        ),
+        migrations.AddIndex(
+            model_name='mahasiswa',
+            index=models.Index(fields=['trending_score', 'id'], name='mahasiswa_m_trendin_0dc2ad_idx'),
+        ),
+    ]
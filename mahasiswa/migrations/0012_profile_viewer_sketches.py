@@ -0,0 +1,36 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:13
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mahasiswa', '0011_mahasiswa_trending_score'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileViewerSketch',
+            fields=[
+                ('mahasiswa', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='viewer_sketch', serialize=False, to='mahasiswa.mahasiswa')),
+                ('sketch', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Profile Viewer Sketch',
+                'verbose_name_plural': 'Profile Viewer Sketches',
+            },
+        ),
+        migrations.AddField(
+            model_name='mahasiswa',
+            name='unique_viewers',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Estimasi jumlah viewer unik (HyperLogLog, lihat ProfileViewerSketch)'),
+        ),
+        migrations.AddField(
+            model_name='profileviewdaily',
+            name='viewers_sketch',
+            field=models.BinaryField(blank=True, help_text='HyperLogLog viewer unik pada hari ini (lihat mahasiswa.hll)', null=True),
+        ),
+    ]
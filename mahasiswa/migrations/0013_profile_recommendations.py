@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:17
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mahasiswa', '0012_profile_viewer_sketches'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileRecommendation',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(help_text='Cosine similarity vektor skill')),
+                ('rank', models.PositiveSmallIntegerField()),
+                ('computed_at', models.DateTimeField()),
+                ('mahasiswa', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recommendations', to='mahasiswa.mahasiswa')),
+                ('recommended', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='mahasiswa.mahasiswa')),
+            ],
+            options={
+                'verbose_name': 'Profile Recommendation',
+                'verbose_name_plural': 'Profile Recommendations',
+                'ordering': ['mahasiswa', 'rank'],
+                'indexes': [models.Index(fields=['mahasiswa', 'rank'], name='mahasiswa_p_mahasis_a0d482_idx')],
+                'constraints': [models.UniqueConstraint(fields=('mahasiswa', 'recommended'), name='unique_profile_recommendation')],
+            },
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:27
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mahasiswa', '0013_profile_recommendations'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ProfileMinHash',
+            fields=[
+                ('mahasiswa', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='minhash', serialize=False, to='mahasiswa.mahasiswa')),
+                ('signature', models.BinaryField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Profile MinHash',
+                'verbose_name_plural': 'Profile MinHashes',
+            },
+        ),
+        migrations.CreateModel(
+            name='ProfileLSHBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('band', models.PositiveSmallIntegerField()),
+                ('bucket', models.BigIntegerField()),
+                ('mahasiswa', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='lsh_bands', to='mahasiswa.mahasiswa')),
+            ],
+            options={
+                'verbose_name': 'Profile LSH Band',
+                'verbose_name_plural': 'Profile LSH Bands',
+                'indexes': [models.Index(fields=['band', 'bucket', 'mahasiswa'], name='mahasiswa_p_band_6a95e9_idx')],
+                'constraints': [models.UniqueConstraint(fields=('mahasiswa', 'band'), name='unique_profile_lsh_band')],
+            },
+        ),
+    ]
@@ -0,0 +1,63 @@
+from django.db import migrations
+
+# ----------------------------------------------------------------------------
+# PostgreSQL: statement trigger UPDATE pada skills_skill (0006_search_index)
+# berjalan untuk setiap UPDATE, termasuk endorsement_count = F() + 1 dan
+# bulk_update updated_at. Transition table tidak bisa dipakai bersama daftar
+# kolom (UPDATE OF nama, ...), jadi fungsi trigger membandingkan old_rows dan
+# new_rows per id dan hanya menyegarkan profil yang nama / mahasiswa_id
+# skill-nya benar-benar berubah.
+# ----------------------------------------------------------------------------
+TOUCH_FUNCTION = """
+    CREATE OR REPLACE FUNCTION skills_skill_search_vector_touch() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP = 'INSERT' THEN
+            UPDATE mahasiswa_mahasiswa SET search_vector = NULL
+            WHERE id IN (SELECT mahasiswa_id FROM new_rows);
+        ELSIF TG_OP = 'DELETE' THEN
+            UPDATE mahasiswa_mahasiswa SET search_vector = NULL
+            WHERE id IN (SELECT mahasiswa_id FROM old_rows);
+        ELSE
+            %s
+        END IF;
+        RETURN NULL;
+    END
+    $$ LANGUAGE plpgsql
+"""
+
+CHANGED_ROWS_UPDATE = """
+            UPDATE mahasiswa_mahasiswa SET search_vector = NULL
+            WHERE id IN (
+                SELECT affected.mahasiswa_id
+                FROM old_rows o
+                JOIN new_rows n ON n.id = o.id
+                CROSS JOIN LATERAL (VALUES (o.mahasiswa_id), (n.mahasiswa_id)) AS affected (mahasiswa_id)
+                WHERE n.nama IS DISTINCT FROM o.nama OR n.mahasiswa_id IS DISTINCT FROM o.mahasiswa_id
+            );
+"""
+
+ALL_ROWS_UPDATE = """
+            UPDATE mahasiswa_mahasiswa SET search_vector = NULL
+            WHERE id IN (SELECT mahasiswa_id FROM new_rows UNION SELECT mahasiswa_id FROM old_rows);
+"""
+
+
+def replace_touch_function(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(TOUCH_FUNCTION % CHANGED_ROWS_UPDATE.strip(), params=None)
+
+
+def restore_touch_function(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(TOUCH_FUNCTION % ALL_ROWS_UPDATE.strip(), params=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mahasiswa', '0014_profile_minhash_lsh'),
+    ]
+
+    operations = [
+        migrations.RunPython(replace_touch_function, restore_touch_function),
+    ]
@@ -0,0 +1,197 @@
+"""
+MinHash + LSH untuk retrieval kandidat profil dengan skill mirip.
+
+Signature MinHash (NUM_PERMUTATIONS nilai) dihitung dari himpunan SkillTag id
+profil; peluang dua signature sama di satu posisi = Jaccard kedua himpunan.
+Signature dibagi BANDS band x ROWS baris, dan setiap band di-hash ke satu
+bucket (ProfileLSHBand, index (band, bucket)). Profil yang berbagi bucket di
+minimal satu band menjadi kandidat; dengan 20 x 3 pasangan Jaccard >= ~0.4
+hampir selalu ketemu, sementara pasangan yang tidak mirip jarang.
+
+Hanya CANDIDATE_LIMIT kandidat (urut jumlah band yang cocok) yang dihitung
+Jaccard exact-nya (mahasiswa.recommendations.similar_profiles), bukan semua
+profil yang berbagi skill populer.
+
+Signature & band disimpan di database dan diperbarui secara incremental: setiap
+perubahan Skill mengantrikan profilnya ke MinHashQueue (lihat mahasiswa.signals),
+yang di-flush per batch seperti buffer view tracking. Build penuh:
+`python manage.py rebuild_minhash`.
+"""
+import atexit
+import hashlib
+import logging
+import random
+import struct
+
+from django.apps import apps
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .view_tracking import BufferedWriter
+
+logger = logging.getLogger(__name__)
+
+BANDS = 20
+ROWS = 3
+NUM_PERMUTATIONS = BANDS * ROWS
+CANDIDATE_LIMIT = 300
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_SIGNATURE_FORMAT = f'>{NUM_PERMUTATIONS}I'
+# Koefisien hash universal (a * x + b) mod p, tetap antar proses (seed konstan)
+_rng = random.Random(0x5EED)
+_COEFFICIENTS = [(_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERMUTATIONS)]
+
+
+def signature(tag_ids):
+    """MinHash signature (tuple NUM_PERMUTATIONS int) untuk himpunan tag id; None jika kosong"""
+    if not tag_ids:
+        return None
+    return tuple(
+        min(((a * tag_id + b) % _PRIME) & _MAX_HASH for tag_id in tag_ids)
+        for a, b in _COEFFICIENTS
+    )
+
+
+def pack(values):
+    return struct.pack(_SIGNATURE_FORMAT, *values)
+
+
+def unpack(data):
+    return struct.unpack(_SIGNATURE_FORMAT, bytes(data))
+
+
+def band_buckets(values):
+    """List (band, bucket) untuk signature; bucket = hash 64-bit signed (muat di BigIntegerField)"""
+    buckets = []
+    for band in range(BANDS):
+        chunk = struct.pack(f'>{ROWS}I', *values[band * ROWS:(band + 1) * ROWS])
+        digest = hashlib.blake2b(chunk, digest_size=8, person=band.to_bytes(2, 'big')).digest()
+        buckets.append((band, int.from_bytes(digest, 'big', signed=True)))
+    return buckets
+
+
+def _tag_sets(mahasiswa_ids):
+    Skill = apps.get_model('skills', 'Skill')
+    tag_sets = {mahasiswa_id: set() for mahasiswa_id in mahasiswa_ids}
+    pairs = (
+        Skill.objects.filter(mahasiswa__in=mahasiswa_ids, tag__isnull=False)
+        .order_by().values_list('mahasiswa_id', 'tag_id')
+    )
+    for mahasiswa_id, tag_id in pairs:
+        tag_sets[mahasiswa_id].add(tag_id)
+    return tag_sets
+
+
+def refresh(mahasiswa_ids):
+    """
+    Hitung ulang signature & band LSH untuk profil-profil ini dari skill mereka saat ini.
+    Band hanya ditulis ulang untuk signature yang berubah. Return jumlah profil yang berubah.
+    """
+    ProfileMinHash = apps.get_model('mahasiswa', 'ProfileMinHash')
+    ProfileLSHBand = apps.get_model('mahasiswa', 'ProfileLSHBand')
+    Mahasiswa = apps.get_model('mahasiswa', 'Mahasiswa')
+
+    mahasiswa_ids = set(Mahasiswa.objects.filter(pk__in=mahasiswa_ids).values_list('pk', flat=True))
+    if not mahasiswa_ids:
+        return 0
+    current = dict(ProfileMinHash.objects.filter(mahasiswa__in=mahasiswa_ids).values_list('mahasiswa_id', 'signature'))
+
+    removed, changed = [], {}
+    for mahasiswa_id, tag_ids in _tag_sets(mahasiswa_ids).items():
+        values = signature(tag_ids)
+        if values is None:
+            if mahasiswa_id in current:
+                removed.append(mahasiswa_id)
+        elif mahasiswa_id not in current or bytes(current[mahasiswa_id]) != pack(values):
+            changed[mahasiswa_id] = values
+
+    with transaction.atomic():
+        stale = removed + list(changed)
+        ProfileLSHBand.objects.filter(mahasiswa__in=stale).delete()
+        ProfileMinHash.objects.filter(mahasiswa__in=removed).delete()
+        ProfileMinHash.objects.bulk_create(
+            [ProfileMinHash(mahasiswa_id=mahasiswa_id, signature=pack(values)) for mahasiswa_id, values in changed.items()],
+            batch_size=500,
+            update_conflicts=True,
+            unique_fields=['mahasiswa'],
+            update_fields=['signature', 'updated_at'],
+        )
+        ProfileLSHBand.objects.bulk_create(
+            [
+                ProfileLSHBand(mahasiswa_id=mahasiswa_id, band=band, bucket=bucket)
+                for mahasiswa_id, values in changed.items()
+                for band, bucket in band_buckets(values)
+            ],
+            batch_size=1000,
+        )
+    return len(stale)
+
+
+def candidates(mahasiswa, tag_ids, limit=CANDIDATE_LIMIT):
+    """Id profil aktif yang berbagi bucket LSH dengan himpunan tag ini, urut jumlah band yang cocok"""
+    ProfileLSHBand = apps.get_model('mahasiswa', 'ProfileLSHBand')
+    values = signature(tag_ids)
+    if values is None:
+        return []
+    matches = Q()
+    for band, bucket in band_buckets(values):
+        matches |= Q(band=band, bucket=bucket)
+    return list(
+        ProfileLSHBand.objects.filter(matches, mahasiswa__is_active=True)
+        .exclude(mahasiswa=mahasiswa)
+        .values('mahasiswa')
+        .annotate(bands=Count('pk'))
+        .order_by('-bands', 'mahasiswa')
+        .values_list('mahasiswa', flat=True)[:limit]
+    )
+
+
+class MinHashQueue(BufferedWriter):
+    """Profil yang skill-nya berubah, signature & band-nya dihitung ulang per batch"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending = set()
+
+    def add(self, mahasiswa_id):
+        with self._lock:
+            if mahasiswa_id in self._pending:
+                return
+            self._pending.add(mahasiswa_id)
+            flush_now = self._buffered(1)
+        if flush_now:
+            self._flush_full()
+
+    def _swap(self):
+        batch, self._pending = self._pending, set()
+        return batch
+
+    def _merge(self, batch):
+        added = len(batch - self._pending)
+        self._pending |= batch
+        return added
+
+    def _write(self, batch):
+        refresh(batch)
+        return len(batch)
+
+    def _split(self, batch):
+        return [{mahasiswa_id} for mahasiswa_id in batch]
+
+    def _describe(self, part):
+        return sorted(part)
+
+
+minhash_queue = MinHashQueue()
+
+
+def _flush_on_exit():
+    try:
+        minhash_queue.flush()
+    except Exception:
+        logger.exception('MinHashQueue: flush saat exit gagal')
+
+
+atexit.register(_flush_on_exit)
@@ -1,6 +1,27 @@
+from django.apps import apps
 from django.db import models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
 from django.contrib.auth.models import User
 
+
+def _count_per_mahasiswa(model):
+    """Correlated COUNT subquery per mahasiswa (tanpa JOIN, tidak menggandakan row)"""
+    counts = model.objects.filter(
+        mahasiswa=OuterRef('pk')
+    ).order_by().values('mahasiswa').annotate(total=Count('pk')).values('total')
+    return Coalesce(Subquery(counts), 0)
+
+
+class MahasiswaQuerySet(models.QuerySet):
+    def with_counts(self):
+        """Annotate skills_count & talents_count dalam query yang sama"""
+        return self.annotate(
+            skills_count=_count_per_mahasiswa(apps.get_model('skills', 'Skill')),
+            talents_count=_count_per_mahasiswa(apps.get_model('talents', 'Talent')),
+        )
+
+
 class Mahasiswa(models.Model):
     user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='mahasiswa_profile')
     nama = models.CharField(max_length=100)
@@ -24,11 +45,21 @@ class Mahasiswa(models.Model):
     
     # Statistics
     views_count = models.IntegerField(default=0, help_text="Jumlah profile views")
+    unique_viewers = models.PositiveIntegerField(
+        default=0, editable=False,
+        help_text="Estimasi jumlah viewer unik (HyperLogLog, lihat ProfileViewerSketch)"
+    )
+    trending_score = models.FloatField(
+        null=True, blank=True, editable=False,
+        help_text="Log skor views dengan time decay (lihat mahasiswa.trending)"
+    )
     
     # Timestamps
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = MahasiswaQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Mahasiswa'
@@ -37,15 +68,21 @@ class Mahasiswa(models.Model):
             models.Index(fields=['-created_at']),
             models.Index(fields=['prodi']),
             models.Index(fields=['is_active']),
+            # Keyset pagination: (ordering field, id)
+            models.Index(fields=['created_at', 'id']),
+            models.Index(fields=['views_count', 'id']),
+            models.Index(fields=['nama', 'id']),
+            # Trending top-N (lihat mahasiswa.trending)
+            models.Index(fields=['trending_score', 'id']),
         ]
 
     def __str__(self):
         return f"{self.nama} ({self.nim})"
     
     def increment_views(self):
-        """Increment profile view count"""
-        self.views_count += 1
-        self.save(update_fields=['views_count'])
+        """Increment profile view count (buffered, lihat mahasiswa.view_tracking)"""
+        from .view_tracking import view_counter
+        view_counter.add(self.pk)
 
 
 class Pengalaman(models.Model):
@@ -57,6 +94,7 @@ class Pengalaman(models.Model):
     tahun_selesai = models.CharField(max_length=10, blank=True, help_text="Tahun selesai (kosong jika masih berlangsung)")
     deskripsi = models.TextField(blank=True, help_text="Deskripsi pengalaman")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['-tahun_mulai']
@@ -120,4 +158,130 @@ class ProfileView(models.Model):
     
     def __str__(self):
         viewer = self.viewed_by_user.username if self.viewed_by_user else self.session_key[:8] if self.session_key else self.viewed_by_ip
-        return f"{self.mahasiswa.nama} viewed by {viewer}"
\ No newline at end of file
+        return f"{self.mahasiswa.nama} viewed by {viewer}"
+
+
+class ProfileViewRollup(models.Model):
+    """Jumlah view per profil per bucket waktu (diisi incremental dari ingest view)"""
+    mahasiswa = models.ForeignKey(Mahasiswa, on_delete=models.CASCADE, related_name='+')
+    views = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        abstract = True
+        ordering = ['bucket']
+
+    def __str__(self):
+        return f"{self.mahasiswa_id} @ {self.bucket}: {self.views}"
+
+
+class ProfileViewHourly(ProfileViewRollup):
+    bucket = models.DateTimeField(help_text="Awal jam (UTC)")
+
+    class Meta(ProfileViewRollup.Meta):
+        verbose_name = 'Profile View (Hourly)'
+        verbose_name_plural = 'Profile Views (Hourly)'
+        constraints = [
+            models.UniqueConstraint(fields=['mahasiswa', 'bucket'], name='unique_profile_view_hourly'),
+        ]
+        indexes = [
+            models.Index(fields=['bucket']),
+        ]
+
+
+class ProfileViewDaily(ProfileViewRollup):
+    bucket = models.DateField(help_text="Tanggal (TIME_ZONE project)")
+    viewers_sketch = models.BinaryField(
+        null=True, blank=True,
+        help_text="HyperLogLog viewer unik pada hari ini (lihat mahasiswa.hll)"
+    )
+
+    class Meta(ProfileViewRollup.Meta):
+        verbose_name = 'Profile View (Daily)'
+        verbose_name_plural = 'Profile Views (Daily)'
+        constraints = [
+            models.UniqueConstraint(fields=['mahasiswa', 'bucket'], name='unique_profile_view_daily'),
+        ]
+        indexes = [
+            models.Index(fields=['bucket']),
+        ]
+
+
+class ProfileViewerSketch(models.Model):
+    """HyperLogLog seluruh viewer unik sebuah profil (gabungan semua sketch harian)"""
+    mahasiswa = models.OneToOneField(
+        Mahasiswa,
+        primary_key=True,
+        related_name='viewer_sketch',
+        on_delete=models.CASCADE
+    )
+    sketch = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Profile Viewer Sketch'
+        verbose_name_plural = 'Profile Viewer Sketches'
+
+    def __str__(self):
+        return f"Viewer sketch {self.mahasiswa_id}"
+
+
+class ProfileRecommendation(models.Model):
+    """Top-k profil mirip hasil batch recommender (management command compute_recommendations)"""
+    mahasiswa = models.ForeignKey(Mahasiswa, related_name='recommendations', on_delete=models.CASCADE)
+    recommended = models.ForeignKey(Mahasiswa, related_name='+', on_delete=models.CASCADE)
+    score = models.FloatField(help_text="Cosine similarity vektor skill")
+    rank = models.PositiveSmallIntegerField()
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['mahasiswa', 'rank']
+        verbose_name = 'Profile Recommendation'
+        verbose_name_plural = 'Profile Recommendations'
+        constraints = [
+            models.UniqueConstraint(fields=['mahasiswa', 'recommended'], name='unique_profile_recommendation'),
+        ]
+        indexes = [
+            models.Index(fields=['mahasiswa', 'rank']),
+        ]
+
+    def __str__(self):
+        return f"{self.mahasiswa_id} -> {self.recommended_id} ({self.score:.3f})"
+
+
+class ProfileMinHash(models.Model):
+    """MinHash signature himpunan skill (SkillTag) per profil, lihat mahasiswa.minhash"""
+    mahasiswa = models.OneToOneField(
+        Mahasiswa,
+        primary_key=True,
+        related_name='minhash',
+        on_delete=models.CASCADE
+    )
+    signature = models.BinaryField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Profile MinHash'
+        verbose_name_plural = 'Profile MinHashes'
+
+    def __str__(self):
+        return f"MinHash {self.mahasiswa_id}"
+
+
+class ProfileLSHBand(models.Model):
+    """Bucket LSH per band signature MinHash: profil di bucket yang sama jadi kandidat mirip"""
+    mahasiswa = models.ForeignKey(Mahasiswa, related_name='lsh_bands', on_delete=models.CASCADE)
+    band = models.PositiveSmallIntegerField()
+    bucket = models.BigIntegerField()
+
+    class Meta:
+        verbose_name = 'Profile LSH Band'
+        verbose_name_plural = 'Profile LSH Bands'
+        constraints = [
+            models.UniqueConstraint(fields=['mahasiswa', 'band'], name='unique_profile_lsh_band'),
+        ]
+        indexes = [
+            models.Index(fields=['band', 'bucket', 'mahasiswa']),
+        ]
+
+    def __str__(self):
+        return f"{self.mahasiswa_id} band {self.band}: {self.bucket}"
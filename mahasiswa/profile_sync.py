@@ -0,0 +1,129 @@
+"""
+Sinkronisasi skills & pengalaman profil dari payload editor profil.
+
+Alih-alih menghapus semua row lalu membuat ulang satu per satu (yang juga ikut
+menghapus endorsement skill yang tidak berubah), payload dibandingkan dengan row
+yang ada: row yang sama dibiarkan, row baru di-bulk_create, row yang berubah
+di-bulk_update dan row yang hilang dihapus dengan satu query, semuanya dalam satu
+transaksi. Efek samping perubahan skill (cache, rekomendasi, MinHash, leaderboard)
+dijalankan sekali per profil lewat mahasiswa.signals.batched_skill_changes.
+"""
+import json
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Pengalaman
+from .signals import batched_skill_changes
+
+PENGALAMAN_FIELDS = ('posisi', 'organisasi', 'tahun_mulai', 'tahun_selesai', 'deskripsi')
+
+
+def parse_list(value):
+    """Payload list dari form-data (string JSON) atau JSON body; TypeError/JSONDecodeError jika tidak valid"""
+    parsed = json.loads(value) if isinstance(value, str) else value
+    if not isinstance(parsed, list):
+        raise TypeError('Expected a list')
+    return parsed
+
+
+def sync_skills(mahasiswa, skill_names):
+    """
+    Samakan skill profil dengan `skill_names`. Skill dicocokkan lewat nama ternormalisasi,
+    jadi skill yang tetap ada (termasuk endorsement-nya) tidak disentuh; perubahan
+    huruf besar/kecil hanya mengubah nama tampilan. Return (created, updated, deleted).
+    """
+    from skills.models import Skill, SkillTag, normalize_skill_name
+
+    wanted = {}
+    for skill_name in skill_names:
+        skill_name = ' '.join(str(skill_name).split())
+        normalized = normalize_skill_name(skill_name)
+        if normalized:
+            wanted.setdefault(normalized, skill_name)
+
+    with transaction.atomic(), batched_skill_changes() as changed_tags:
+        existing = {}
+        removed = []
+        for skill in Skill.objects.filter(mahasiswa=mahasiswa).only('id', 'nama', 'nama_normalized', 'tag', 'mahasiswa'):
+            if skill.nama_normalized in wanted and skill.nama_normalized not in existing:
+                existing[skill.nama_normalized] = skill
+            else:
+                removed.append(skill.pk)
+
+        now = timezone.now()
+        renamed = []
+        for normalized, skill in existing.items():
+            if skill.nama != wanted[normalized]:
+                skill.nama, skill.updated_at = wanted[normalized], now
+                renamed.append(skill)
+        Skill.objects.bulk_update(renamed, ['nama', 'updated_at'])
+
+        new_names = [skill_name for normalized, skill_name in wanted.items() if normalized not in existing]
+        tags = SkillTag.objects.resolve(new_names)
+        # bulk_create melewati Skill.save(): nama_normalized & tag diisi di sini
+        created = Skill.objects.bulk_create([
+            Skill(
+                mahasiswa=mahasiswa,
+                nama=skill_name,
+                nama_normalized=normalize_skill_name(skill_name),
+                tag=tags.get(normalize_skill_name(skill_name)),
+            )
+            for skill_name in new_names
+        ])
+
+        # Hapus (post_delete per skill dikumpulkan batched_skill_changes)
+        if removed:
+            Skill.objects.filter(pk__in=removed).delete()
+        if created or renamed:
+            changed_tags.setdefault(mahasiswa.pk, set()).update(skill.tag_id for skill in created)
+    return len(created), len(renamed), len(removed)
+
+
+def _pengalaman_values(entry):
+    return {field: str(entry.get(field) or '') for field in PENGALAMAN_FIELDS}
+
+
+def sync_pengalaman(mahasiswa, entries):
+    """
+    Samakan pengalaman profil dengan `entries` (dict dengan posisi & organisasi wajib).
+    Entry dicocokkan lewat `id` jika ada, selain itu lewat (posisi, organisasi).
+    Return (created, updated, deleted).
+    """
+    entries = [
+        _pengalaman_values(entry) | {'id': entry.get('id')}
+        for entry in entries
+        if isinstance(entry, dict) and entry.get('posisi') and entry.get('organisasi')
+    ]
+
+    with transaction.atomic():
+        existing = {row.pk: row for row in Pengalaman.objects.filter(mahasiswa=mahasiswa)}
+        by_key = {}
+        for row in existing.values():
+            by_key.setdefault((row.posisi, row.organisasi), row)
+
+        now = timezone.now()
+        kept, changed, new_rows = set(), [], []
+        for entry in entries:
+            try:
+                row = existing.get(int(entry.pop('id')))
+            except (TypeError, ValueError):
+                row = None
+            if row is None or row.pk in kept:
+                row = by_key.get((entry['posisi'], entry['organisasi']))
+            if row is None or row.pk in kept:
+                new_rows.append(Pengalaman(mahasiswa=mahasiswa, **entry))
+                continue
+            kept.add(row.pk)
+            if any(getattr(row, field) != value for field, value in entry.items()):
+                for field, value in entry.items():
+                    setattr(row, field, value)
+                row.updated_at = now
+                changed.append(row)
+
+        removed = [pk for pk in existing if pk not in kept]
+        if removed:
+            Pengalaman.objects.filter(pk__in=removed).delete()
+        Pengalaman.objects.bulk_update(changed, [*PENGALAMAN_FIELDS, 'updated_at'])
+        Pengalaman.objects.bulk_create(new_rows)
+    return len(new_rows), len(changed), len(removed)
@@ -0,0 +1,156 @@
+"""
+Rekomendasi profil berdasarkan kemiripan skill.
+
+Jika tersedia, rekomendasi dibaca dari tabel ProfileRecommendation yang diisi batch
+recommender (management command compute_recommendations: cosine similarity atas
+matriks sparse mahasiswa x skill, numpy/scipy). Untuk profil yang belum punya hasil
+batch (atau skill-nya baru berubah) dipakai lookup Jaccard langsung.
+
+Skill.tag (SkillTag kanonik, integer key) + index (tag, mahasiswa) berfungsi
+sebagai inverted index skill -> mahasiswa. Tag di-resolve otomatis setiap Skill
+disimpan, jadi lookup rekomendasi hanya membaca posting list skill milik profil
+target:
+
+    jaccard(A, B) = |A ∩ B| / (|A| + |B| - |A ∩ B|)
+
+|A ∩ B| dihitung dari posting list (hanya skill yang cocok), |B| dari skill
+kandidat itu sendiri; pengurutan & LIMIT dilakukan database.
+
+Supaya skill populer tidak membuat posting list sebesar seluruh tabel, kandidat
+diambil dulu dari bucket MinHash LSH (mahasiswa.minhash) dan hanya beberapa ratus
+kandidat itu yang dihitung exact. Jika kandidat LSH kurang dari limit (data kecil
+atau band belum dibangun) dipakai posting list penuh.
+"""
+from django.apps import apps
+from django.db.models import Count, F, FloatField, OuterRef, Subquery
+from django.db.models.functions import Cast
+
+from . import minhash
+
+RECOMMENDATION_LIMIT = 6
+# Memory per pasangan (profil, profil) dalam satu batch top_k_similar:
+# skor float32 + index int64 hasil argpartition (ukurannya sama dengan matriks skor)
+BATCH_BYTES_PER_SCORE = 4 + 8
+# Nilai 'similarity_metric' di response rekomendasi (skor kedua metrik tidak bisa dibandingkan)
+COSINE = 'cosine'
+JACCARD = 'jaccard'
+
+
+def skill_set(mahasiswa):
+    Skill = apps.get_model('skills', 'Skill')
+    return set(
+        Skill.objects.filter(mahasiswa=mahasiswa, tag__isnull=False)
+        .values_list('tag_id', flat=True)
+    )
+
+
+def similar_profiles(mahasiswa, limit=RECOMMENDATION_LIMIT):
+    """List (mahasiswa_id, jaccard, jumlah skill yang cocok) urut dari yang paling mirip"""
+    target = skill_set(mahasiswa)
+    if not target:
+        return []
+    candidate_ids = minhash.candidates(mahasiswa, target)
+    if len(candidate_ids) < limit:
+        candidate_ids = None
+    return jaccard_scores(mahasiswa, target, limit, candidate_ids)
+
+
+def jaccard_scores(mahasiswa, target, limit, candidate_ids=None):
+    """Jaccard exact antara himpunan tag `target` dan profil lain (hanya `candidate_ids` jika diberikan)"""
+    Skill = apps.get_model('skills', 'Skill')
+
+    candidate_size = Subquery(
+        Skill.objects.filter(mahasiswa=OuterRef('mahasiswa'), tag__isnull=False)
+        .order_by().values('mahasiswa')
+        .annotate(total=Count('tag', distinct=True)).values('total')
+    )
+    postings = Skill.objects.filter(tag__in=target, mahasiswa__is_active=True)
+    if candidate_ids is not None:
+        postings = postings.filter(mahasiswa__in=candidate_ids)
+    rows = (
+        postings.exclude(mahasiswa=mahasiswa)
+        .order_by()
+        .values('mahasiswa')
+        .annotate(overlap=Count('tag', distinct=True), size=candidate_size)
+        .annotate(score=Cast('overlap', FloatField()) / (len(target) + F('size') - F('overlap')))
+        .order_by('-score', '-overlap', '-mahasiswa__views_count', 'mahasiswa')[:limit]
+    )
+    return [(row['mahasiswa'], row['score'], row['overlap']) for row in rows]
+
+
+def precomputed_recommendations(mahasiswa, limit=RECOMMENDATION_LIMIT):
+    """List (mahasiswa_id, cosine, rank) dari tabel ProfileRecommendation (kosong jika belum dihitung)"""
+    ProfileRecommendation = apps.get_model('mahasiswa', 'ProfileRecommendation')
+    return list(
+        ProfileRecommendation.objects.filter(mahasiswa=mahasiswa, recommended__is_active=True)
+        .order_by('rank').values_list('recommended_id', 'score', 'rank')[:limit]
+    )
+
+
+def load_skill_matrix():
+    """
+    Matriks sparse biner mahasiswa x skill (CSR, baris ter-normalisasi L2) untuk semua
+    mahasiswa aktif yang punya skill. Return (matrix, mahasiswa_ids).
+    Butuh numpy & scipy (lihat compute_recommendations).
+    """
+    import numpy as np
+    from scipy import sparse
+
+    Skill = apps.get_model('skills', 'Skill')
+    rows, cols = [], []
+    row_index, col_index = {}, {}
+    pairs = (
+        Skill.objects.filter(mahasiswa__is_active=True, tag__isnull=False)
+        .order_by().values_list('mahasiswa_id', 'tag_id').distinct()
+    )
+    for mahasiswa_id, tag_id in pairs.iterator(chunk_size=10000):
+        rows.append(row_index.setdefault(mahasiswa_id, len(row_index)))
+        cols.append(col_index.setdefault(tag_id, len(col_index)))
+
+    shape = (len(row_index), len(col_index))
+    matrix = sparse.csr_matrix(
+        (np.ones(len(rows), dtype=np.float32), (np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64))),
+        shape=shape,
+    )
+    matrix.sum_duplicates()
+    matrix.data[:] = 1.0
+    norms = np.sqrt(np.asarray(matrix.sum(axis=1)).ravel()).astype(np.float32)
+    norms[norms == 0] = 1.0
+    matrix = sparse.diags(1.0 / norms).dot(matrix).tocsr().astype(np.float32)
+
+    mahasiswa_ids = np.empty(len(row_index), dtype=np.int64)
+    for mahasiswa_id, index in row_index.items():
+        mahasiswa_ids[index] = mahasiswa_id
+    return matrix, mahasiswa_ids
+
+
+def top_k_similar(matrix, top_k, batch_size, min_score=0.0):
+    """
+    Cosine similarity semua baris terhadap semua baris, dihitung per batch baris supaya
+    memory maksimal batch_size x n x BATCH_BYTES_PER_SCORE. Yield (row, [(kolom, skor), ...]) per baris.
+    """
+    import numpy as np
+
+    total = matrix.shape[0]
+    k = min(top_k, total - 1)
+    if k <= 0:
+        return
+    for start in range(0, total, batch_size):
+        stop = min(start + batch_size, total)
+        # sparse (n x skill) . dense (skill x batch) jauh lebih cepat daripada sparse . sparse
+        # karena hasilnya hampir padat untuk skill populer. Skor dipakai dalam bentuk n x batch
+        # (kolom = baris batch) supaya tidak ada salinan hasil transpose.
+        scores = matrix.dot(matrix[start:stop].T.toarray())
+        # Diri sendiri tidak direkomendasikan
+        scores[np.arange(start, stop), np.arange(stop - start)] = -1.0
+        candidates = np.argpartition(scores, -k, axis=0)[-k:]
+        candidate_scores = np.take_along_axis(scores, candidates, axis=0)
+        order = np.argsort(-candidate_scores, axis=0, kind='stable')
+        candidates = np.take_along_axis(candidates, order, axis=0)
+        candidate_scores = np.take_along_axis(candidate_scores, order, axis=0)
+        for offset in range(stop - start):
+            yield start + offset, [
+                (int(column), float(score))
+                for column, score in zip(candidates[:, offset], candidate_scores[:, offset])
+                if score > min_score
+            ]
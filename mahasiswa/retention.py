@@ -0,0 +1,195 @@
+"""
+Retensi ProfileView: compaction, rollup, archive dan penghapusan row lama.
+
+Dipakai oleh management command `prune_profile_views`. Semua langkah berjalan per
+batch kecil berdasarkan primary key (tanpa lock tabel), sehingga aman dijalankan
+saat traffic live:
+
+1. compact   - row yang lebih tua dari `compact_after` hari: user_agent diringkas dan
+               referrer dipotong menjadi origin saja. Row yang sudah ringkas dilewati di
+               query, jadi setiap run hanya membaca row baru.
+2. prune     - row yang lebih tua dari `days` hari: (opsional) ditulis ke arsip JSONL
+               gzip, dimasukkan ke rollup harian/per jam (per hari yang disentuh batch,
+               rollup per jam hanya dalam masa retensinya) dan sketch viewer unik, lalu dihapus.
+3. rollups   - rollup per jam yang lebih tua dari `hourly_days` dihapus (rollup harian
+               tetap disimpan).
+"""
+import gzip
+import json
+import os
+import re
+import time
+from collections import defaultdict
+from datetime import datetime, time as dt_time, timedelta
+from urllib.parse import urlsplit
+
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import rollups
+from .hll import hash_value
+from .models import ProfileView, ProfileViewHourly
+from .view_tracking import viewer_key
+
+USER_AGENT_MAX_LENGTH = 100
+# Urutan prioritas: UA Edge/Opera juga memuat 'Chrome/', UA Android juga memuat 'Linux'
+_UA_PRODUCT_NAMES = ('Edg', 'OPR', 'Firefox', 'Chrome', 'Safari', 'okhttp', 'Dart', 'curl', 'python-requests')
+_UA_PRODUCTS = [re.compile(rf'({name})/(\d+)') for name in _UA_PRODUCT_NAMES]
+_UA_PLATFORMS = ('Android', 'iPhone', 'iPad', 'Windows', 'Mac OS X', 'CrOS', 'Linux')
+
+# Bentuk hasil compact_*; row yang sudah cocok tidak akan berubah lagi (regex portabel Python / PostgreSQL)
+_UA_PLATFORM_PATTERN = r'\((%s)\)' % '|'.join(re.escape(name) for name in _UA_PLATFORMS)
+COMPACT_USER_AGENT_PATTERN = r'^((%s)/[0-9]+( %s)?|%s)?$' % (
+    '|'.join(re.escape(name) for name in _UA_PRODUCT_NAMES),
+    _UA_PLATFORM_PATTERN,
+    _UA_PLATFORM_PATTERN,
+)
+COMPACT_REFERRER_PATTERN = r'^([a-z][a-z0-9+.-]*://[^/?#]+)?$'
+
+ARCHIVE_FIELDS = (
+    'id', 'mahasiswa_id', 'viewed_by_user_id', 'session_key', 'viewed_by_ip',
+    'user_agent', 'referrer', 'created_at',
+)
+
+
+def compact_user_agent(user_agent):
+    """Ringkas user agent menjadi 'Produk/major (Platform)', mis. 'Chrome/120 (Android)'"""
+    if not user_agent:
+        return ''
+    product = next((match for match in (pattern.search(user_agent) for pattern in _UA_PRODUCTS) if match), None)
+    platform = next((name for name in _UA_PLATFORMS if name in user_agent), None)
+    parts = []
+    if product:
+        parts.append(f'{product.group(1)}/{product.group(2)}')
+    if platform:
+        parts.append(f'({platform})')
+    return ' '.join(parts) or user_agent[:USER_AGENT_MAX_LENGTH]
+
+
+def compact_referrer(referrer):
+    """Hanya simpan origin referrer (scheme://host)"""
+    if not referrer:
+        return referrer
+    parts = urlsplit(referrer)
+    if not parts.scheme or not parts.netloc:
+        return None
+    return f'{parts.scheme}://{parts.netloc}'
+
+
+def _pk_batches(queryset, batch_size):
+    """Primary key per batch (keyset berdasarkan pk, tiap batch satu query kecil)"""
+    last_pk = 0
+    while True:
+        pks = list(queryset.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size])
+        if not pks:
+            return
+        yield pks
+        last_pk = pks[-1]
+
+
+def compact(cutoff, batch_size=1000, pause=0):
+    """Ringkas user_agent & referrer row yang lebih tua dari cutoff; return jumlah row yang diubah"""
+    compacted = Q(user_agent__regex=COMPACT_USER_AGENT_PATTERN) & (
+        Q(referrer__isnull=True) | Q(referrer__regex=COMPACT_REFERRER_PATTERN)
+    )
+    queryset = ProfileView.objects.filter(created_at__lt=cutoff).exclude(compacted)
+    changed = 0
+    for pks in _pk_batches(queryset, batch_size):
+        rows = list(ProfileView.objects.filter(pk__in=pks).only('pk', 'user_agent', 'referrer'))
+        updated = []
+        for row in rows:
+            user_agent = compact_user_agent(row.user_agent)
+            referrer = compact_referrer(row.referrer)
+            if user_agent != row.user_agent or referrer != row.referrer:
+                row.user_agent, row.referrer = user_agent, referrer
+                updated.append(row)
+        if updated:
+            ProfileView.objects.bulk_update(updated, ['user_agent', 'referrer'])
+            changed += len(updated)
+        if pause:
+            time.sleep(pause)
+    return changed
+
+
+def _archive_row(row):
+    data = {field: row[field] for field in ARCHIVE_FIELDS}
+    data['created_at'] = data['created_at'].isoformat()
+    return json.dumps(data, ensure_ascii=False)
+
+
+def _record_viewers(rows):
+    """Pastikan viewer row yang akan dihapus sudah ada di sketch viewer unik (HyperLogLog, idempotent)"""
+    viewers = defaultdict(set)
+    for row in rows:
+        if row['viewed_by_user_id'] is None and not row['session_key']:
+            continue
+        key = (row['mahasiswa_id'], timezone.localdate(row['created_at']))
+        viewers[key].add(hash_value(viewer_key((row['viewed_by_user_id'], row['session_key']))))
+    rollups.record_viewers(viewers)
+
+
+def _backfill_day(day, cutoff, hourly_cutoff):
+    """
+    Isi bucket rollup yang belum ada dari semua row satu hari (sebelum cutoff) sekaligus,
+    supaya bucket tidak terisi sebagian jika row-nya terbagi ke beberapa batch. Rollup per
+    jam hanya diisi untuk row setelah hourly_cutoff (yang lebih lama akan dihapus).
+    """
+    start = timezone.make_aware(datetime.combine(day, dt_time.min))
+    end = min(timezone.make_aware(datetime.combine(day + timedelta(days=1), dt_time.min)), cutoff)
+    queryset = ProfileView.objects.filter(created_at__gte=start, created_at__lt=end)
+    rollups.backfill(queryset=queryset, intervals=(rollups.DAY,))
+    if hourly_cutoff is None or hourly_cutoff < end:
+        if hourly_cutoff is not None and hourly_cutoff > start:
+            queryset = queryset.filter(created_at__gte=hourly_cutoff)
+        rollups.backfill(queryset=queryset, intervals=(rollups.HOUR,))
+
+
+def prune(cutoff, batch_size=1000, archive_dir=None, pause=0, hourly_cutoff=None):
+    """Rollup, arsipkan (opsional) lalu hapus row yang lebih tua dari cutoff; return (jumlah dihapus, path arsip)"""
+    queryset = ProfileView.objects.filter(created_at__lt=cutoff)
+    archive = None
+    archive_path = None
+    if archive_dir:
+        os.makedirs(archive_dir, exist_ok=True)
+        archive_path = os.path.join(
+            archive_dir,
+            f"profile_views_before_{cutoff:%Y%m%d}_{timezone.now():%Y%m%d%H%M%S}.jsonl.gz",
+        )
+        archive = gzip.open(archive_path, 'wt', encoding='utf-8')
+
+    deleted = 0
+    backfilled_days = set()
+    try:
+        for pks in _pk_batches(queryset, batch_size):
+            rows = list(ProfileView.objects.filter(pk__in=pks).order_by('pk').values(*ARCHIVE_FIELDS))
+            # Bucket yang sudah diisi ingest tidak disentuh (ON CONFLICT DO NOTHING)
+            days = {timezone.localdate(row['created_at']) for row in rows} - backfilled_days
+            for day in sorted(days):
+                _backfill_day(day, cutoff, hourly_cutoff)
+            backfilled_days |= days
+            if archive:
+                archive.write(''.join(_archive_row(row) + '\n' for row in rows))
+                archive.flush()
+            _record_viewers(rows)
+            with transaction.atomic():
+                count, _ = ProfileView.objects.filter(pk__in=pks).delete()
+            deleted += count
+            if pause:
+                time.sleep(pause)
+    finally:
+        if archive:
+            archive.close()
+    return deleted, archive_path
+
+
+def prune_hourly_rollups(cutoff, batch_size=1000, pause=0):
+    """Hapus rollup per jam sebelum cutoff (rollup harian tetap ada); return jumlah row dihapus"""
+    queryset = ProfileViewHourly.objects.filter(bucket__lt=cutoff)
+    deleted = 0
+    for pks in _pk_batches(queryset, batch_size):
+        count, _ = ProfileViewHourly.objects.filter(pk__in=pks).delete()
+        deleted += count
+        if pause:
+            time.sleep(pause)
+    return deleted
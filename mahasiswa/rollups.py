@@ -0,0 +1,196 @@
+"""
+Rollup view per profil per jam / per hari (ProfileViewHourly, ProfileViewDaily).
+
+Ingest view (mahasiswa.view_tracking) menambah counter rollup dengan upsert
+`INSERT ... ON CONFLICT (mahasiswa_id, bucket) DO UPDATE SET views = views + n`
+(PostgreSQL & SQLite >= 3.24). Time series profil / prodi dibaca langsung dari
+tabel rollup tanpa menyentuh row ProfileView mentah.
+"""
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+
+from django.db import connection, transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate, TruncHour
+from django.utils import timezone
+
+from . import cache
+from .hll import HyperLogLog
+from .models import Mahasiswa, ProfileView, ProfileViewDaily, ProfileViewHourly, ProfileViewerSketch
+
+HOUR = 'hour'
+DAY = 'day'
+INTERVALS = {
+    HOUR: ProfileViewHourly,
+    DAY: ProfileViewDaily,
+}
+# Rentang default & maksimum per request (jumlah bucket)
+DEFAULT_BUCKETS = {HOUR: 48, DAY: 30}
+MAX_BUCKETS = {HOUR: 24 * 31, DAY: 366}
+
+
+def hour_bucket(timestamp):
+    return timestamp.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def day_bucket(timestamp):
+    if isinstance(timestamp, datetime):
+        return timezone.localdate(timestamp)
+    return timestamp
+
+
+def _upsert(model, counts, on_conflict):
+    if not counts:
+        return
+    table = connection.ops.quote_name(model._meta.db_table)
+    bucket_field = model._meta.get_field('bucket')
+    rows = [
+        (mahasiswa_id, bucket_field.get_db_prep_value(bucket, connection), views)
+        for (mahasiswa_id, bucket), views in counts.items()
+    ]
+    sql = (
+        f'INSERT INTO {table} (mahasiswa_id, bucket, views) VALUES (%s, %s, %s) '
+        f'ON CONFLICT (mahasiswa_id, bucket) {on_conflict}'
+    )
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def increment(model, counts):
+    """Tambah `counts` {(mahasiswa_id, bucket): views} ke tabel rollup"""
+    table = connection.ops.quote_name(model._meta.db_table)
+    _upsert(model, counts, f'DO UPDATE SET views = {table}.views + excluded.views')
+
+
+def record(counts):
+    """Tambah view {(mahasiswa_id, hour_bucket): views} ke rollup per jam dan per hari"""
+    daily = {}
+    for (mahasiswa_id, hour), views in counts.items():
+        key = (mahasiswa_id, day_bucket(hour))
+        daily[key] = daily.get(key, 0) + views
+    with transaction.atomic():
+        increment(ProfileViewHourly, counts)
+        increment(ProfileViewDaily, daily)
+
+
+def record_viewers(batch):
+    """
+    Tambah hash viewer {(mahasiswa_id, day): {hash, ...}} ke sketch HyperLogLog harian
+    (ProfileViewDaily.viewers_sketch) dan lifetime (ProfileViewerSketch), lalu perbarui
+    estimasi Mahasiswa.unique_viewers. Row sketch dikunci (select_for_update) supaya
+    merge dari beberapa proses tidak saling menimpa.
+    """
+    if not batch:
+        return
+    per_profile = {}
+    for (mahasiswa_id, day), hashes in batch.items():
+        per_profile.setdefault(mahasiswa_id, set()).update(hashes)
+
+    with transaction.atomic():
+        _upsert(ProfileViewDaily, {key: 0 for key in batch}, 'DO NOTHING')
+        days = {day for _, day in batch}
+        daily_rows = ProfileViewDaily.objects.select_for_update().filter(
+            mahasiswa_id__in=per_profile, bucket__in=days
+        ).order_by('pk')
+        updated_daily = []
+        for row in daily_rows:
+            hashes = batch.get((row.mahasiswa_id, row.bucket))
+            if hashes:
+                sketch = HyperLogLog.from_bytes(row.viewers_sketch)
+                for hashed in hashes:
+                    sketch.add_hash(hashed)
+                row.viewers_sketch = sketch.to_bytes()
+                updated_daily.append(row)
+        ProfileViewDaily.objects.bulk_update(updated_daily, ['viewers_sketch'], batch_size=500)
+
+        ProfileViewerSketch.objects.bulk_create(
+            [ProfileViewerSketch(mahasiswa_id=mahasiswa_id, sketch=b'') for mahasiswa_id in per_profile],
+            ignore_conflicts=True,
+        )
+        lifetime_rows = ProfileViewerSketch.objects.select_for_update().filter(
+            mahasiswa_id__in=per_profile
+        ).order_by('pk')
+        updated_lifetime = []
+        estimates = []
+        for row in lifetime_rows:
+            sketch = HyperLogLog.from_bytes(row.sketch)
+            for hashed in per_profile[row.mahasiswa_id]:
+                sketch.add_hash(hashed)
+            row.sketch = sketch.to_bytes()
+            row.updated_at = timezone.now()
+            updated_lifetime.append(row)
+            estimates.append(Mahasiswa(pk=row.mahasiswa_id, unique_viewers=sketch.count()))
+        ProfileViewerSketch.objects.bulk_update(updated_lifetime, ['sketch', 'updated_at'], batch_size=500)
+        Mahasiswa.objects.bulk_update(estimates, ['unique_viewers'], batch_size=500)
+
+    # unique_viewers tampil di listing homepage
+    cache.invalidate(*cache.HOMEPAGE_NAMESPACES)
+
+
+def unique_viewers(start, end, **filters):
+    """Estimasi viewer unik dalam rentang hari [start, end]: merge sketch harian"""
+    sketches = ProfileViewDaily.objects.filter(
+        bucket__range=(start, end), viewers_sketch__isnull=False, **filters
+    ).values_list('viewers_sketch', flat=True)
+    return HyperLogLog.union(sketches.iterator(chunk_size=500)).count()
+
+
+def backfill(since=None, queryset=None, intervals=(HOUR, DAY)):
+    """
+    Isi bucket yang belum ada dari row ProfileView mentah (untuk data sebelum rollup aktif).
+    ProfileView hanya menyimpan viewer unik, jadi hasilnya batas bawah; bucket yang sudah
+    terisi dari ingest tidak disentuh (ON CONFLICT DO NOTHING). Return jumlah bucket yang diproses.
+    """
+    queryset = (queryset if queryset is not None else ProfileView.objects.all()).order_by()
+    if since is not None:
+        queryset = queryset.filter(created_at__gte=since)
+
+    processed = 0
+    truncs = {HOUR: TruncHour('created_at', tzinfo=dt_timezone.utc), DAY: TruncDate('created_at')}
+    for interval in intervals:
+        model, trunc = INTERVALS[interval], truncs[interval]
+        rows = queryset.annotate(bucket=trunc).values('mahasiswa_id', 'bucket').annotate(views=Count('pk'))
+        counts = {(row['mahasiswa_id'], row['bucket']): row['views'] for row in rows}
+        _upsert(model, counts, 'DO NOTHING')
+        processed += len(counts)
+    return processed
+
+
+def bucket_range(interval, start=None, end=None):
+    """Normalisasi (start, end) inklusif ke batas bucket; default DEFAULT_BUCKETS terakhir"""
+    step = timedelta(hours=1) if interval == HOUR else timedelta(days=1)
+    to_bucket = hour_bucket if interval == HOUR else day_bucket
+    end = to_bucket(end or timezone.now())
+    start = to_bucket(start) if start else end - step * (DEFAULT_BUCKETS[interval] - 1)
+    if (end - start) // step + 1 > MAX_BUCKETS[interval]:
+        start = end - step * (MAX_BUCKETS[interval] - 1)
+    return start, end, step
+
+
+def timeseries(interval, start=None, end=None, **filters):
+    """
+    Time series views dari rollup, bucket kosong diisi 0.
+    `filters` diteruskan ke queryset rollup, mis. mahasiswa_id=1 atau mahasiswa__prodi='Informatika'.
+    """
+    start, end, step = bucket_range(interval, start, end)
+    totals = dict(
+        INTERVALS[interval].objects.filter(bucket__range=(start, end), **filters)
+        .values('bucket').annotate(total=Sum('views')).order_by().values_list('bucket', 'total')
+    )
+    series = []
+    bucket = start
+    while bucket <= end:
+        series.append({'bucket': bucket.isoformat(), 'views': totals.get(bucket, 0)})
+        bucket += step
+    return series
+
+
+def parse_bucket(value, interval):
+    """Parse parameter start/end (YYYY-MM-DD atau ISO datetime); ValueError jika tidak valid"""
+    if not value:
+        return None
+    if interval == DAY:
+        return date.fromisoformat(value[:10])
+    parsed = datetime.fromisoformat(value)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
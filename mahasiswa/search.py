@@ -0,0 +1,196 @@
+"""
+Full-text search backend untuk direktori mahasiswa.
+
+PostgreSQL: kolom `search_vector` (tsvector) + GIN index, dijaga oleh trigger
+database (lihat migration 0006_search_index).
+SQLite: virtual table FTS5 `mahasiswa_search` yang dijaga oleh trigger.
+Trigger SQLite di-drop sebelum migrate (SQLite membuat ulang tabel saat ALTER,
+trigger yang mereferensikan tabel tersebut akan rusak) lalu dipasang ulang dan
+index di-rebuild setelah migrate, lihat mahasiswa.signals.
+Backend lain jatuh kembali ke SearchFilter bawaan DRF.
+"""
+import re
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+from rest_framework.settings import api_settings
+
+from .models import Mahasiswa
+
+SQLITE_FTS_TABLE = 'mahasiswa_search'
+
+# Bobot kolom FTS5 (nama, nim, prodi, skills, bio) - mengikuti setweight A/A/B/B/C di PostgreSQL
+SQLITE_BM25_WEIGHTS = '10.0, 10.0, 4.0, 4.0, 1.0'
+
+SQLITE_SKILLS = "(SELECT group_concat(nama, ' ') FROM skills_skill WHERE mahasiswa_id = {ref})"
+
+SQLITE_TRIGGERS = {
+    'mahasiswa_search_insert': f"""
+        CREATE TRIGGER mahasiswa_search_insert AFTER INSERT ON mahasiswa_mahasiswa BEGIN
+            INSERT INTO {SQLITE_FTS_TABLE}(rowid, nama, nim, prodi, skills, bio)
+            VALUES (NEW.id, NEW.nama, NEW.nim, NEW.prodi, {SQLITE_SKILLS.format(ref='NEW.id')}, NEW.bio);
+        END
+    """,
+    'mahasiswa_search_update': f"""
+        CREATE TRIGGER mahasiswa_search_update AFTER UPDATE OF nama, nim, prodi, bio ON mahasiswa_mahasiswa BEGIN
+            DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = OLD.id;
+            INSERT INTO {SQLITE_FTS_TABLE}(rowid, nama, nim, prodi, skills, bio)
+            VALUES (NEW.id, NEW.nama, NEW.nim, NEW.prodi, {SQLITE_SKILLS.format(ref='NEW.id')}, NEW.bio);
+        END
+    """,
+    'mahasiswa_search_delete': f"""
+        CREATE TRIGGER mahasiswa_search_delete AFTER DELETE ON mahasiswa_mahasiswa BEGIN
+            DELETE FROM {SQLITE_FTS_TABLE} WHERE rowid = OLD.id;
+        END
+    """,
+    'skills_skill_search_insert': f"""
+        CREATE TRIGGER skills_skill_search_insert AFTER INSERT ON skills_skill BEGIN
+            UPDATE {SQLITE_FTS_TABLE} SET skills = {SQLITE_SKILLS.format(ref='NEW.mahasiswa_id')}
+            WHERE rowid = NEW.mahasiswa_id;
+        END
+    """,
+    'skills_skill_search_update': f"""
+        CREATE TRIGGER skills_skill_search_update AFTER UPDATE OF nama, mahasiswa_id ON skills_skill BEGIN
+            UPDATE {SQLITE_FTS_TABLE} SET skills = {SQLITE_SKILLS.format(ref='OLD.mahasiswa_id')}
+            WHERE rowid = OLD.mahasiswa_id;
+            UPDATE {SQLITE_FTS_TABLE} SET skills = {SQLITE_SKILLS.format(ref='NEW.mahasiswa_id')}
+            WHERE rowid = NEW.mahasiswa_id;
+        END
+    """,
+    'skills_skill_search_delete': f"""
+        CREATE TRIGGER skills_skill_search_delete AFTER DELETE ON skills_skill BEGIN
+            UPDATE {SQLITE_FTS_TABLE} SET skills = {SQLITE_SKILLS.format(ref='OLD.mahasiswa_id')}
+            WHERE rowid = OLD.mahasiswa_id;
+        END
+    """,
+}
+
+_TOKEN_RE = re.compile(r'\w+', re.UNICODE)
+_fts_available = {}
+
+
+def tokenize(terms):
+    """Pecah search terms menjadi token lowercase yang aman untuk query FTS"""
+    tokens = []
+    for term in terms:
+        tokens.extend(token.lower() for token in _TOKEN_RE.findall(term))
+    return tokens
+
+
+def _sqlite_fts_available(connection):
+    if connection.alias not in _fts_available:
+        with connection.cursor() as cursor:
+            _fts_available[connection.alias] = (
+                SQLITE_FTS_TABLE in connection.introspection.table_names(cursor)
+            )
+    return _fts_available[connection.alias]
+
+
+def uninstall_sqlite_search_triggers(connection):
+    """Drop trigger FTS (dipanggil sebelum migrate)"""
+    if connection.vendor != 'sqlite':
+        return
+    with connection.cursor() as cursor:
+        for name in SQLITE_TRIGGERS:
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+
+
+def install_sqlite_search(connection):
+    """Buat tabel FTS5 + trigger dan rebuild isinya dari data yang ada"""
+    if connection.vendor != 'sqlite':
+        return
+    _fts_available.pop(connection.alias, None)
+    with connection.cursor() as cursor:
+        tables = connection.introspection.table_names(cursor)
+        if 'mahasiswa_mahasiswa' not in tables or 'skills_skill' not in tables:
+            return
+        cursor.execute("SELECT sqlite_compileoption_used('ENABLE_FTS5')")
+        if not cursor.fetchone()[0]:
+            # Tanpa FTS5, MahasiswaSearchFilter memakai SearchFilter bawaan DRF
+            return
+
+        cursor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5("
+            "nama, nim, prodi, skills, bio, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        for name, sql in SQLITE_TRIGGERS.items():
+            cursor.execute(f'DROP TRIGGER IF EXISTS {name}')
+            cursor.execute(sql)
+
+        cursor.execute(f'DELETE FROM {SQLITE_FTS_TABLE}')
+        cursor.execute(
+            f"INSERT INTO {SQLITE_FTS_TABLE}(rowid, nama, nim, prodi, skills, bio) "
+            f"SELECT m.id, m.nama, m.nim, m.prodi, {SQLITE_SKILLS.format(ref='m.id')}, m.bio "
+            "FROM mahasiswa_mahasiswa m"
+        )
+
+
+def search_mahasiswa(queryset, terms):
+    """
+    Filter queryset dengan full-text index dan annotate `search_rank`.
+    Setiap token dicocokkan sebagai prefix, semua token harus cocok (AND).
+    Return None jika database tidak punya full-text index.
+    """
+    tokens = tokenize(terms)
+    if not tokens:
+        return queryset
+
+    connection = connections[queryset.db]
+    table = Mahasiswa._meta.db_table
+
+    if connection.vendor == 'postgresql':
+        tsquery = ' & '.join(f'{token}:*' for token in tokens)
+        return queryset.filter(
+            RawSQL(
+                f"{table}.search_vector @@ to_tsquery('simple', %s)",
+                (tsquery,),
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"ts_rank_cd({table}.search_vector, to_tsquery('simple', %s))",
+                (tsquery,),
+                output_field=FloatField(),
+            )
+        )
+
+    if connection.vendor == 'sqlite' and _sqlite_fts_available(connection):
+        match = ' '.join(f'"{token}"*' for token in tokens)
+        return queryset.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s",
+                (match,),
+            )
+        ).annotate(
+            # bm25() bernilai negatif, makin kecil makin relevan
+            search_rank=RawSQL(
+                f"(SELECT -bm25({SQLITE_FTS_TABLE}, {SQLITE_BM25_WEIGHTS}) FROM {SQLITE_FTS_TABLE} "
+                f"WHERE {SQLITE_FTS_TABLE} MATCH %s AND rowid = {table}.id)",
+                (match,),
+                output_field=FloatField(),
+            )
+        )
+
+    return None
+
+
+class MahasiswaSearchFilter(filters.SearchFilter):
+    """
+    SearchFilter yang memakai full-text index dan mengurutkan hasil berdasarkan relevansi.
+    Taruh setelah OrderingFilter: jika client mengirim `ordering`, urutan itu dipertahankan.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        searched = search_mahasiswa(queryset, terms)
+        if searched is None:
+            return super().filter_queryset(request, queryset, view)
+
+        if request.query_params.get(api_settings.ORDERING_PARAM):
+            return searched
+        return searched.order_by('-search_rank', '-created_at')
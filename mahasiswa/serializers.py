@@ -1,7 +1,9 @@
 from rest_framework import serializers
 from .models import Mahasiswa, Pengalaman
-from skills.serializers import SkillSerializer
+from skills.serializers import SkillSerializer, SkillSummarySerializer
 from talents.serializers import TalentSerializer
+from .fieldsets import Fieldset
+from . import trending
 
 
 class PengalamanSerializer(serializers.ModelSerializer):
@@ -22,9 +24,9 @@ class MahasiswaSerializer(serializers.ModelSerializer):
             'id', 'user', 'username', 'nama', 'nim', 'prodi', 'angkatan', 'fakultas',
             'email', 'telepon', 'alamat', 'foto_profil', 'bio', 'tanggal_lahir', 'is_active',
             'linkedin', 'github', 'instagram', 'website',
-            'skills', 'pengalaman', 'talents', 'views_count', 'created_at', 'updated_at'
+            'skills', 'pengalaman', 'talents', 'views_count', 'unique_viewers', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['user', 'views_count', 'created_at', 'updated_at']
+        read_only_fields = ['user', 'views_count', 'unique_viewers', 'created_at', 'updated_at']
         extra_kwargs = {
             'nama': {'required': False},
             'nim': {'required': False},
@@ -57,10 +59,19 @@ class MahasiswaSerializer(serializers.ModelSerializer):
         
         return value
     
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, fieldset=None, **kwargs):
         """Override init to make all fields optional for updates"""
         super().__init__(*args, **kwargs)
         
+        # Sparse fieldsets & expansion (?fields= / ?expand=) dari request atau argumen eksplisit
+        self.fieldset = fieldset or Fieldset.from_request(self.context.get('request'))
+        if not self.fieldset.is_default:
+            for field_name in list(self.fields):
+                if not self.fieldset.includes(field_name):
+                    self.fields.pop(field_name)
+            if 'skills' in self.fields and not self.fieldset.include_endorsements():
+                self.fields['skills'] = SkillSummarySerializer(many=True, read_only=True)
+        
         # If this is an update (instance exists), make ALL fields optional
         if self.instance is not None:
             for field_name, field in self.fields.items():
@@ -94,11 +105,27 @@ class MahasiswaListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'nama', 'nim', 'prodi', 'angkatan', 'fakultas', 'email',
             'foto_profil', 'bio', 'is_active', 'skills_count', 
-            'talents_count', 'views_count', 'created_at'
+            'talents_count', 'views_count', 'unique_viewers', 'created_at'
         ]
     
+    # Pakai annotation dari Mahasiswa.objects.with_counts() jika ada, supaya tidak ada COUNT per row
     def get_skills_count(self, obj):
+        if hasattr(obj, 'skills_count'):
+            return obj.skills_count
         return obj.skills.count()
-    
+
     def get_talents_count(self, obj):
-        return obj.talents.count()
\ No newline at end of file
+        if hasattr(obj, 'talents_count'):
+            return obj.talents_count
+        return obj.talents.count()
+
+
+class MahasiswaTrendingSerializer(MahasiswaListSerializer):
+    """List serializer + trending_score (jumlah view ter-decay saat ini)"""
+    trending_score = serializers.SerializerMethodField()
+
+    class Meta(MahasiswaListSerializer.Meta):
+        fields = MahasiswaListSerializer.Meta.fields + ['trending_score']
+
+    def get_trending_score(self, obj):
+        return round(trending.current_value(obj.trending_score), 2)
\ No newline at end of file
@@ -0,0 +1,96 @@
+import threading
+from contextlib import contextmanager
+
+from django.db import connections
+from django.db.models.signals import post_save, post_delete, pre_migrate, post_migrate
+from django.dispatch import receiver
+
+from skills.leaderboards import leaderboard_queue
+from skills.models import Skill, SkillTag, SkillTagAlias
+from talents.models import Talent
+from . import cache
+from .minhash import minhash_queue
+from .models import Mahasiswa, ProfileRecommendation
+from .search import install_sqlite_search, uninstall_sqlite_search_triggers
+
+
+@receiver([post_save, post_delete], sender=Mahasiswa)
+def mahasiswa_changed(sender, instance, update_fields=None, **kwargs):
+    """Invalidate cache homepage saat profil dibuat/diubah/di-toggle/dihapus atau views_count berubah"""
+    namespaces = list(cache.HOMEPAGE_NAMESPACES)
+    # Facet & index autocomplete tidak bergantung pada views_count
+    if not (update_fields and set(update_fields) == {'views_count'}):
+        namespaces += [cache.FACETS, cache.SUGGEST]
+        # prodi / is_active ikut menentukan leaderboard skill
+        leaderboard_queue.add(mahasiswa_id=instance.pk)
+    cache.invalidate(*namespaces)
+
+
+_skill_batch = threading.local()
+
+
+def skills_changed(mahasiswa_id, tag_ids):
+    """Efek samping perubahan skill satu profil (tag_ids: tag yang ditambah/dihapus)"""
+    # skills_count tampil di listing homepage, nama skill dipakai facet top skills
+    cache.invalidate(*cache.HOMEPAGE_NAMESPACES, cache.FACETS)
+    # Hasil batch recommender profil ini sudah usang: pakai lookup Jaccard langsung sampai run berikutnya
+    ProfileRecommendation.objects.filter(mahasiswa_id=mahasiswa_id).delete()
+    # Signature MinHash & band LSH dihitung ulang per batch
+    minhash_queue.add(mahasiswa_id)
+    leaderboard_queue.add(mahasiswa_id=mahasiswa_id)
+    for tag_id in tag_ids:
+        leaderboard_queue.add(tag_id=tag_id)
+
+
+@contextmanager
+def batched_skill_changes():
+    """
+    Kumpulkan perubahan Skill di dalam blok ini ({mahasiswa_id: {tag_id, ...}}) dan jalankan
+    efek sampingnya sekali per profil di akhir blok, bukan per row. Perubahan lewat
+    bulk_create / bulk_update (tanpa signal) ditambahkan sendiri ke dict yang di-yield.
+    """
+    pending = getattr(_skill_batch, 'pending', None)
+    if pending is not None:
+        yield pending
+        return
+    _skill_batch.pending = pending = {}
+    try:
+        yield pending
+    finally:
+        _skill_batch.pending = None
+    for mahasiswa_id, tag_ids in pending.items():
+        skills_changed(mahasiswa_id, tag_ids)
+
+
+@receiver([post_save, post_delete], sender=Skill)
+def skill_changed(sender, instance, **kwargs):
+    pending = getattr(_skill_batch, 'pending', None)
+    if pending is not None:
+        pending.setdefault(instance.mahasiswa_id, set()).add(instance.tag_id)
+        return
+    skills_changed(instance.mahasiswa_id, {instance.tag_id})
+
+
+@receiver([post_save, post_delete], sender=SkillTag)
+@receiver([post_save, post_delete], sender=SkillTagAlias)
+def skill_tag_changed(sender, instance, **kwargs):
+    """Nama / alias skill berubah: index autocomplete skill dibangun ulang"""
+    cache.invalidate(cache.SKILL_SUGGEST)
+
+
+@receiver([post_save, post_delete], sender=Talent)
+def talent_changed(sender, instance, **kwargs):
+    """talents_count ikut tampil di listing homepage"""
+    cache.invalidate(*cache.HOMEPAGE_NAMESPACES)
+
+
+@receiver(pre_migrate)
+def drop_search_triggers(sender, using, **kwargs):
+    if sender.label == 'mahasiswa':
+        uninstall_sqlite_search_triggers(connections[using])
+
+
+@receiver(post_migrate)
+def rebuild_search_index(sender, using, **kwargs):
+    if sender.label == 'mahasiswa':
+        install_sqlite_search(connections[using])
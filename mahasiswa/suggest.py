@@ -0,0 +1,124 @@
+"""
+Autocomplete nama / NIM mahasiswa yang toleran typo.
+
+PostgreSQL: operator word similarity pg_trgm (`<%`) di atas GIN trigram index
+`mahasiswa_nama_trgm` (migration 0009) dan prefix match NIM yang memakai
+index varchar_pattern_ops bawaan Django untuk field unique `nim`.
+Database lain: index trigram in-process (SuggestIndex) yang dibangun ulang
+secara lazy setiap kali versi cache 'suggest' naik (lihat mahasiswa.signals).
+"""
+import bisect
+import threading
+from collections import defaultdict
+
+from django.db import connections
+from django.db.models import BooleanField, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+from . import cache
+from .models import Mahasiswa
+
+MIN_QUERY_LENGTH = 2
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 20
+# Skor minimum (proporsi trigram query yang ditemukan di nama) untuk fallback in-process
+MIN_SIMILARITY = 0.3
+
+SUGGEST_FIELDS = ('id', 'nama', 'nim', 'prodi')
+
+
+def trigrams(text):
+    """Trigram per kata dengan padding seperti pg_trgm"""
+    grams = set()
+    for word in text.lower().split():
+        padded = f'  {word} '
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class SuggestIndex:
+    """Index trigram (nama) + sorted list (NIM) untuk semua mahasiswa aktif"""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.postings = defaultdict(list)
+        for position, row in enumerate(rows):
+            for gram in trigrams(row['nama']):
+                self.postings[gram].append(position)
+        self.nims = sorted((row['nim'].upper(), position) for position, row in enumerate(rows))
+
+    @classmethod
+    def build(cls):
+        rows = list(Mahasiswa.objects.filter(is_active=True).order_by().values(*SUGGEST_FIELDS))
+        return cls(rows)
+
+    def nim_prefix(self, prefix, limit):
+        prefix = prefix.upper()
+        start = bisect.bisect_left(self.nims, (prefix,))
+        matches = []
+        for nim, position in self.nims[start:start + limit]:
+            if not nim.startswith(prefix):
+                break
+            matches.append(position)
+        return matches
+
+    def search(self, query, limit):
+        scores = {position: 2.0 for position in self.nim_prefix(query, limit)}
+
+        query_grams = trigrams(query)
+        if query_grams:
+            shared = defaultdict(int)
+            for gram in query_grams:
+                for position in self.postings.get(gram, ()):
+                    shared[position] += 1
+            lowered = query.lower()
+            for position, count in shared.items():
+                score = count / len(query_grams)
+                if self.rows[position]['nama'].lower().startswith(lowered):
+                    score += 1.0
+                if score >= MIN_SIMILARITY and score > scores.get(position, 0):
+                    scores[position] = score
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], self.rows[item[0]]['nama']))
+        return [dict(self.rows[position], score=round(score, 3)) for position, score in ranked[:limit]]
+
+
+_index = None
+_index_version = None
+_index_lock = threading.Lock()
+
+
+def get_index():
+    """SuggestIndex proses ini, dibangun ulang jika versi cache 'suggest' sudah berubah"""
+    global _index, _index_version
+    version = cache.get_version(cache.SUGGEST)
+    if _index is None or _index_version != version:
+        with _index_lock:
+            if _index is None or _index_version != version:
+                _index = SuggestIndex.build()
+                _index_version = version
+    return _index
+
+
+def suggest_postgres(query, limit):
+    table = Mahasiswa._meta.db_table
+    queryset = Mahasiswa.objects.filter(is_active=True).filter(
+        Q(RawSQL(f'%s <%% {table}.nama', (query,), output_field=BooleanField()))
+        | Q(nim__startswith=query.upper())
+    ).annotate(
+        score=RawSQL(
+            f'CASE WHEN {table}.nim LIKE %s THEN 2.0 ELSE word_similarity(%s, {table}.nama) END',
+            (query.upper().replace('%', r'\%').replace('_', r'\_') + '%', query),
+            output_field=FloatField(),
+        )
+    ).order_by('-score', 'nama')
+    return list(queryset.values(*SUGGEST_FIELDS, 'score')[:limit])
+
+
+def suggest(query, limit=DEFAULT_LIMIT):
+    query = ' '.join(query.split())
+    if len(query) < MIN_QUERY_LENGTH:
+        return []
+    if connections[Mahasiswa.objects.db].vendor == 'postgresql':
+        return suggest_postgres(query, limit)
+    return get_index().search(query, limit)
@@ -1,3 +1,986 @@
-from django.test import TestCase
+import base64
+import gzip
+import io
+import json
+import math
+import os
+import tempfile
+import threading
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import AnonymousUser, User
+from django.core.cache import cache as django_cache
+from django.core.management import call_command
+from django.db import IntegrityError, OperationalError, connection
+from django.db.models import F
+from django.test import RequestFactory, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from accounts.models import Profile
+from skills.leaderboards import leaderboard_queue
+from skills.models import Skill, SkillEndorsement
+from talents.models import Talent
+
+from . import bulk_import, minhash, retention, rollups, signals, trending
+from .conditional import get_profile_validators
+from .hll import HyperLogLog
+from .minhash import minhash_queue
+from .models import (
+    Mahasiswa, Pengalaman, ProfileLSHBand, ProfileMinHash, ProfileRecommendation, ProfileView,
+    ProfileViewDaily, ProfileViewHourly,
+)
+from .profile_sync import sync_pengalaman, sync_skills
+from .recommendations import load_skill_matrix, similar_profiles, skill_set, top_k_similar
+from .view_tracking import ProfileViewQueue, ViewCounter, ViewerSketchBuffer, ViewRollupBuffer, get_client_ip
+
+
+class ViewCounterConcurrencyTest(TransactionTestCase):
+    """Buffered view counter tidak boleh kehilangan increment saat diakses paralel"""
+
+    THREADS = 8
+    VIEWS_PER_THREAD = 250
+
+    def setUp(self):
+        self.profiles = [
+            Mahasiswa.objects.create(
+                user=User.objects.create(username=f'user{i}'),
+                nama=f'Mahasiswa {i}', nim=f'L2000{i}', prodi='Informatika', email=f'm{i}@example.com',
+            )
+            for i in range(3)
+        ]
+
+    def run_concurrently(self, counter):
+        start = threading.Barrier(self.THREADS)
+
+        def worker(index):
+            start.wait()
+            for n in range(self.VIEWS_PER_THREAD):
+                counter.add(self.profiles[(index + n) % len(self.profiles)].pk)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        counter.flush()
+
+    def assert_no_lost_views(self):
+        total = sum(Mahasiswa.objects.values_list('views_count', flat=True))
+        self.assertEqual(total, self.THREADS * self.VIEWS_PER_THREAD)
+
+    def test_buffered_increments_are_not_lost(self):
+        # Flush berkali-kali di tengah jalan (buffer kecil) sambil thread lain terus menambah
+        counter = ViewCounter(flush_interval=60, max_pending=50)
+        self.run_concurrently(counter)
+        self.assert_no_lost_views()
+        self.assertEqual(sum(counter.pending(profile.pk) for profile in self.profiles), 0)
+
+    def test_pending_views_flushed_once(self):
+        counter = ViewCounter(flush_interval=60, max_pending=10 ** 6)
+        self.run_concurrently(counter)
+        self.assert_no_lost_views()
+        self.assertEqual(counter.flush(), 0)
+        self.assert_no_lost_views()
+
+    def test_failed_size_triggered_flush_does_not_raise(self):
+        # Flush karena buffer penuh berjalan di request: error database hanya dicatat
+        counter = ViewCounter(flush_interval=60, max_pending=1)
+        with mock.patch.object(ViewCounter, '_write', side_effect=OperationalError('database is down')), \
+                self.assertLogs('mahasiswa.view_tracking', 'ERROR'):
+            counter.add(self.profiles[0].pk)
+        self.assertEqual(counter.pending(self.profiles[0].pk), 1)
+        counter.flush()
+        self.assertEqual(Mahasiswa.objects.get(pk=self.profiles[0].pk).views_count, 1)
+
+
+class ProfileValidatorsTest(TestCase):
+    """ETag detail profil harus berubah jika angka yang ditulis buffer view berubah"""
+
+    def setUp(self):
+        self.mahasiswa = Mahasiswa.objects.create(
+            user=User.objects.create(username='owner'),
+            nama='Mahasiswa', nim='L200001', prodi='Informatika', email='m@example.com',
+        )
+        self.request = RequestFactory().get(f'/api/mahasiswa/{self.mahasiswa.pk}/')
+
+    def test_viewer_sketch_flush_changes_etag(self):
+        etag, _ = get_profile_validators(self.mahasiswa, self.request)
+
+        sketches = ViewerSketchBuffer(flush_interval=60, max_pending=10 ** 6)
+        sketches.add(self.mahasiswa.pk, (None, 'session-a'))
+        sketches.add(self.mahasiswa.pk, (None, 'session-b'))
+        self.assertEqual(sketches.flush(), 2)
+
+        self.mahasiswa.refresh_from_db()
+        self.assertEqual(self.mahasiswa.unique_viewers, 2)
+        new_etag, _ = get_profile_validators(self.mahasiswa, self.request)
+        self.assertNotEqual(new_etag, etag)
+
+    def test_not_modified_skips_prefetch(self):
+        Skill.objects.create(mahasiswa=self.mahasiswa, nama='Python')
+        url = reverse('mahasiswa-detail', args=[self.mahasiswa.pk])
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([skill['nama'] for skill in response.data['skills']], ['Python'])
+
+        # Lookup pk + satu query validator; skills/talents/pengalaman tidak di-prefetch
+        with self.assertNumQueries(2):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 304)
+
+
+class DirectorySearchTest(TestCase):
+    """Full-text search direktori: prefix per token, index ikut berubah saat skill berubah"""
+
+    def setUp(self):
+        self.ani = Mahasiswa.objects.create(
+            user=User.objects.create(username='ani'), nama='Ani Wijaya', nim='L200001', prodi='Informatika',
+            email='ani@example.com', bio='Suka membuat aplikasi mobile',
+        )
+        self.budi = Mahasiswa.objects.create(
+            user=User.objects.create(username='budi'), nama='Budi Santoso', nim='L200002', prodi='Sistem Informasi',
+            email='budi@example.com', bio='Belajar bersama Ani di lab',
+        )
+        self.skill = Skill.objects.create(mahasiswa=self.budi, nama='Kubernetes')
+
+    def search(self, terms, **params):
+        response = self.client.get(reverse('mahasiswa-list'), {'search': terms, **params})
+        self.assertEqual(response.status_code, 200)
+        return [row['id'] for row in response.data['results']]
+
+    def test_prefix_tokens_and_relevance(self):
+        self.assertEqual(self.search('wija'), [self.ani.pk])
+        self.assertEqual(self.search('budi sistem'), [self.budi.pk])
+        # Cocok di nama lebih relevan daripada cocok di bio
+        self.assertEqual(self.search('ani'), [self.ani.pk, self.budi.pk])
+
+    def test_index_follows_skill_changes(self):
+        self.assertEqual(self.search('kuber'), [self.budi.pk])
+        self.skill.nama = 'Terraform'
+        self.skill.save()
+        self.assertEqual(self.search('kuber'), [])
+        self.assertEqual(self.search('terraform'), [self.budi.pk])
+        # Update kolom lain (counter endorsement) tidak mengubah isi index
+        Skill.objects.filter(pk=self.skill.pk).update(endorsement_count=F('endorsement_count') + 1)
+        self.assertEqual(self.search('terraform'), [self.budi.pk])
+        self.skill.delete()
+        self.assertEqual(self.search('terraform'), [])
+
+
+class DirectoryListCountsTest(TestCase):
+    """skills_count / talents_count listing dari annotation, bukan COUNT per row"""
+
+    def create_profiles(self, start, count):
+        for i in range(start, start + count):
+            profile = Mahasiswa.objects.create(
+                user=User.objects.create(username=f'user{i}'), nama=f'Mahasiswa {i}', nim=f'L2000{i}',
+                prodi='Informatika', email=f'm{i}@example.com',
+            )
+            for n in range(i % 3):
+                Skill.objects.create(mahasiswa=profile, nama=f'Skill {n}')
+            Talent.objects.create(mahasiswa=profile, judul='Project', deskripsi='-')
+
+    def list_queries(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(reverse('mahasiswa-list'))
+        self.assertEqual(response.status_code, 200)
+        return len(context.captured_queries), response.data['results']
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self.create_profiles(0, 2)
+        few, _ = self.list_queries()
+        self.create_profiles(2, 6)
+        many, results = self.list_queries()
+        self.assertEqual(few, many)
+        self.assertEqual(len(results), 8)
+        for row in results:
+            number = int(row['nim'][-1])
+            self.assertEqual((row['skills_count'], row['talents_count']), (number % 3, 1))
+
+
+class HomepageCacheTest(TestCase):
+    """Listing homepage di-cache dan di-invalidate setelah profil berubah (write-through)"""
+
+    def setUp(self):
+        django_cache.clear()
+        self.profile = self.create_mahasiswa('ani', 'L200001')
+
+    def create_mahasiswa(self, username, nim):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Mahasiswa.objects.create(
+                user=User.objects.create(username=username), nama=username, nim=nim,
+                prodi='Informatika', email=f'{username}@example.com',
+            )
+
+    def latest(self):
+        return [row['nim'] for row in self.client.get(reverse('mahasiswa-latest')).data['results']]
+
+    def test_cached_until_profile_changes(self):
+        self.assertEqual(self.latest(), ['L200001'])
+        with self.assertNumQueries(0):
+            self.assertEqual(self.latest(), ['L200001'])
+
+        self.create_mahasiswa('budi', 'L200002')
+        self.assertEqual(self.latest(), ['L200002', 'L200001'])
+
+        # Perubahan yang belum commit tidak menghapus cache
+        Mahasiswa.objects.filter(pk=self.profile.pk).update(is_active=False)
+        self.assertEqual(self.latest(), ['L200002', 'L200001'])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.profile.refresh_from_db()
+            self.profile.save()
+        self.assertEqual(self.latest(), ['L200002'])
+
+    def test_skill_change_refreshes_counts(self):
+        url = reverse('mahasiswa-most-viewed')
+        self.assertEqual(self.client.get(url).data['results'][0]['skills_count'], 0)
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(mahasiswa=self.profile, nama='Python')
+        self.assertEqual(self.client.get(url).data['results'][0]['skills_count'], 1)
+
+
+class DirectoryFacetsTest(TestCase):
+    """Facet counts mengikuti filter direktori dan di-cache per kombinasi filter"""
+
+    PROFILES = [
+        ('Informatika', 'FKI', '2022', ['Python', 'Go']),
+        ('Informatika', 'FKI', '2023', ['Python']),
+        ('Sistem Informasi', 'FKI', '2023', ['python', 'Figma']),
+        ('Manajemen', 'FEB', '2022', []),
+    ]
+
+    def setUp(self):
+        django_cache.clear()
+        for i, (prodi, fakultas, angkatan, skills) in enumerate(self.PROFILES):
+            profile = Mahasiswa.objects.create(
+                user=User.objects.create(username=f'user{i}'), nama=f'Mahasiswa {i}', nim=f'L2000{i}',
+                prodi=prodi, fakultas=fakultas, angkatan=angkatan, email=f'm{i}@example.com',
+            )
+            for name in skills:
+                Skill.objects.create(mahasiswa=profile, nama=name)
+
+    def facets(self, **params):
+        response = self.client.get(reverse('mahasiswa-facets'), params)
+        self.assertEqual(response.status_code, 200)
+        return {name: [(row['value'], row['count']) for row in rows] for name, rows in response.data['facets'].items()}
+
+    def test_counts_follow_filters(self):
+        facets = self.facets()
+        self.assertEqual(facets['prodi'], [('Informatika', 2), ('Manajemen', 1), ('Sistem Informasi', 1)])
+        self.assertEqual(facets['fakultas'], [('FKI', 3), ('FEB', 1)])
+        # Skill dikelompokkan per tag kanonik: 'Python' dan 'python' satu facet
+        self.assertEqual(facets['skills'][0][1], 3)
+        self.assertEqual(len(facets['skills']), 3)
+
+        filtered = self.facets(angkatan='2023')
+        self.assertEqual(filtered['prodi'], [('Informatika', 1), ('Sistem Informasi', 1)])
+        self.assertEqual(filtered['angkatan'], [('2023', 2)])
+
+    def test_cached_per_filter_combination(self):
+        self.facets(fakultas='FKI')
+        Mahasiswa.objects.filter(prodi='Manajemen').update(fakultas='FKI')
+        # Update tanpa signal: hasil cache lama masih dipakai untuk filter yang sama
+        self.assertEqual(self.facets(fakultas='FKI')['fakultas'], [('FKI', 3)])
+        self.assertEqual(self.facets(fakultas='FKI', prodi='Manajemen')['fakultas'], [('FKI', 1)])
+
+
+class SuggestTest(TestCase):
+    """Autocomplete nama (toleran typo) dan prefix NIM; index ikut berubah saat profil berubah"""
+
+    def setUp(self):
+        django_cache.clear()
+        for i, nama in enumerate(['Ani Wijaya', 'Anita Sari', 'Budi Santoso']):
+            self.create_mahasiswa(f'user{i}', nama, f'L20000{i}')
+
+    def create_mahasiswa(self, username, nama, nim, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Mahasiswa.objects.create(
+                user=User.objects.create(username=username), nama=nama, nim=nim,
+                prodi='Informatika', email=f'{username}@example.com', **fields,
+            )
+
+    def suggest(self, query, **params):
+        response = self.client.get(reverse('mahasiswa-suggest'), {'q': query, **params})
+        return [row['nama'] for row in response.data['results']]
+
+    def test_prefix_typo_and_nim(self):
+        self.assertEqual(self.suggest('ani')[:2], ['Ani Wijaya', 'Anita Sari'])
+        self.assertEqual(self.suggest('santsoo'), ['Budi Santoso'])
+        self.assertEqual(self.suggest('l200002'), ['Budi Santoso'])
+        self.assertEqual(self.suggest('a'), [])
+        self.assertEqual(len(self.suggest('ani', limit=1)), 1)
+
+    def test_index_rebuilt_after_profile_changes(self):
+        self.assertEqual(self.suggest('citra'), [])
+        citra = self.create_mahasiswa('citra', 'Citra Lestari', 'L200009')
+        self.assertEqual(self.suggest('citra'), ['Citra Lestari'])
+        with self.captureOnCommitCallbacks(execute=True):
+            citra.is_active = False
+            citra.save()
+        self.assertEqual(self.suggest('citra'), [])
+
+
+class SparseFieldsetTest(TestCase):
+    """?fields= / ?expand= mempersempit response; tanpa parameter representasi lengkap"""
+
+    def setUp(self):
+        self.mahasiswa = Mahasiswa.objects.create(
+            user=User.objects.create(username='owner'),
+            nama='Mahasiswa', nim='L200001', prodi='Informatika', email='m@example.com',
+        )
+        skill = Skill.objects.create(mahasiswa=self.mahasiswa, nama='Python')
+        SkillEndorsement.objects.create(skill=skill, endorsed_by=User.objects.create(username='endorser'))
+        self.url = reverse('mahasiswa-detail', args=[self.mahasiswa.pk])
+
+    def test_default_representation_is_unchanged(self):
+        data = self.client.get(self.url).data
+        for name in ('skills', 'talents', 'pengalaman', 'nim', 'email'):
+            self.assertIn(name, data)
+        self.assertIn('endorsements', data['skills'][0])
+
+    def test_fields_limits_columns_and_relations(self):
+        data = self.client.get(self.url, {'fields': 'id,nama,prodi'}).data
+        self.assertEqual(set(data), {'id', 'nama', 'prodi'})
+
+    def test_expand_skills_without_endorsements(self):
+        data = self.client.get(self.url, {'fields': 'id,nama', 'expand': 'skills'}).data
+        self.assertEqual(set(data), {'id', 'nama', 'skills'})
+        self.assertEqual(data['skills'][0]['nama'], 'Python')
+        self.assertNotIn('endorsements', data['skills'][0])
+
+        data = self.client.get(self.url, {'fields': 'id', 'expand': 'skills.endorsements'}).data
+        self.assertEqual(len(data['skills'][0]['endorsements']), 1)
+
+    def test_sparse_response_skips_unrequested_prefetches(self):
+        with CaptureQueriesContext(connection) as full:
+            self.client.get(self.url)
+        with CaptureQueriesContext(connection) as sparse:
+            self.client.get(self.url, {'fields': 'id,nama'})
+        # Prefetch skills, endorsements, talents dan pengalaman dilewati
+        self.assertEqual(len(full) - len(sparse), 4)
+
+
+class TrendingTest(TestCase):
+    """Skor trending: view lama ter-decay per half-life, endpoint urut menurut skor saat ini"""
+
+    def setUp(self):
+        django_cache.clear()
+        self.old, self.new = [
+            Mahasiswa.objects.create(
+                user=User.objects.create(username=f'user{i}'),
+                nama=f'Mahasiswa {i}', nim=f'L20000{i}', prodi='Informatika', email=f'm{i}@example.com',
+            )
+            for i in range(2)
+        ]
+
+    def record(self, mahasiswa, count, hours_ago=0):
+        counter = ViewCounter(flush_interval=60, max_pending=10 ** 6)
+        counter.add(mahasiswa.pk, count)
+        now = timezone.now() - timedelta(hours=hours_ago)
+        with self.captureOnCommitCallbacks(execute=True), mock.patch('django.utils.timezone.now', return_value=now):
+            counter.flush()
+        mahasiswa.refresh_from_db()
+
+    @override_settings(TRENDING_HALF_LIFE_HOURS=24)
+    def test_views_decay_per_half_life(self):
+        self.record(self.old, 8, hours_ago=48)
+        self.record(self.old, 1)
+        self.assertAlmostEqual(trending.current_value(self.old.trending_score), 3.0, places=3)
+        self.assertEqual(self.old.views_count, 9)
+        self.assertEqual(trending.current_value(self.new.trending_score), 0.0)
+
+    @override_settings(TRENDING_HALF_LIFE_HOURS=24)
+    def test_endpoint_orders_by_decayed_views(self):
+        self.record(self.old, 12, hours_ago=72)
+        self.record(self.new, 2)
+        response = self.client.get(reverse('mahasiswa-trending'))
+        results = response.data['results']
+        self.assertEqual([row['id'] for row in results], [self.new.pk, self.old.pk])
+        self.assertEqual([row['trending_score'] for row in results], [2.0, 1.5])
+
+        # Flush view berikutnya meng-invalidate cache endpoint
+        self.record(self.old, 10)
+        results = self.client.get(reverse('mahasiswa-trending')).data['results']
+        self.assertEqual([row['id'] for row in results], [self.old.pk, self.new.pk])
+
+
+class PruneProfileViewsTest(TestCase):
+    """Retensi ProfileView: row lama diringkas, di-rollup + diarsipkan lalu dihapus"""
+
+    USER_AGENT = 'Mozilla/5.0 (Linux; Android 10) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Mobile Safari/537.36'
+
+    def setUp(self):
+        self.mahasiswa = Mahasiswa.objects.create(
+            user=User.objects.create(username='owner'),
+            nama='Mahasiswa', nim='L200001', prodi='Informatika', email='m@example.com',
+        )
+        self.now = timezone.now()
+
+    def create_view(self, session_key, days_ago):
+        view = ProfileView.objects.create(
+            mahasiswa=self.mahasiswa, session_key=session_key,
+            user_agent=self.USER_AGENT, referrer='https://www.google.com/search?q=mahasiswa',
+        )
+        # created_at auto_now_add: geser lewat update
+        ProfileView.objects.filter(pk=view.pk).update(created_at=self.now - timedelta(days=days_ago))
+        return view
+
+    def prune(self, archive_dir):
+        call_command(
+            'prune_profile_views', days=180, compact_after=30, hourly_days=90,
+            archive_dir=archive_dir, batch_size=2, sleep=0, stdout=io.StringIO(),
+        )
+
+    def test_old_rows_are_rolled_up_archived_and_deleted(self):
+        old = [self.create_view(f'old-{i}', 200) for i in range(3)]
+        recent = self.create_view('recent', 1)
+
+        with tempfile.TemporaryDirectory() as archive_dir:
+            self.prune(archive_dir)
+            [archive] = os.listdir(archive_dir)
+            with gzip.open(os.path.join(archive_dir, archive), 'rt', encoding='utf-8') as file:
+                archived = [json.loads(line) for line in file]
+
+        self.assertEqual(list(ProfileView.objects.values_list('pk', flat=True)), [recent.pk])
+        self.assertEqual(sorted(row['id'] for row in archived), sorted(view.pk for view in old))
+        self.assertEqual(archived[0]['user_agent'], 'Chrome/120 (Android)')
+
+        # Total view tetap ada di rollup harian; rollup per jam di luar retensinya tidak dibuat
+        daily = ProfileViewDaily.objects.get(mahasiswa=self.mahasiswa)
+        self.assertEqual(daily.views, 3)
+        self.assertEqual(HyperLogLog.from_bytes(daily.viewers_sketch).count(), 3)
+        self.assertFalse(ProfileViewHourly.objects.exists())
+        self.mahasiswa.refresh_from_db()
+        self.assertEqual(self.mahasiswa.unique_viewers, 3)
+
+    def test_rows_past_compact_age_are_compacted_once(self):
+        old = self.create_view('old', 60)
+        recent = self.create_view('recent', 1)
+        self.prune(None)
+
+        old.refresh_from_db()
+        self.assertEqual((old.user_agent, old.referrer), ('Chrome/120 (Android)', 'https://www.google.com'))
+        recent.refresh_from_db()
+        self.assertEqual(recent.user_agent, self.USER_AGENT)
+        # Row yang sudah ringkas tidak dibaca lagi pada run berikutnya
+        self.assertEqual(retention.compact(self.now - timedelta(days=30)), 0)
+
+
+class SimilarProfilesTest(TestCase):
+    """Rekomendasi Jaccard lewat inverted index tag -> mahasiswa, ikut berubah saat skill berubah"""
+
+    def setUp(self):
+        self.target, self.close, self.far, self.other = [
+            Mahasiswa.objects.create(
+                user=User.objects.create(username=f'user{i}'),
+                nama=f'Mahasiswa {i}', nim=f'L20000{i}', prodi='Informatika', email=f'm{i}@example.com',
+            )
+            for i in range(4)
+        ]
+        self.add_skills(self.target, 'Python', 'Django', 'SQL')
+        self.add_skills(self.close, 'python', ' Django ')
+        self.add_skills(self.far, 'Python', 'Java', 'Go', 'Rust')
+        self.add_skills(self.other, 'Figma')
+        self.url = reverse('mahasiswa-recommendations', args=[self.target.pk])
+
+    def add_skills(self, mahasiswa, *names):
+        for nama in names:
+            Skill.objects.create(mahasiswa=mahasiswa, nama=nama)
+
+    def test_jaccard_counts_only_matching_skills(self):
+        similar = similar_profiles(self.target)
+        # |A ∩ B| / |A ∪ B|: skill lain kandidat menambah union, bukan overlap
+        self.assertEqual(
+            [(mahasiswa_id, round(score, 3), overlap) for mahasiswa_id, score, overlap in similar],
+            [(self.close.pk, 0.667, 2), (self.far.pk, 0.167, 1)],
+        )
+
+    def test_inactive_profiles_are_skipped(self):
+        self.close.is_active = False
+        self.close.save()
+        self.assertEqual([row[0] for row in similar_profiles(self.target)], [self.far.pk])
+
+    def test_precomputed_results_are_dropped_when_skills_change(self):
+        ProfileRecommendation.objects.create(
+            mahasiswa=self.target, recommended=self.other, score=0.9, rank=1, computed_at=timezone.now(),
+        )
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['similarity_metric'], 'cosine')
+        self.assertEqual([row['id'] for row in response.data['results']], [self.other.pk])
+
+        self.add_skills(self.target, 'Figma')
+        self.assertFalse(ProfileRecommendation.objects.filter(mahasiswa=self.target).exists())
+        response = self.client.get(self.url)
+        self.assertEqual(response.data['similarity_metric'], 'jaccard')
+        self.assertEqual(
+            [(row['id'], row['similarity']) for row in response.data['results']],
+            [(self.close.pk, 0.5), (self.other.pk, 0.25), (self.far.pk, 0.143)],
+        )
+
+
+class MinHashCandidatesTest(TestCase):
+    """Kandidat LSH dari band MinHash yang diperbarui per batch; fallback ke posting list penuh"""
+
+    def setUp(self):
+        self.target, self.twin, self.close, self.other = [
+            Mahasiswa.objects.create(
+                user=User.objects.create(username=f'user{i}'),
+                nama=f'Mahasiswa {i}', nim=f'L20000{i}', prodi='Informatika', email=f'm{i}@example.com',
+            )
+            for i in range(4)
+        ]
+        self.add_skills(self.target, 'Python', 'Django', 'SQL')
+        self.add_skills(self.twin, 'Python', 'Django', 'SQL')
+        self.add_skills(self.close, 'Python', 'Django')
+        self.add_skills(self.other, 'Figma')
+        minhash_queue.flush()
+
+    def add_skills(self, mahasiswa, *names):
+        for nama in names:
+            Skill.objects.create(mahasiswa=mahasiswa, nama=nama)
+
+    def candidates(self):
+        return minhash.candidates(self.target, skill_set(self.target))
+
+    def test_queue_flush_builds_signatures_and_bands(self):
+        self.assertEqual(ProfileMinHash.objects.count(), 4)
+        self.assertEqual(ProfileLSHBand.objects.filter(mahasiswa=self.twin).count(), minhash.BANDS)
+        candidates = self.candidates()
+        # Himpunan identik cocok di semua band dan diurutkan paling depan
+        self.assertEqual(candidates[0], self.twin.pk)
+        self.assertNotIn(self.other.pk, candidates)
+
+    def test_bands_follow_skill_changes(self):
+        self.twin.skills.all().delete()
+        self.add_skills(self.other, 'Python', 'Django', 'SQL')
+        minhash_queue.flush()
+        self.assertFalse(ProfileMinHash.objects.filter(mahasiswa=self.twin).exists())
+        self.assertFalse(ProfileLSHBand.objects.filter(mahasiswa=self.twin).exists())
+        self.assertNotIn(self.twin.pk, self.candidates())
+
+        # Rebuild penuh tidak mengubah signature yang sudah up to date
+        stdout = io.StringIO()
+        call_command('rebuild_minhash', stdout=stdout)
+        self.assertIn('0 signature berubah', stdout.getvalue())
+
+    def test_only_candidates_are_scored_unless_too_few(self):
+        with mock.patch.object(minhash, 'candidates', return_value=[self.close.pk]):
+            self.assertEqual([row[0] for row in similar_profiles(self.target, limit=1)], [self.close.pk])
+            # Kandidat kurang dari limit: Jaccard dihitung dari posting list penuh
+            self.assertEqual(
+                [row[0] for row in similar_profiles(self.target, limit=2)], [self.twin.pk, self.close.pk],
+            )
+
+
+class DirectoryCursorPaginationTest(TestCase):
+    """Keyset pagination direktori: seek per (field, id), cursor rusak -> 404"""
+
+    def setUp(self):
+        for i in range(5):
+            Mahasiswa.objects.create(
+                user=User.objects.create(username=f'user{i}'), nama=f'Mahasiswa {i}', nim=f'L2000{i}',
+                prodi='Informatika', email=f'm{i}@example.com', views_count=i % 2,
+            )
+        self.url = reverse('mahasiswa-list')
+
+    def cursor(self, payload):
+        return base64.urlsafe_b64encode(json.dumps(payload).encode()).decode()
+
+    def test_pages_cover_all_rows_once(self):
+        seen = []
+        response = self.client.get(self.url, {'pagination': 'cursor', 'ordering': '-views_count', 'page_size': 2})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            seen += [row['id'] for row in response.data['results']]
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        expected = Mahasiswa.objects.order_by('-views_count', '-id').values_list('id', flat=True)
+        self.assertEqual(seen, list(expected))
+
+    def test_cursor_value_of_wrong_type_is_not_found(self):
+        for ordering, value in (('-views_count', 'abc'), ('-views_count', {'dt': 5}), ('created_at', 'soon'),
+                                ('nama', None), ('views_count', [1])):
+            cursor = self.cursor({'v': value, 'id': 1, 'r': False})
+            response = self.client.get(self.url, {'ordering': ordering, 'cursor': cursor})
+            self.assertEqual(response.status_code, 404, (ordering, value))
+
+    def test_cursor_with_search_is_rejected(self):
+        response = self.client.get(self.url, {'pagination': 'cursor', 'search': 'Mahasiswa'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('cursor', response.data)
+
+
+@override_settings(VIEW_COUNT_FLUSH_INTERVAL=0)
+class ProfileSyncTest(TestCase):
+    """Simpan ulang editor profil: row yang tidak berubah (dan endorsement-nya) tetap, query sedikit"""
+
+    def setUp(self):
+        self.mahasiswa = self.create_mahasiswa('owner', 'L200001')
+        self.other = self.create_mahasiswa('other', 'L200002')
+
+    def create_mahasiswa(self, username, nim):
+        return Mahasiswa.objects.create(
+            user=User.objects.create(username=username),
+            nama=username, nim=nim, prodi='Informatika', email=f'{username}@example.com',
+        )
+
+    def test_unchanged_skill_keeps_endorsement(self):
+        sync_skills(self.mahasiswa, ['Python', 'Django', 'Go'])
+        python = Skill.objects.get(mahasiswa=self.mahasiswa, nama='Python')
+        SkillEndorsement.objects.create(skill=python, endorsed_by=self.other.user)
+        Skill.objects.filter(pk=python.pk).update(endorsement_count=1)
+
+        # Rename huruf kecil saja + satu skill baru + satu skill dihapus
+        self.assertEqual(sync_skills(self.mahasiswa, ['python', 'Django', 'Rust']), (1, 1, 1))
+
+        python.refresh_from_db()
+        self.assertEqual(python.nama, 'python')
+        self.assertEqual(python.endorsement_count, 1)
+        self.assertTrue(SkillEndorsement.objects.filter(skill=python, endorsed_by=self.other.user).exists())
+        self.assertEqual(
+            sorted(Skill.objects.filter(mahasiswa=self.mahasiswa).values_list('nama', flat=True)),
+            ['Django', 'Rust', 'python'],
+        )
+
+    def test_noop_save_is_a_handful_of_queries(self):
+        names = [f'Skill {i}' for i in range(20)]
+        entries = [{'posisi': f'Posisi {i}', 'organisasi': 'HIMA', 'tahun_mulai': '2023'} for i in range(3)]
+        sync_skills(self.mahasiswa, names)
+        sync_pengalaman(self.mahasiswa, entries)
+
+        # SAVEPOINT, SELECT skill, RELEASE SAVEPOINT
+        with self.assertNumQueries(3):
+            self.assertEqual(sync_skills(self.mahasiswa, names), (0, 0, 0))
+        with self.assertNumQueries(3):
+            self.assertEqual(sync_pengalaman(self.mahasiswa, entries), (0, 0, 0))
+        self.assertEqual(Pengalaman.objects.filter(mahasiswa=self.mahasiswa).count(), 3)
+
+    def test_side_effects_run_once_per_profile(self):
+        sync_skills(self.mahasiswa, ['Python', 'Django', 'Go', 'SQL'])
+        sync_skills(self.other, ['Python'])
+        ProfileRecommendation.objects.create(
+            mahasiswa=self.mahasiswa, recommended=self.other, score=1.0, rank=1, computed_at=timezone.now(),
+        )
+
+        with mock.patch.object(signals, 'skills_changed', wraps=signals.skills_changed) as skills_changed, \
+                mock.patch.object(minhash_queue, 'add') as minhash_add, \
+                mock.patch.object(leaderboard_queue, 'add') as leaderboard_add:
+            # Beberapa profil dalam satu blok: tetap sekali per profil, bukan per row Skill
+            with signals.batched_skill_changes():
+                sync_skills(self.mahasiswa, ['python', 'Rust'])
+                sync_skills(self.other, ['Python', 'Go'])
+
+        self.assertEqual(sorted(call.args[0] for call in skills_changed.call_args_list),
+                         sorted([self.mahasiswa.pk, self.other.pk]))
+        self.assertEqual(sorted(call.args[0] for call in minhash_add.call_args_list),
+                         sorted([self.mahasiswa.pk, self.other.pk]))
+        self.assertEqual(
+            sorted(call.kwargs['mahasiswa_id'] for call in leaderboard_add.call_args_list if 'mahasiswa_id' in call.kwargs),
+            sorted([self.mahasiswa.pk, self.other.pk]),
+        )
+        self.assertFalse(ProfileRecommendation.objects.filter(mahasiswa=self.mahasiswa).exists())
+        self.assertEqual(
+            Skill.objects.filter(mahasiswa=self.mahasiswa, tag__isnull=False).count(), 2
+        )
+
+    def test_profile_responses_prefetch_endorsements(self):
+        def queries(profile, method, url, **kwargs):
+            client = APIClient()
+            client.force_authenticate(profile.user)
+            with CaptureQueriesContext(connection) as context:
+                response = getattr(client, method)(url, **kwargs)
+            self.assertEqual(response.status_code, 200)
+            return len(context.captured_queries), response
+
+        for profile, count in ((self.mahasiswa, 1), (self.other, 6)):
+            sync_skills(profile, [f'Skill {i}' for i in range(count)])
+            for skill in Skill.objects.filter(mahasiswa=profile):
+                SkillEndorsement.objects.create(skill=skill, endorsed_by=User.objects.create(username=f'e{skill.pk}'))
+
+        # Jumlah query tidak bertambah per skill
+        completion = [queries(profile, 'get', reverse('profile-completion'))[0] for profile in (self.mahasiswa, self.other)]
+        self.assertEqual(completion[0], completion[1])
+        update = [
+            queries(profile, 'patch', reverse('mahasiswa-detail', args=[profile.pk]), data={'bio': 'Halo'}, format='json')
+            for profile in (self.mahasiswa, self.other)
+        ]
+        self.assertEqual(update[0][0], update[1][0])
+        self.assertEqual(len(update[1][1].data['skills']), 6)
+        self.assertEqual(len(update[1][1].data['skills'][0]['endorsements']), 1)
+
+    def test_failed_pengalaman_sync_rolls_back_profile_and_skills(self):
+        sync_skills(self.mahasiswa, ['Python'])
+        client = APIClient(raise_request_exception=True)
+        client.force_authenticate(self.mahasiswa.user)
+        data = {'nama': 'Nama Baru', 'skills': json.dumps(['Go']), 'pengalaman': json.dumps([{'posisi': 'Ketua'}])}
+
+        with mock.patch('mahasiswa.views.sync_pengalaman', side_effect=IntegrityError('pengalaman')):
+            with self.assertRaises(IntegrityError):
+                client.patch(reverse('mahasiswa-detail', args=[self.mahasiswa.pk]), data, format='multipart')
+
+        self.mahasiswa.refresh_from_db()
+        self.assertEqual(self.mahasiswa.nama, 'owner')
+        self.assertEqual(list(Skill.objects.filter(mahasiswa=self.mahasiswa).values_list('nama', flat=True)), ['Python'])
+
+
+@override_settings(VIEW_COUNT_FLUSH_INTERVAL=0)
+class ComputeRecommendationsTest(TestCase):
+    """Hasil batch numpy/scipy harus sama dengan cosine similarity yang dihitung manual"""
+
+    SKILLS = [
+        ['Python', 'Django', 'SQL'],
+        ['Python', 'Django'],
+        ['Python', 'Go', 'Rust', 'SQL'],
+        ['Go', 'Rust'],
+        ['Figma', 'UI Design'],
+        ['Figma', 'Python'],
+        ['SQL'],
+    ]
+
+    def setUp(self):
+        self.tags = {}
+        for i, names in enumerate(self.SKILLS):
+            profile = Mahasiswa.objects.create(
+                user=User.objects.create(username=f'user{i}'),
+                nama=f'Mahasiswa {i}', nim=f'L2000{i}', prodi='Informatika', email=f'm{i}@example.com',
+            )
+            sync_skills(profile, names)
+            self.tags[profile.pk] = {name.lower() for name in names}
+
+    def cosine(self, a, b):
+        return len(self.tags[a] & self.tags[b]) / math.sqrt(len(self.tags[a]) * len(self.tags[b]))
+
+    def test_matches_pure_python_cosine(self):
+        top_k = 3
+        call_command('compute_recommendations', top_k=top_k, stdout=io.StringIO())
+
+        for profile_id in self.tags:
+            stored = list(ProfileRecommendation.objects.filter(mahasiswa_id=profile_id)
+                          .order_by('rank').values_list('recommended_id', 'score'))
+            expected = sorted(
+                (self.cosine(profile_id, other) for other in self.tags if other != profile_id), reverse=True,
+            )
+            expected = [score for score in expected[:top_k] if score > 0]
+            self.assertEqual(len(stored), len(expected), profile_id)
+            for (recommended_id, score), expected_score in zip(stored, expected):
+                self.assertNotEqual(recommended_id, profile_id)
+                self.assertAlmostEqual(score, expected_score, places=5)
+                self.assertAlmostEqual(score, self.cosine(profile_id, recommended_id), places=5)
+
+    def test_batch_size_does_not_change_scores(self):
+        matrix, _ = load_skill_matrix()
+        whole = dict(top_k_similar(matrix, 3, batch_size=len(self.SKILLS)))
+        for batch_size in (1, 2, 3):
+            batched = dict(top_k_similar(matrix, 3, batch_size=batch_size))
+            self.assertEqual(batched.keys(), whole.keys())
+            for row, similar in batched.items():
+                self.assertEqual([round(score, 5) for _, score in similar], [round(score, 5) for _, score in whole[row]])
+
+
+@override_settings(VIEW_COUNT_FLUSH_INTERVAL=0)
+class BulkImportTest(TestCase):
+    """Import CSV / JSONL per chunk: row gagal dilaporkan tanpa menghentikan chunk"""
+
+    CSV_HEADER = 'username,email,password,nama,nim,prodi,skills,pengalaman\n'
+
+    def import_csv(self, body, **kwargs):
+        rows = bulk_import.read_rows(io.StringIO(self.CSV_HEADER + body), bulk_import.CSV)
+        return bulk_import.import_rows(rows, **kwargs)
+
+    def import_jsonl(self, rows, **kwargs):
+        lines = [row if isinstance(row, str) else json.dumps(row) for row in rows]
+        return bulk_import.import_rows(bulk_import.read_rows(io.StringIO('\n'.join(lines)), bulk_import.JSONL), **kwargs)
+
+    def failed_rows(self, result):
+        return {error['row']: error['errors'] for error in result.errors}
+
+    def test_csv_creates_user_profile_skills_and_pengalaman(self):
+        pengalaman = json.dumps([{'posisi': 'Ketua', 'organisasi': 'HIMA', 'tahun_mulai': '2023'}]).replace('"', '""')
+        result = self.import_csv(
+            f'ani,ani@example.com,rahasia123,Ani,L200001,Informatika,Python; Django ;python,"{pengalaman}"\n'
+            'budi,budi@example.com,,Budi,L200002,Informatika,"[""Machine  Learning"", ""Go""]",\n'
+        )
+        self.assertEqual((result.created, result.failed), (2, 0))
+
+        ani = Mahasiswa.objects.get(nim='L200001')
+        self.assertTrue(ani.user.check_password('rahasia123'))
+        self.assertFalse(Mahasiswa.objects.get(nim='L200002').user.has_usable_password())
+        self.assertTrue(Profile.objects.get(user=ani.user).is_mahasiswa)
+        # Duplikat nama ternormalisasi digabung; bulk_create mengisi nama_normalized & tag sendiri
+        self.assertEqual(
+            sorted(Skill.objects.filter(mahasiswa=ani).values_list('nama', 'nama_normalized')),
+            [('Django', 'django'), ('Python', 'python')],
+        )
+        self.assertFalse(Skill.objects.filter(tag__isnull=True).exists())
+        self.assertEqual(
+            sorted(Skill.objects.filter(mahasiswa__nim='L200002').values_list('nama', flat=True)),
+            ['Go', 'Machine Learning'],
+        )
+        self.assertEqual(list(ani.pengalaman.values_list('posisi', 'organisasi')), [('Ketua', 'HIMA')])
+
+    def test_jsonl_reports_bad_lines_and_keeps_loading(self):
+        result = self.import_jsonl([
+            {'username': 'ani', 'email': 'ani@example.com', 'nama': 'Ani', 'nim': 'L200001',
+             'prodi': 'Informatika', 'skills': ['Python', 'SQL']},
+            '{broken',
+            {'username': 'budi', 'email': 'not-an-email', 'nama': 'Budi', 'nim': 'L200002', 'prodi': 'Informatika'},
+            {'username': 'citra', 'email': 'citra@example.com', 'nama': 'Citra', 'nim': 'L200003',
+             'prodi': 'Informatika', 'pengalaman': [{'posisi': 'Anggota'}]},
+            {'username': 'dodi', 'email': 'dodi@example.com', 'nama': 'Dodi', 'nim': 'L200004', 'prodi': 'Informatika'},
+        ])
+        self.assertEqual((result.created, result.failed), (2, 3))
+        errors = self.failed_rows(result)
+        self.assertEqual(sorted(errors), [2, 3, 4])
+        self.assertIn('email', errors[3])
+        self.assertIn('pengalaman', errors[4])
+        self.assertEqual(sorted(Mahasiswa.objects.values_list('nim', flat=True)), ['L200001', 'L200004'])
+        self.assertEqual(Skill.objects.filter(mahasiswa__nim='L200001').count(), 2)
+
+    def test_duplicates_in_chunk_and_existing(self):
+        Mahasiswa.objects.create(
+            user=User.objects.create(username='lama', email='Ani@Example.com'),
+            nama='Lama', nim='L200009', prodi='Informatika', email='Ani@Example.com',
+        )
+        result = self.import_csv(
+            'ani,ani@example.com,,Ani,L200001,Informatika,,\n'      # email sudah ada (beda huruf)
+            'budi,budi@example.com,,Budi,L200009,Informatika,,\n'   # NIM sudah ada
+            'citra,citra@example.com,,Citra,L200003,Informatika,,\n'
+            'citra,citra2@example.com,,Citra,L200004,Informatika,,\n'  # username kembar di chunk
+            'dodi,dodi@example.com,,Dodi,L200003,Informatika,,\n',     # NIM kembar di chunk
+            chunk_size=10,
+        )
+        self.assertEqual((result.created, result.failed), (1, 4))
+        errors = self.failed_rows(result)
+        self.assertEqual(errors[1], {'email': ['Already exists.']})
+        self.assertEqual(errors[2], {'nim': ['Already exists.']})
+        self.assertEqual(errors[4], {'username': ['Already exists.']})
+        self.assertEqual(errors[5], {'nim': ['Already exists.']})
+        self.assertTrue(Mahasiswa.objects.filter(nim='L200003', user__username='citra').exists())
+
+    def test_conflicting_chunk_is_retried_per_row(self):
+        Mahasiswa.objects.create(
+            user=User.objects.create(username='lama'),
+            nama='Lama', nim='L200009', prodi='Informatika', email='lama@example.com',
+        )
+        on_error = mock.Mock()
+        # Seolah row lain masuk di antara cek duplikat dan insert (import / registrasi paralel)
+        with mock.patch.object(bulk_import, '_duplicates', return_value={}):
+            result = self.import_csv(
+                'ani,ani@example.com,,Ani,L200001,Informatika,Python,\n'
+                'budi,budi@example.com,,Budi,L200009,Informatika,Go,\n',
+                on_error=on_error,
+            )
+        self.assertEqual((result.created, result.failed), (1, 1))
+        self.assertEqual(on_error.call_args.args[0]['row'], 2)
+        self.assertTrue(Mahasiswa.objects.filter(nim='L200001').exists())
+        self.assertFalse(User.objects.filter(username='budi').exists())
+        self.assertEqual(list(Skill.objects.filter(mahasiswa__nim='L200001').values_list('nama', flat=True)), ['Python'])
+
+    def test_command_writes_status_file_and_deletes_input(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path, status_path = os.path.join(directory, 'angkatan.csv'), os.path.join(directory, 'job.json')
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(self.CSV_HEADER + 'ani,ani@example.com,,Ani,L200001,Informatika,Python,\nbudi,,,Budi,L200002,Informatika,,\n')
+            call_command('import_mahasiswa', path, status_file=status_path, delete_input=True, stdout=io.StringIO())
+
+            with open(status_path, encoding='utf-8') as f:
+                job = json.load(f)
+            self.assertEqual((job['status'], job['created'], job['failed']), ('done', 1, 1))
+            self.assertEqual(job['errors'][0]['row'], 2)
+            self.assertFalse(os.path.exists(path))
+
+
+class ProfileViewFlushTest(TransactionTestCase):
+    """Row yang ditolak database tidak boleh meracuni buffer (dicoba ulang selamanya)"""
+
+    def setUp(self):
+        self.profiles = [
+            Mahasiswa.objects.create(
+                user=User.objects.create(username=f'user{i}'),
+                nama=f'Mahasiswa {i}', nim=f'L2000{i}', prodi='Informatika', email=f'm{i}@example.com',
+            )
+            for i in range(2)
+        ]
+        self.queue = ProfileViewQueue(flush_interval=60, max_pending=10 ** 6)
+        self.request = RequestFactory().get('/', HTTP_X_FORWARDED_FOR='not-an-ip', REMOTE_ADDR='10.0.0.1')
+        self.request.user = AnonymousUser()
+
+    def test_view_for_deleted_profile_is_dropped(self):
+        deleted, other = self.profiles
+        self.queue.add(deleted.pk, self.request, (None, 'session-a'))
+        self.queue.add(other.pk, self.request, (None, 'session-b'))
+        deleted.delete()
+
+        self.assertEqual(self.queue.flush(), 1)
+        self.assertEqual(list(ProfileView.objects.values_list('mahasiswa_id', 'viewed_by_ip')), [(other.pk, '10.0.0.1')])
+        self.assertEqual(self.queue.flush(), 0)
+
+    def test_rejected_row_is_dropped_and_rest_is_written(self):
+        profile = self.profiles[0]
+        self.queue.add(profile.pk, self.request, (None, 'session-a'))
+        # Viewer user yang tidak ada: FK ditolak database
+        self.queue.add(profile.pk, self.request, (10 ** 6, None))
+
+        with self.assertLogs('mahasiswa.view_tracking', 'ERROR'):
+            self.assertEqual(self.queue.flush(), 1)
+        self.assertEqual(list(ProfileView.objects.values_list('session_key', flat=True)), ['session-a'])
+        self.assertEqual(self.queue.flush(), 0)
+
+    def test_rollup_for_deleted_profile_is_dropped(self):
+        deleted, other = self.profiles
+        rollups = ViewRollupBuffer(flush_interval=60, max_pending=10 ** 6)
+        rollups.add(deleted.pk, 2)
+        rollups.add(other.pk, 3)
+        deleted.delete()
+
+        self.assertEqual(rollups.flush(), 3)
+        self.assertEqual(list(ProfileViewHourly.objects.values_list('mahasiswa_id', 'views')), [(other.pk, 3)])
+        self.assertEqual(list(ProfileViewDaily.objects.values_list('mahasiswa_id', 'views')), [(other.pk, 3)])
+        self.assertEqual(rollups.flush(), 0)
+
+    def test_viewer_sketch_for_deleted_profile_is_dropped(self):
+        deleted, other = self.profiles
+        sketches = ViewerSketchBuffer(flush_interval=60, max_pending=10 ** 6)
+        today = timezone.now()
+        for day in range(3):
+            for viewer in range(40):
+                sketches.add(other.pk, (None, f'session-{viewer + day * 10}'), today - timedelta(days=day))
+        sketches.add(deleted.pk, (None, 'session-x'), today)
+        deleted.delete()
+
+        self.assertEqual(sketches.flush(), 120)
+        self.assertEqual(sketches.flush(), 0)
+        start, end = rollups.day_bucket(today - timedelta(days=2)), rollups.day_bucket(today)
+        # 60 viewer berbeda dalam 3 hari (sebagian viewer kembali di hari berikutnya)
+        estimate = rollups.unique_viewers(start, end, mahasiswa_id=other.pk)
+        self.assertAlmostEqual(estimate, 60, delta=3)
+        self.assertEqual(Mahasiswa.objects.get(pk=other.pk).unique_viewers, estimate)
+
+    def test_sketch_union_matches_pairwise_merge(self):
+        sketches = []
+        for day in range(5):
+            sketch = HyperLogLog()
+            for viewer in range(day * 100, day * 100 + 300):
+                sketch.add(viewer)
+            sketches.append(sketch)
+        merged = HyperLogLog()
+        for sketch in sketches:
+            merged.merge(sketch)
+        union = HyperLogLog.union([sketch.to_bytes() for sketch in sketches] + [b''])
+        self.assertEqual(union.registers, merged.registers)
+        self.assertAlmostEqual(union.count(), 700, delta=35)
+
+    def test_minhash_flush_on_exit_logs_failure(self):
+        with mock.patch.object(minhash_queue, 'flush', side_effect=OperationalError('database is down')), \
+                self.assertLogs('mahasiswa.minhash', 'ERROR'):
+            minhash._flush_on_exit()
+
+    def test_invalid_forwarded_ip_is_not_stored(self):
+        self.assertEqual(get_client_ip(self.request), '10.0.0.1')
+        request = RequestFactory().get('/', HTTP_X_FORWARDED_FOR='junk', REMOTE_ADDR='')
+        self.assertIsNone(get_client_ip(request))
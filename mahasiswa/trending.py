@@ -0,0 +1,56 @@
+"""
+Skor trending profil dengan exponential time decay (forward decay).
+
+Setiap view pada waktu t bernilai e^(lambda * (t - EPOCH)), lambda = ln 2 / half-life.
+Kolom Mahasiswa.trending_score menyimpan log dari jumlah nilai tersebut, sehingga:
+
+- update incremental cukup logaddexp(score, ln(n) + lambda * (t - EPOCH)) per flush
+  view counter, tanpa membaca ulang ProfileView;
+- semua profil memakai referensi waktu yang sama, jadi ORDER BY trending_score DESC
+  langsung memberi urutan trending saat ini (index scan);
+- nilai "views ter-decay" saat ini = e^(score - lambda * (now - EPOCH)).
+
+Skor disimpan dalam log-space supaya tidak overflow walau EPOCH sudah lama lewat.
+"""
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.conf import settings
+from django.db.models import Case, F, FloatField, Value, When
+from django.db.models.functions import Abs, Exp, Greatest, Ln
+from django.utils import timezone
+
+EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+DEFAULT_HALF_LIFE_HOURS = 24
+
+
+def decay_rate():
+    """lambda per jam"""
+    return math.log(2) / getattr(settings, 'TRENDING_HALF_LIFE_HOURS', DEFAULT_HALF_LIFE_HOURS)
+
+
+def time_weight(timestamp):
+    """lambda * (t - EPOCH), log bobot satu view pada waktu t"""
+    return decay_rate() * (timestamp - EPOCH).total_seconds() / 3600
+
+
+def log_increment(count, timestamp=None):
+    return math.log(count) + time_weight(timestamp or timezone.now())
+
+
+def score_update(count, timestamp=None):
+    """Expression UPDATE: trending_score = logaddexp(trending_score, ln(count) + lambda * (t - EPOCH))"""
+    increment = Value(log_increment(count, timestamp), output_field=FloatField())
+    score = F('trending_score')
+    return Case(
+        When(trending_score__isnull=True, then=increment),
+        default=Greatest(score, increment) + Ln(Value(1.0) + Exp(-Abs(score - increment))),
+        output_field=FloatField(),
+    )
+
+
+def current_value(score, now=None):
+    """Jumlah view ter-decay pada waktu `now` untuk skor yang tersimpan"""
+    if score is None:
+        return 0.0
+    return math.exp(score - time_weight(now or timezone.now()))
@@ -0,0 +1,444 @@
+"""
+Buffered profile view tracking.
+
+Setiap view tidak langsung ditulis per request, tetapi dikumpulkan di memory
+proses lalu di-flush dalam batch:
+
+- ViewCounter: increment views_count (dan skor trending) per profil, ditulis dengan
+  `UPDATE ... SET views_count = views_count + n` sehingga tidak ada increment yang
+  hilang karena read-modify-write dan profil populer tidak jadi hot row.
+- ViewRollupBuffer: view per (profil, jam), di-upsert ke tabel rollup per jam &
+  per hari (lihat mahasiswa.rollups).
+- ViewerSketchBuffer: hash viewer per (profil, hari), di-merge ke sketch HyperLogLog
+  harian & lifetime untuk estimasi viewer unik (Mahasiswa.unique_viewers).
+- ProfileViewQueue: row ProfileView (unik per user / per session), di-dedupe di
+  memory dan ditulis dengan bulk_create(ignore_conflicts=True). Viewer yang baru
+  saja tercatat dilewati lewat LRU "seen" tanpa menyentuh database.
+
+Buffer di-flush paling lambat VIEW_COUNT_FLUSH_INTERVAL detik setelah item pertama
+masuk (timer thread), atau segera jika sudah VIEW_COUNT_MAX_PENDING item.
+VIEW_COUNT_FLUSH_INTERVAL = 0 menulis langsung (tanpa buffer), berguna untuk dev/test.
+Sisa buffer di-flush saat proses berhenti (atexit). Setiap flush ditulis dalam satu
+transaksi. Jika database menolak batch (IntegrityError / DataError, mis. profil sudah
+dihapus), batch ditulis ulang per item dan item yang tetap ditolak dibuang (di-log),
+sehingga satu row buruk tidak meracuni buffer. Error lain (koneksi, lock) mengembalikan
+batch ke buffer untuk dicoba lagi, paling banyak MAX_FLUSH_ATTEMPTS kali berturut-turut.
+"""
+import atexit
+import hashlib
+import ipaddress
+import logging
+import threading
+from collections import Counter, OrderedDict, defaultdict
+
+from django.conf import settings
+from django.db import DataError, IntegrityError, connections, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from . import cache, trending
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_INTERVAL = 5
+DEFAULT_MAX_PENDING = 1000
+DEFAULT_SEEN_SIZE = 10000
+MAX_FLUSH_ATTEMPTS = 3
+
+SESSION_HEADER = 'X-Session-Key'
+SESSION_KEY_MAX_LENGTH = 255
+
+
+def _valid_ip(value):
+    try:
+        return str(ipaddress.ip_address((value or '').strip()))
+    except ValueError:
+        return None
+
+
+def get_client_ip(request):
+    """IP client (X-Forwarded-For pertama, fallback REMOTE_ADDR); None jika bukan alamat IP valid"""
+    x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
+    if x_forwarded_for:
+        ip = _valid_ip(x_forwarded_for.split(',')[0])
+        if ip:
+            return ip
+    return _valid_ip(request.META.get('REMOTE_ADDR'))
+
+
+def existing_profiles(mahasiswa_ids):
+    """Id profil yang masih ada (view untuk profil yang sudah dihapus dibuang saat flush)"""
+    from .models import Mahasiswa
+
+    return set(Mahasiswa.objects.filter(pk__in=set(mahasiswa_ids)).values_list('pk', flat=True))
+
+
+def get_session_key(request):
+    """Session key dari header X-Session-Key frontend, fallback hash IP + user agent"""
+    session_key = request.headers.get(SESSION_HEADER, '').strip()
+    if session_key:
+        return session_key[:SESSION_KEY_MAX_LENGTH]
+    fingerprint = f"{get_client_ip(request)}|{request.META.get('HTTP_USER_AGENT', '')}"
+    return 'anon:' + hashlib.sha1(fingerprint.encode()).hexdigest()
+
+
+def get_viewer(request):
+    """(user_id, session_key) viewer: user untuk request terautentikasi, selain itu session key"""
+    if request.user.is_authenticated:
+        return request.user.pk, None
+    return None, get_session_key(request)
+
+
+def viewer_key(viewer):
+    user_id, session_key = viewer
+    return f'user:{user_id}' if user_id is not None else session_key
+
+
+class BufferedWriter:
+    """Basis buffer in-memory yang di-flush oleh timer, saat penuh, atau saat proses berhenti"""
+
+    def __init__(self, flush_interval=None, max_pending=None):
+        self._flush_interval = flush_interval
+        self._max_pending = max_pending
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer = None
+        self._pending_total = 0
+        self._failed_flushes = 0
+
+    @property
+    def flush_interval(self):
+        if self._flush_interval is not None:
+            return self._flush_interval
+        return getattr(settings, 'VIEW_COUNT_FLUSH_INTERVAL', DEFAULT_FLUSH_INTERVAL)
+
+    @property
+    def max_pending(self):
+        if self._max_pending is not None:
+            return self._max_pending
+        return getattr(settings, 'VIEW_COUNT_MAX_PENDING', DEFAULT_MAX_PENDING)
+
+    def _buffered(self, added):
+        """Dipanggil dengan self._lock dipegang setelah `added` item masuk buffer; True jika harus flush sekarang"""
+        self._pending_total += added
+        if self.flush_interval <= 0 or self._pending_total >= self.max_pending:
+            return True
+        self._schedule()
+        return False
+
+    def _schedule(self):
+        # Dipanggil dengan self._lock dipegang
+        if self._timer is None:
+            self._timer = threading.Timer(max(self.flush_interval, 1), self._flush_from_timer)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _take(self):
+        with self._lock:
+            batch = self._swap()
+            self._pending_total = 0
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        return batch
+
+    def _restore(self, batch):
+        with self._lock:
+            self._pending_total += self._merge(batch)
+            self._schedule()
+
+    def flush(self):
+        """Tulis semua item yang tertunda; return jumlah item yang di-flush"""
+        with self._flush_lock:
+            batch = self._take()
+            if not batch:
+                return 0
+            # Bagian batch yang belum tertulis (dikembalikan ke buffer jika flush gagal)
+            remaining = [batch]
+            try:
+                try:
+                    with transaction.atomic():
+                        total = self._write(batch)
+                    remaining = []
+                except (IntegrityError, DataError):
+                    # Ada item yang ditolak database: tulis per item, item yang tetap ditolak dibuang
+                    remaining = self._split(batch)
+                    total = 0
+                    while remaining:
+                        try:
+                            # FK dicek saat commit (deferred): hitung setelah transaksi selesai
+                            with transaction.atomic():
+                                written = self._write(remaining[-1])
+                            total += written
+                        except (IntegrityError, DataError):
+                            logger.exception('%s: item %s ditolak database dan dibuang',
+                                             type(self).__name__, self._describe(remaining[-1]))
+                        remaining.pop()
+            except Exception as e:
+                self._failed_flushes += 1
+                if self._failed_flushes >= MAX_FLUSH_ATTEMPTS:
+                    self._failed_flushes = 0
+                    logger.error('%s flush gagal %d kali berturut-turut, batch dibuang: %s',
+                                 type(self).__name__, MAX_FLUSH_ATTEMPTS, e)
+                else:
+                    for part in remaining:
+                        self._restore(part)
+                    logger.warning('%s flush gagal, batch dikembalikan ke buffer: %s', type(self).__name__, e)
+                raise
+            self._failed_flushes = 0
+        return total
+
+    def _flush_full(self):
+        """Flush karena buffer penuh (dari request): error dicatat, tidak dilempar ke pemanggil"""
+        try:
+            self.flush()
+        except Exception:
+            logger.exception('%s: flush karena buffer penuh gagal', type(self).__name__)
+
+    def _flush_from_timer(self):
+        with self._lock:
+            self._timer = None
+        try:
+            self.flush()
+        except Exception:
+            logger.exception('%s: flush dari timer gagal', type(self).__name__)
+        finally:
+            # Timer thread punya koneksi DB sendiri
+            connections.close_all()
+
+    def _swap(self):
+        raise NotImplementedError
+
+    def _merge(self, batch):
+        raise NotImplementedError
+
+    def _write(self, batch):
+        """Tulis batch (dipanggil di dalam transaksi, tanpa mengubah batch); return jumlah item"""
+        raise NotImplementedError
+
+    def _split(self, batch):
+        """Batch dipecah per item (dict key -> value) untuk ditulis satu per satu"""
+        parts = []
+        for key, value in batch.items():
+            part = type(batch)()
+            part[key] = value
+            parts.append(part)
+        return parts
+
+    def _describe(self, part):
+        return list(part)
+
+
+class ViewCounter(BufferedWriter):
+    """Increment views_count per profil"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending = Counter()
+
+    def add(self, mahasiswa_id, count=1):
+        """Catat `count` view untuk profil"""
+        with self._lock:
+            self._pending[mahasiswa_id] += count
+            flush_now = self._buffered(count)
+        if flush_now:
+            self._flush_full()
+
+    def pending(self, mahasiswa_id):
+        """Jumlah view profil yang belum di-flush di proses ini"""
+        with self._lock:
+            return self._pending.get(mahasiswa_id, 0)
+
+    def _swap(self):
+        batch, self._pending = self._pending, Counter()
+        return batch
+
+    def _merge(self, batch):
+        self._pending.update(batch)
+        return sum(batch.values())
+
+    def _write(self, batch):
+        from .models import Mahasiswa
+
+        total = sum(batch.values())
+        now = timezone.now()
+        # Satu UPDATE per besar increment (umumnya hanya sedikit nilai berbeda)
+        by_count = defaultdict(list)
+        for mahasiswa_id, count in batch.items():
+            by_count[count].append(mahasiswa_id)
+        for count, ids in by_count.items():
+            Mahasiswa.objects.filter(pk__in=ids).update(
+                views_count=F('views_count') + count,
+                trending_score=trending.score_update(count, now),
+            )
+
+        # views_count tampil di listing homepage
+        cache.invalidate(*cache.HOMEPAGE_NAMESPACES)
+        logger.debug('Flushed %d view(s)', total)
+        return total
+
+
+class ViewRollupBuffer(BufferedWriter):
+    """View per (profil, jam) untuk tabel rollup ProfileViewHourly / ProfileViewDaily"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending = Counter()
+
+    def add(self, mahasiswa_id, count=1, timestamp=None):
+        from .rollups import hour_bucket
+
+        key = (mahasiswa_id, hour_bucket(timestamp or timezone.now()))
+        with self._lock:
+            self._pending[key] += count
+            flush_now = self._buffered(count)
+        if flush_now:
+            self._flush_full()
+
+    def _swap(self):
+        batch, self._pending = self._pending, Counter()
+        return batch
+
+    def _merge(self, batch):
+        self._pending.update(batch)
+        return sum(batch.values())
+
+    def _write(self, batch):
+        from .rollups import record
+
+        # Profil yang sudah dihapus dilewati; pelanggaran constraint lain dibuang oleh flush()
+        existing = existing_profiles(mahasiswa_id for mahasiswa_id, _ in batch)
+        counts = {key: views for key, views in batch.items() if key[0] in existing}
+        record(counts)
+        return sum(counts.values())
+
+
+class ViewerSketchBuffer(BufferedWriter):
+    """Hash viewer per (profil, hari) untuk sketch HyperLogLog viewer unik"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending = defaultdict(set)
+
+    def add(self, mahasiswa_id, viewer, timestamp=None):
+        from .hll import hash_value
+        from .rollups import day_bucket
+
+        hashed = hash_value(viewer_key(viewer))
+        key = (mahasiswa_id, day_bucket(timestamp or timezone.now()))
+        with self._lock:
+            hashes = self._pending[key]
+            if hashed in hashes:
+                return
+            hashes.add(hashed)
+            flush_now = self._buffered(1)
+        if flush_now:
+            self._flush_full()
+
+    def _swap(self):
+        batch, self._pending = self._pending, defaultdict(set)
+        return batch
+
+    def _merge(self, batch):
+        added = 0
+        for key, hashes in batch.items():
+            before = len(self._pending[key])
+            self._pending[key] |= hashes
+            added += len(self._pending[key]) - before
+        return added
+
+    def _write(self, batch):
+        from .rollups import record_viewers
+
+        existing = existing_profiles(mahasiswa_id for mahasiswa_id, _ in batch)
+        batch = {key: hashes for key, hashes in batch.items() if key[0] in existing}
+        record_viewers(batch)
+        return sum(len(hashes) for hashes in batch.values())
+
+
+class ProfileViewQueue(BufferedWriter):
+    """Row ProfileView unik per (profil, user) / (profil, session)"""
+
+    def __init__(self, *args, seen_size=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending = {}
+        self._seen = OrderedDict()
+        self._seen_size = seen_size
+
+    @property
+    def seen_size(self):
+        if self._seen_size is not None:
+            return self._seen_size
+        return getattr(settings, 'PROFILE_VIEW_SEEN_SIZE', DEFAULT_SEEN_SIZE)
+
+    def add(self, mahasiswa_id, request, viewer=None):
+        """Antrikan view dari request; return False jika viewer ini sudah tercatat (tidak ada kerja)"""
+        from .models import ProfileView
+
+        key = (mahasiswa_id, *(viewer or get_viewer(request)))
+
+        with self._lock:
+            if key in self._seen:
+                self._seen.move_to_end(key)
+                return False
+            self._seen[key] = True
+            if len(self._seen) > self.seen_size:
+                self._seen.popitem(last=False)
+
+            self._pending[key] = ProfileView(
+                mahasiswa_id=mahasiswa_id,
+                viewed_by_user_id=key[1],
+                session_key=key[2],
+                viewed_by_ip=get_client_ip(request),
+                user_agent=request.META.get('HTTP_USER_AGENT', ''),
+                referrer=request.META.get('HTTP_REFERER', '')[:200] or None,
+            )
+            flush_now = self._buffered(1)
+        if flush_now:
+            self._flush_full()
+        return True
+
+    def _swap(self):
+        batch, self._pending = self._pending, {}
+        return batch
+
+    def _merge(self, batch):
+        for key, profile_view in batch.items():
+            self._pending.setdefault(key, profile_view)
+        return len(batch)
+
+    def _write(self, batch):
+        from .models import ProfileView
+
+        existing = existing_profiles(profile_view.mahasiswa_id for profile_view in batch.values())
+        rows = [profile_view for profile_view in batch.values() if profile_view.mahasiswa_id in existing]
+        # Row yang melanggar unique constraint (viewer sudah tercatat sebelumnya) dilewati database
+        ProfileView.objects.bulk_create(rows, batch_size=500, ignore_conflicts=True)
+        logger.debug('Flushed %d profile view row(s)', len(rows))
+        return len(rows)
+
+
+view_counter = ViewCounter()
+view_rollups = ViewRollupBuffer()
+viewer_sketches = ViewerSketchBuffer()
+profile_views = ProfileViewQueue()
+
+
+def record_view(request, mahasiswa_id):
+    """Catat satu view profil: increment views_count & rollup, sketch viewer unik, row ProfileView untuk viewer baru"""
+    viewer = get_viewer(request)
+    view_counter.add(mahasiswa_id)
+    view_rollups.add(mahasiswa_id)
+    viewer_sketches.add(mahasiswa_id, viewer)
+    return profile_views.add(mahasiswa_id, request, viewer)
+
+
+def _flush_on_exit():
+    for writer in (view_counter, view_rollups, viewer_sketches, profile_views):
+        try:
+            writer.flush()
+        except Exception:
+            logger.exception('%s: flush saat exit gagal', type(writer).__name__)
+
+
+atexit.register(_flush_on_exit)
@@ -1,30 +1,64 @@
+import json
+import logging
+
+from django.db import transaction
 from rest_framework import generics, filters, status, serializers
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, IsAdminUser, AllowAny
+from rest_framework.settings import api_settings
+from django.shortcuts import get_object_or_404
 from django_filters.rest_framework import DjangoFilterBackend
+from pusat.pagination import KeysetCursorPagination
 from .models import Mahasiswa
-from .serializers import MahasiswaSerializer, MahasiswaListSerializer
+from .serializers import MahasiswaSerializer, MahasiswaListSerializer, MahasiswaTrendingSerializer
+from .search import MahasiswaSearchFilter
+from .cache import CachedListMixin, LATEST, MOST_VIEWED, TRENDING
+from .conditional import get_profile_validators, conditional_response, set_validator_headers
+from .facets import get_facets
+from .fieldsets import Fieldset, apply_fieldset, prefetch_fieldset
+from .view_tracking import view_counter, record_view
+from . import rollups
+from .profile_sync import parse_list, sync_pengalaman, sync_skills
+from .recommendations import precomputed_recommendations, similar_profiles, RECOMMENDATION_LIMIT, COSINE, JACCARD
+from .suggest import suggest, DEFAULT_LIMIT as SUGGEST_DEFAULT_LIMIT, MAX_LIMIT as SUGGEST_MAX_LIMIT
 
-class MahasiswaListCreateView(generics.ListCreateAPIView):
-    """
-    GET: List semua mahasiswa (public, dengan filter & search)
-    POST: Create mahasiswa profile (authenticated)
-    """
-    queryset = Mahasiswa.objects.filter(is_active=True)
-    permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+logger = logging.getLogger(__name__)
+
+class MahasiswaDirectoryMixin:
+    """Queryset, filter, search, ordering & pagination direktori mahasiswa (dipakai list & facets)"""
+    queryset = Mahasiswa.objects.filter(is_active=True).with_counts()
+    # Search setelah ordering supaya hasil search bisa diurutkan berdasarkan relevansi
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter, MahasiswaSearchFilter]
     
     # Filter by fields
     filterset_fields = ['prodi', 'fakultas', 'angkatan', 'is_active']
     
-    # Search by fields
+    # Search by fields (full-text index, fallback ke SearchFilter bawaan DRF)
     search_fields = ['nama', 'nim', 'prodi', 'bio', 'skills__nama']
     
     # Order by fields
     ordering_fields = ['nama', 'nim', 'created_at', 'views_count']
     ordering = ['-created_at']  # Default ordering: newest first
-    
+
+    @property
+    def paginator(self):
+        """Keyset pagination jika diminta (?pagination=cursor), selain itu PageNumberPagination"""
+        if not hasattr(self, '_paginator'):
+            if KeysetCursorPagination.is_requested(self.request):
+                self._paginator = KeysetCursorPagination()
+            else:
+                self._paginator = self.pagination_class() if self.pagination_class else None
+        return self._paginator
+
+
+class MahasiswaListCreateView(MahasiswaDirectoryMixin, generics.ListCreateAPIView):
+    """
+    GET: List semua mahasiswa (public, dengan filter & search)
+    POST: Create mahasiswa profile (authenticated)
+    """
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
     def get_serializer_class(self):
         """Use lighter serializer for list view"""
         if self.request.method == 'GET':
@@ -58,6 +92,7 @@ class MahasiswaListCreateView(generics.ListCreateAPIView):
             )
             serializer.is_valid(raise_exception=True)
             self.perform_update(serializer)
+            prefetch_fieldset([serializer.instance], serializer.fieldset)
             
             print(f"[UPDATE] Profile updated successfully")
             return Response(serializer.data)
@@ -67,6 +102,7 @@ class MahasiswaListCreateView(generics.ListCreateAPIView):
             # Call default create behavior
             return super().create(request, *args, **kwargs)
     
+    @transaction.atomic
     def perform_update(self, serializer):
         """Called when updating existing profile"""
         mahasiswa = serializer.save()
@@ -74,42 +110,23 @@ class MahasiswaListCreateView(generics.ListCreateAPIView):
         # Handle skills if provided
         skills_data = self.request.data.get('skills')
         if skills_data:
-            import json
             try:
-                skills_list = json.loads(skills_data) if isinstance(skills_data, str) else skills_data
-                from skills.models import Skill
-                # Clear existing and create new
-                mahasiswa.skills.all().delete()
-                for skill_name in skills_list:
-                    if skill_name.strip():
-                        Skill.objects.create(mahasiswa=mahasiswa, nama=skill_name.strip())
-                print(f"[UPDATE] Created {len(skills_list)} skills")
+                # Diff dengan skill yang ada: endorsement skill yang tidak berubah tetap utuh
+                created, updated, deleted = sync_skills(mahasiswa, parse_list(skills_data))
+                logger.debug('Skills %s: %d dibuat, %d diubah, %d dihapus', mahasiswa.pk, created, updated, deleted)
             except (json.JSONDecodeError, TypeError) as e:
-                print(f"[UPDATE] Error parsing skills: {e}")
+                logger.warning('Skills profil %s tidak valid: %s', mahasiswa.pk, e)
         
         # Handle pengalaman if provided
         pengalaman_data = self.request.data.get('pengalaman')
         if pengalaman_data:
-            import json
             try:
-                pengalaman_list = json.loads(pengalaman_data) if isinstance(pengalaman_data, str) else pengalaman_data
-                from .models import Pengalaman
-                # Clear existing and create new
-                mahasiswa.pengalaman.all().delete()
-                for exp in pengalaman_list:
-                    if exp.get('posisi') and exp.get('organisasi'):
-                        Pengalaman.objects.create(
-                            mahasiswa=mahasiswa,
-                            posisi=exp.get('posisi', ''),
-                            organisasi=exp.get('organisasi', ''),
-                            tahun_mulai=exp.get('tahun_mulai', ''),
-                            tahun_selesai=exp.get('tahun_selesai', ''),
-                            deskripsi=exp.get('deskripsi', '')
-                        )
-                print(f"[UPDATE] Created {len(pengalaman_list)} pengalaman entries")
+                created, updated, deleted = sync_pengalaman(mahasiswa, parse_list(pengalaman_data))
+                logger.debug('Pengalaman %s: %d dibuat, %d diubah, %d dihapus', mahasiswa.pk, created, updated, deleted)
             except (json.JSONDecodeError, TypeError) as e:
-                print(f"[UPDATE] Error parsing pengalaman: {e}")
+                logger.warning('Pengalaman profil %s tidak valid: %s', mahasiswa.pk, e)
 
+    @transaction.atomic
     def perform_create(self, serializer):
         # Check if user already has a profile
         try:
@@ -154,40 +171,44 @@ class MahasiswaListCreateView(generics.ListCreateAPIView):
         # Handle skills if provided
         skills_data = self.request.data.get('skills')
         if skills_data:
-            import json
             try:
-                skills_list = json.loads(skills_data) if isinstance(skills_data, str) else skills_data
-                from skills.models import Skill
-                # Clear existing and create new
-                mahasiswa.skills.all().delete()
-                for skill_name in skills_list:
-                    if skill_name.strip():
-                        Skill.objects.create(mahasiswa=mahasiswa, nama=skill_name.strip())
-            except (json.JSONDecodeError, TypeError):
-                pass
+                # Diff dengan skill yang ada: endorsement skill yang tidak berubah tetap utuh
+                created, updated, deleted = sync_skills(mahasiswa, parse_list(skills_data))
+                logger.debug('Skills %s: %d dibuat, %d diubah, %d dihapus', mahasiswa.pk, created, updated, deleted)
+            except (json.JSONDecodeError, TypeError) as e:
+                logger.warning('Skills profil %s tidak valid: %s', mahasiswa.pk, e)
         
         # Handle pengalaman if provided
         pengalaman_data = self.request.data.get('pengalaman')
         if pengalaman_data:
-            import json
             try:
-                pengalaman_list = json.loads(pengalaman_data) if isinstance(pengalaman_data, str) else pengalaman_data
-                from .models import Pengalaman
-                # Clear existing and create new
-                mahasiswa.pengalaman.all().delete()
-                for exp in pengalaman_list:
-                    if exp.get('posisi') and exp.get('organisasi'):
-                        Pengalaman.objects.create(
-                            mahasiswa=mahasiswa,
-                            posisi=exp.get('posisi', ''),
-                            organisasi=exp.get('organisasi', ''),
-                            tahun_mulai=exp.get('tahun_mulai', ''),
-                            tahun_selesai=exp.get('tahun_selesai', ''),
-                            deskripsi=exp.get('deskripsi', '')
-                        )
-                print(f"[CREATE] Created {len(pengalaman_list)} pengalaman entries")
+                created, updated, deleted = sync_pengalaman(mahasiswa, parse_list(pengalaman_data))
+                logger.debug('Pengalaman %s: %d dibuat, %d diubah, %d dihapus', mahasiswa.pk, created, updated, deleted)
             except (json.JSONDecodeError, TypeError) as e:
-                print(f"[CREATE] Error parsing pengalaman: {e}")
+                logger.warning('Pengalaman profil %s tidak valid: %s', mahasiswa.pk, e)
+
+        # Response create memakai skills + endorsement terbaru: prefetch, bukan query per skill
+        prefetch_fieldset([mahasiswa], Fieldset())
+
+
+class MahasiswaFacetView(MahasiswaDirectoryMixin, generics.ListAPIView):
+    """
+    GET: Halaman hasil direktori (filter & search sama dengan list) + facet counts
+    untuk prodi, fakultas, angkatan dan top skills
+    """
+    serializer_class = MahasiswaListSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    def get_filter_params(self):
+        """Parameter yang mempengaruhi himpunan hasil (bukan page/ordering) - dipakai sebagai cache key"""
+        filter_keys = set(self.filterset_fields) | {api_settings.SEARCH_PARAM}
+        return [(key, values) for key, values in self.request.query_params.lists() if key in filter_keys]
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        queryset = self.filter_queryset(self.get_queryset())
+        response.data['facets'] = get_facets(queryset, self.get_filter_params())
+        return response
 
 
 class MahasiswaDetailView(generics.RetrieveUpdateDestroyAPIView):
@@ -200,12 +221,41 @@ class MahasiswaDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = MahasiswaSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
     
+    def get_queryset(self):
+        """GET: hanya pk (cukup untuk validator); field & prefetch dimuat di retrieve()"""
+        queryset = super().get_queryset()
+        if self.request.method in ('GET', 'HEAD'):
+            queryset = queryset.only('pk')
+        return queryset
+
     def retrieve(self, request, *args, **kwargs):
-        """Get profile detail without incrementing views (use dedicated track_profile_view endpoint)"""
+        """
+        Get profile detail without incrementing views (use dedicated track_profile_view endpoint).
+        Mendukung conditional GET: If-None-Match / If-Modified-Since yang cocok dijawab 304
+        dengan dua query (lookup pk + validator), tanpa prefetch maupun nested serializer.
+        """
         instance = self.get_object()
+        etag, last_modified = get_profile_validators(instance, request)
+        not_modified = conditional_response(request, etag, last_modified)
+        if not_modified is not None:
+            return set_validator_headers(not_modified, etag, last_modified)
+
+        # only() + prefetch sesuai ?fields= / ?expand=
+        queryset = apply_fieldset(Mahasiswa.objects.all(), Fieldset.from_request(request))
+        instance = get_object_or_404(queryset, pk=instance.pk)
         serializer = self.get_serializer(instance)
+        return set_validator_headers(Response(serializer.data), etag, last_modified)
+
+    def update(self, request, *args, **kwargs):
+        """Seperti UpdateModelMixin.update, tapi relasi response di-prefetch setelah skills/pengalaman disinkronkan"""
+        partial = kwargs.pop('partial', False)
+        serializer = self.get_serializer(self.get_object(), data=request.data, partial=partial)
+        serializer.is_valid(raise_exception=True)
+        self.perform_update(serializer)
+        prefetch_fieldset([serializer.instance], serializer.fieldset)
         return Response(serializer.data)
 
+    @transaction.atomic
     def perform_update(self, serializer):
         # Only allow user to update their own profile
         if serializer.instance.user != self.request.user:
@@ -217,27 +267,21 @@ class MahasiswaDetailView(generics.RetrieveUpdateDestroyAPIView):
         # Handle skills update if provided
         skills_data = self.request.data.get('skills')
         if skills_data:
-            import json
             try:
-                skills_list = json.loads(skills_data) if isinstance(skills_data, str) else skills_data
-                from skills.models import Skill
-                # Clear existing skills and create new ones
-                mahasiswa.skills.all().delete()
-                for skill_name in skills_list:
-                    if skill_name.strip():
-                        Skill.objects.create(mahasiswa=mahasiswa, nama=skill_name.strip())
-            except (json.JSONDecodeError, TypeError):
-                pass
+                # Diff dengan skill yang ada: endorsement skill yang tidak berubah tetap utuh
+                created, updated, deleted = sync_skills(mahasiswa, parse_list(skills_data))
+                logger.debug('Skills %s: %d dibuat, %d diubah, %d dihapus', mahasiswa.pk, created, updated, deleted)
+            except (json.JSONDecodeError, TypeError) as e:
+                logger.warning('Skills profil %s tidak valid: %s', mahasiswa.pk, e)
         
         # Handle pengalaman update if provided
         pengalaman_data = self.request.data.get('pengalaman')
         if pengalaman_data:
-            import json
             try:
-                pengalaman_list = json.loads(pengalaman_data) if isinstance(pengalaman_data, str) else pengalaman_data
-                # Handle pengalaman updates here if model exists
-            except (json.JSONDecodeError, TypeError):
-                pass
+                created, updated, deleted = sync_pengalaman(mahasiswa, parse_list(pengalaman_data))
+                logger.debug('Pengalaman %s: %d dibuat, %d diubah, %d dihapus', mahasiswa.pk, created, updated, deleted)
+            except (json.JSONDecodeError, TypeError) as e:
+                logger.warning('Pengalaman profil %s tidak valid: %s', mahasiswa.pk, e)
     
     def perform_destroy(self, instance):
         # Only allow user to delete their own profile
@@ -247,20 +291,47 @@ class MahasiswaDetailView(generics.RetrieveUpdateDestroyAPIView):
         instance.delete()
 
 
-class MahasiswaLatestView(generics.ListAPIView):
-    """Get 5 latest active mahasiswa profiles for homepage"""
-    queryset = Mahasiswa.objects.filter(is_active=True).order_by('-created_at')[:5]
+class MahasiswaLatestView(CachedListMixin, generics.ListAPIView):
+    """Get 5 latest active mahasiswa profiles for homepage (cached)"""
+    cache_namespace = LATEST
+    queryset = Mahasiswa.objects.filter(is_active=True).with_counts().order_by('-created_at')[:5]
     serializer_class = MahasiswaListSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
 
-class MahasiswaMostViewedView(generics.ListAPIView):
-    """Get most viewed mahasiswa profiles"""
-    queryset = Mahasiswa.objects.filter(is_active=True).order_by('-views_count')[:10]
+class MahasiswaMostViewedView(CachedListMixin, generics.ListAPIView):
+    """Get most viewed mahasiswa profiles (cached)"""
+    cache_namespace = MOST_VIEWED
+    queryset = Mahasiswa.objects.filter(is_active=True).with_counts().order_by('-views_count')[:10]
     serializer_class = MahasiswaListSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
 
+class MahasiswaTrendingView(CachedListMixin, generics.ListAPIView):
+    """Get trending mahasiswa profiles: views dengan exponential time decay (cached)"""
+    cache_namespace = TRENDING
+    queryset = Mahasiswa.objects.filter(
+        is_active=True, trending_score__isnull=False
+    ).with_counts().order_by('-trending_score', '-id')[:10]
+    serializer_class = MahasiswaTrendingSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def suggest_mahasiswa(request):
+    """Autocomplete nama/NIM mahasiswa (toleran typo) untuk search box: ?q=<prefix>&limit=10"""
+    query = request.GET.get('q', '')
+    try:
+        limit = max(1, min(int(request.GET.get('limit', SUGGEST_DEFAULT_LIMIT)), SUGGEST_MAX_LIMIT))
+    except ValueError:
+        limit = SUGGEST_DEFAULT_LIMIT
+    return Response({
+        'query': query,
+        'results': suggest(query, limit)
+    })
+
+
 @api_view(['PATCH'])
 @permission_classes([IsAdminUser])
 def toggle_mahasiswa_status(request, pk):
@@ -282,35 +353,19 @@ def toggle_mahasiswa_status(request, pk):
 def track_profile_view(request, pk):
     """Track profile view - increment +1 setiap kali detail dibuka"""
     try:
-        mahasiswa = Mahasiswa.objects.get(pk=pk)
+        mahasiswa = Mahasiswa.objects.only('id', 'nama', 'views_count').get(pk=pk)
         
-        # Get client IP for logging
-        x_forwarded_for = request.META.get('HTTP_X_FORWARDED_FOR')
-        if x_forwarded_for:
-            ip = x_forwarded_for.split(',')[0]
-        else:
-            ip = request.META.get('REMOTE_ADDR')
-        
-        # Determine viewer type
-        if request.user.is_authenticated:
-            viewer_info = f"User:{request.user.username}"
-        else:
-            viewer_info = f"Guest:{ip}"
-        
-        print(f"[VIEW TRACK] Profile: {mahasiswa.nama} (ID: {pk}), Viewer: {viewer_info}, Before: {mahasiswa.views_count}")
-        
-        # SIMPLE LOGIC: Always increment by 1 when detail page is opened
-        mahasiswa.views_count += 1
-        mahasiswa.save(update_fields=['views_count'])
-        
-        print(f"[VIEW TRACK] After: {mahasiswa.views_count} (+1)")
+        # Increment +1 lewat buffered counter (di-flush batch dengan F('views_count') + n)
+        # dan antrikan row ProfileView jika viewer ini belum tercatat
+        unique_view = record_view(request, mahasiswa.pk)
         
         return Response({
             'success': True,
             'message': 'View tracked successfully',
             'profile_id': pk,
             'profile_name': mahasiswa.nama,
-            'total_views': mahasiswa.views_count
+            'total_views': mahasiswa.views_count + view_counter.pending(mahasiswa.pk),
+            'unique_view': unique_view
         }, status=status.HTTP_200_OK)
         
     except Mahasiswa.DoesNotExist:
@@ -318,13 +373,60 @@ def track_profile_view(request, pk):
         return Response({'error': 'Mahasiswa not found'}, status=status.HTTP_404_NOT_FOUND)
 
 
+def _view_timeseries_response(request, extra, **filters):
+    """Time series views dari tabel rollup: ?interval=hour|day&start=...&end=..."""
+    interval = request.GET.get('interval', rollups.DAY)
+    if interval not in rollups.INTERVALS:
+        return Response({'error': f"interval harus salah satu dari: {', '.join(rollups.INTERVALS)}"},
+                        status=status.HTTP_400_BAD_REQUEST)
+    try:
+        start = rollups.parse_bucket(request.GET.get('start'), interval)
+        end = rollups.parse_bucket(request.GET.get('end'), interval)
+    except ValueError:
+        return Response({'error': 'Format start/end tidak valid (YYYY-MM-DD atau ISO datetime)'},
+                        status=status.HTTP_400_BAD_REQUEST)
+
+    start, end, _ = rollups.bucket_range(interval, start, end)
+    series = rollups.timeseries(interval, start, end, **filters)
+    data = {
+        **extra,
+        'interval': interval,
+        'total_views': sum(point['views'] for point in series),
+    }
+    if interval == rollups.DAY:
+        # Estimasi HyperLogLog dari gabungan sketch harian dalam rentang
+        data['unique_viewers'] = rollups.unique_viewers(start, end, **filters)
+    data['results'] = series
+    return Response(data)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def profile_view_timeseries(request, pk):
+    """Views per jam/hari untuk satu profil"""
+    if not Mahasiswa.objects.filter(pk=pk).exists():
+        return Response({'error': 'Mahasiswa not found'}, status=status.HTTP_404_NOT_FOUND)
+    return _view_timeseries_response(request, {'profile_id': pk}, mahasiswa_id=pk)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def prodi_view_timeseries(request):
+    """Views per jam/hari untuk semua profil aktif di satu prodi: ?prodi=Informatika"""
+    prodi = request.GET.get('prodi', '').strip()
+    if not prodi:
+        return Response({'error': 'Parameter prodi wajib diisi'}, status=status.HTTP_400_BAD_REQUEST)
+    return _view_timeseries_response(request, {'prodi': prodi}, mahasiswa__prodi=prodi, mahasiswa__is_active=True)
+
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_current_user_profile(request):
     """Get current authenticated user's mahasiswa profile"""
     try:
-        mahasiswa = Mahasiswa.objects.get(user=request.user)
-        serializer = MahasiswaSerializer(mahasiswa)
+        fieldset = Fieldset.from_request(request)
+        mahasiswa = apply_fieldset(Mahasiswa.objects.all(), fieldset).get(user=request.user)
+        serializer = MahasiswaSerializer(mahasiswa, fieldset=fieldset)
         return Response(serializer.data, status=status.HTTP_200_OK)
     except Mahasiswa.DoesNotExist:
         return Response({
@@ -356,6 +458,7 @@ def profile_completion_status(request):
             }, status=status.HTTP_404_NOT_FOUND)
         
         mahasiswa = request.user.mahasiswa_profile
+        prefetch_fieldset([mahasiswa], Fieldset())
         
         # Define required fields
         required_fields = {
@@ -382,7 +485,7 @@ def profile_completion_status(request):
             'filled_fields': filled_fields,
             'total_fields': total_fields,
             'missing_fields': missing_fields,
-            'mahasiswa': MahasiswaSerializer(mahasiswa).data
+            'mahasiswa': MahasiswaSerializer(mahasiswa, context={'request': request}).data
         })
         
     except AttributeError:
@@ -460,46 +563,40 @@ def get_recommendations(request, pk):
     try:
         # Get current mahasiswa
         current_mahasiswa = Mahasiswa.objects.get(pk=pk)
-        
-        # Get their skills
-        from skills.models import Skill
-        current_skills = set(Skill.objects.filter(mahasiswa=current_mahasiswa).values_list('nama', flat=True))
-        
-        if not current_skills:
-            # If no skills, return most viewed profiles
-            recommended = Mahasiswa.objects.filter(
-                is_active=True
-            ).exclude(
-                id=current_mahasiswa.id
-            ).order_by('-views_count')[:6]
+        fieldset = Fieldset.from_request(request)
+        candidates = apply_fieldset(Mahasiswa.objects.all(), fieldset)
+        
+        # Hasil batch recommender (compute_recommendations) jika ada, selain itu
+        # profil dengan skill paling mirip (Jaccard) lewat inverted index skill -> mahasiswa
+        similar = precomputed_recommendations(current_mahasiswa, RECOMMENDATION_LIMIT)
+        metric = COSINE
+        if not similar:
+            similar = similar_profiles(current_mahasiswa, RECOMMENDATION_LIMIT)
+            metric = JACCARD
+        
+        if similar:
+            scores = {mahasiswa_id: score for mahasiswa_id, score, _ in similar}
+            profiles = candidates.in_bulk(list(scores))
+            recommended = [profiles[mahasiswa_id] for mahasiswa_id in scores if mahasiswa_id in profiles]
         else:
-            # Find mahasiswa with similar skills
-            from django.db.models import Count, Q
-            
-            # Build query for mahasiswa with matching skills
-            skill_query = Q()
-            for skill_name in current_skills:
-                skill_query |= Q(skills__nama__iexact=skill_name)
-            
-            # Get mahasiswa with matching skills, count matches
-            similar_mahasiswa = Mahasiswa.objects.filter(
-                is_active=True,
-                skills__isnull=False
+            # Tidak punya skill / tidak ada yang cocok: return most viewed profiles (tanpa skor)
+            scores = {}
+            metric = None
+            recommended = list(candidates.filter(
+                is_active=True
             ).exclude(
                 id=current_mahasiswa.id
-            ).filter(
-                skill_query
-            ).annotate(
-                matching_skills=Count('skills', distinct=True)
-            ).order_by('-matching_skills', '-views_count').distinct()[:6]
-            
-            recommended = similar_mahasiswa
+            ).order_by('-views_count')[:RECOMMENDATION_LIMIT])
         
         # Serialize recommendations
-        serializer = MahasiswaSerializer(recommended, many=True)
+        serializer = MahasiswaSerializer(recommended, many=True, fieldset=fieldset)
+        results = serializer.data
+        for profile, item in zip(recommended, results):
+            item['similarity'] = round(scores[profile.pk], 3) if metric else None
         return Response({
             'count': len(recommended),
-            'results': serializer.data
+            'similarity_metric': metric,
+            'results': results
         })
         
     except Mahasiswa.DoesNotExist:
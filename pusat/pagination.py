@@ -0,0 +1,187 @@
+"""
+Keyset (cursor) pagination untuk listing API (direktori mahasiswa, leaderboard skill).
+
+Berbeda dengan CursorPagination bawaan DRF (yang memakai offset untuk nilai
+kembar), cursor di sini menyimpan pasangan (nilai ordering, id) halaman
+terakhir, sehingga setiap halaman cukup satu range scan di index
+(<field>, id) tanpa COUNT(*) dan tanpa OFFSET.
+
+Cursor tidak bisa digabung dengan ?search=: hasil search diurutkan berdasarkan
+relevansi, bukan kolom yang bisa di-seek, jadi request seperti itu ditolak (400).
+"""
+import base64
+import json
+from collections import OrderedDict
+from datetime import datetime
+
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Aktif dengan `?pagination=cursor` (atau saat request membawa `?cursor=`).
+    Urutan mengikuti `?ordering=` (salah satu ordering_fields view) dengan tiebreak `id`.
+    """
+    cursor_query_param = 'cursor'
+    mode_query_param = 'pagination'
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Invalid cursor'
+    search_not_supported_message = 'Cursor pagination cannot be combined with search; use page pagination.'
+
+    @classmethod
+    def is_requested(cls, request):
+        return (
+            request.query_params.get(cls.mode_query_param) == 'cursor'
+            or cls.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if getattr(view, 'search_fields', None) and request.query_params.get(api_settings.SEARCH_PARAM):
+            raise ValidationError({self.cursor_query_param: [self.search_not_supported_message]})
+
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.field, self.descending = self.get_ordering(request, queryset, view)
+        self.model_field = queryset.model._meta.get_field(self.field)
+        # Field unik (id, nim) tidak butuh tiebreak
+        self.unique = self.model_field.unique
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor.get('r'))
+        # Halaman "previous" diambil dengan arah kebalikan lalu dibalik lagi
+        descending = self.descending != reverse
+
+        prefix = '-' if descending else ''
+        if self.unique:
+            queryset = queryset.order_by(f'{prefix}{self.field}')
+        else:
+            queryset = queryset.order_by(f'{prefix}{self.field}', f'{prefix}id')
+        if cursor:
+            queryset = queryset.filter(self.seek_filter(cursor, descending))
+
+        rows = list(queryset[:self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+            if page_size > 0:
+                return min(page_size, self.max_page_size)
+        except (KeyError, ValueError):
+            pass
+        return api_settings.PAGE_SIZE
+
+    def get_ordering(self, request, queryset, view):
+        """Ambil field ordering pertama dari OrderingFilter view (default view.ordering)"""
+        ordering = None
+        for backend in getattr(view, 'filter_backends', []):
+            if hasattr(backend, 'get_ordering'):
+                ordering = backend().get_ordering(request, queryset, view)
+                break
+        if not ordering:
+            ordering = getattr(view, 'ordering', None) or ['-id']
+
+        first = ordering[0]
+        return first.lstrip('-'), first.startswith('-')
+
+    def seek_filter(self, cursor, descending):
+        value, last_id = self.decode_value(cursor['v']), cursor['id']
+        op = 'lt' if descending else 'gt'
+        if self.unique:
+            return Q(**{f'{self.field}__{op}': value})
+
+        # Kondisi lte/gte di depan supaya database bisa range scan di index (<field>, id)
+        return (
+            Q(**{f'{self.field}__{op}e': value})
+            & (Q(**{f'{self.field}__{op}': value}) | Q(**{f'id__{op}': last_id}))
+        )
+
+    # ------------------------------------------------------------------
+    # Cursor encoding
+    # ------------------------------------------------------------------
+    def encode_cursor(self, row, reverse):
+        value = getattr(row, self.field)
+        if isinstance(value, datetime):
+            value = {'dt': value.isoformat()}
+        payload = json.dumps({'v': value, 'id': row.pk, 'r': reverse}, separators=(',', ':'))
+        encoded = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, encoded)
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            cursor = json.loads(base64.urlsafe_b64decode(encoded.encode()).decode())
+            if not isinstance(cursor, dict) or not isinstance(cursor.get('id'), int) or 'v' not in cursor:
+                raise ValueError
+            return cursor
+        except (TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def decode_value(self, value):
+        """Nilai cursor dikonversi dengan field ordering; nilai yang tidak cocok tipenya -> 404"""
+        if isinstance(value, dict) and set(value) == {'dt'} and isinstance(value['dt'], str):
+            value = value['dt']
+        try:
+            if value is None or isinstance(value, (bool, dict, list)):
+                raise ValueError
+            value = self.model_field.to_python(value)
+            if value is None:
+                raise ValueError
+            return value
+        except (DjangoValidationError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+
+    # ------------------------------------------------------------------
+    # Response
+    # ------------------------------------------------------------------
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
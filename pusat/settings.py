@@ -136,6 +136,40 @@ import dj_database_url
 if config('DATABASE_URL', default=None):
     DATABASES['default'] = dj_database_url.parse(config('DATABASE_URL'))
 
+# Cache - default local memory, set CACHE_BACKEND/CACHE_LOCATION for Redis/Memcached
+CACHES = {
+    'default': {
+        'BACKEND': config('CACHE_BACKEND', default='django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': config('CACHE_LOCATION', default='talenta-mahasiswa'),
+    }
+}
+
+# Homepage listings (latest / most-viewed) cache timeout in seconds
+HOMEPAGE_CACHE_TIMEOUT = config('HOMEPAGE_CACHE_TIMEOUT', default=300, cast=int)
+
+# Directory facet counts cache timeout in seconds (cached per filter combination)
+FACETS_CACHE_TIMEOUT = config('FACETS_CACHE_TIMEOUT', default=300, cast=int)
+
+# Profile view counter: increment di-buffer per proses dan di-flush paling lambat
+# setiap VIEW_COUNT_FLUSH_INTERVAL detik (0 = tulis langsung tanpa buffer)
+VIEW_COUNT_FLUSH_INTERVAL = config('VIEW_COUNT_FLUSH_INTERVAL', default=5, cast=int)
+VIEW_COUNT_MAX_PENDING = config('VIEW_COUNT_MAX_PENDING', default=1000, cast=int)
+
+# Half-life skor trending profil (jam)
+TRENDING_HALF_LIFE_HOURS = config('TRENDING_HALF_LIFE_HOURS', default=24, cast=float)
+
+# Retensi ProfileView (management command prune_profile_views)
+PROFILE_VIEW_RETENTION_DAYS = config('PROFILE_VIEW_RETENTION_DAYS', default=180, cast=int)
+PROFILE_VIEW_COMPACT_AFTER_DAYS = config('PROFILE_VIEW_COMPACT_AFTER_DAYS', default=30, cast=int)
+PROFILE_VIEW_HOURLY_RETENTION_DAYS = config('PROFILE_VIEW_HOURLY_RETENTION_DAYS', default=90, cast=int)
+PROFILE_VIEW_ARCHIVE_DIR = config('PROFILE_VIEW_ARCHIVE_DIR', default='')
+
+# File upload import mahasiswa dari admin + status job (diproses command import_mahasiswa di proses terpisah)
+BULK_IMPORT_DIR = config('BULK_IMPORT_DIR', default=str(BASE_DIR / 'imports'))
+
+# Index autocomplete skill per proses dibangun ulang paling lambat setiap N detik (bobot frekuensi)
+SKILL_SUGGEST_MAX_AGE = config('SKILL_SUGGEST_MAX_AGE', default=300, cast=int)
+
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
     {
@@ -1,15 +1,27 @@
 from django.contrib import admin
-from .models import Skill, SkillEndorsement
+from .models import Skill, SkillEndorsement, SkillTag, SkillTagAlias
+
+
+class SkillTagAliasInline(admin.TabularInline):
+    model = SkillTagAlias
+    extra = 1
+
+
+@admin.register(SkillTag)
+class SkillTagAdmin(admin.ModelAdmin):
+    list_display = ['nama', 'nama_normalized', 'created_at']
+    search_fields = ['nama', 'nama_normalized', 'aliases__alias']
+    readonly_fields = ['nama_normalized']
+    inlines = [SkillTagAliasInline]
+
 
 @admin.register(Skill)
 class SkillAdmin(admin.ModelAdmin):
-    list_display = ['nama', 'mahasiswa', 'level', 'get_endorsement_count']
+    list_display = ['nama', 'tag', 'mahasiswa', 'level', 'endorsement_count']
     list_filter = ['level']
     search_fields = ['nama', 'mahasiswa__nama']
-    
-    def get_endorsement_count(self, obj):
-        return obj.endorsement_count()
-    get_endorsement_count.short_description = 'Endorsements'
+    raw_id_fields = ['tag']
+    readonly_fields = ['endorsement_count']
 
 
 @admin.register(SkillEndorsement)
@@ -0,0 +1,153 @@
+"""
+Leaderboard skill yang dimaterialisasi (SkillLeaderboard, SkillEndorsementLeaderboard).
+
+- SkillEndorsementLeaderboard: total endorsement per (tag, mahasiswa aktif), dihitung
+  ulang per mahasiswa dari row Skill-nya (Skill.endorsement_count).
+- SkillLeaderboard: per (prodi, tag) jumlah mahasiswa & total endorsement, dihitung
+  ulang per tag dari SkillEndorsementLeaderboard (bukan dari seluruh Skill/endorsement).
+  Row dengan prodi '' adalah agregat semua prodi.
+
+Perubahan skill, endorsement atau prodi/status profil mengantrikan mahasiswa & tag
+yang terdampak ke LeaderboardQueue (lihat mahasiswa.signals dan skills.views), yang
+di-flush per batch seperti buffer view tracking. Row di-upsert supaya id stabil untuk
+cursor keyset pagination. Build penuh: `python manage.py rebuild_leaderboards`.
+"""
+import atexit
+import logging
+
+from django.db import transaction
+from django.db.models import Count, Sum
+
+from mahasiswa.view_tracking import BufferedWriter
+
+from .models import Skill, SkillEndorsementLeaderboard, SkillLeaderboard
+
+logger = logging.getLogger(__name__)
+
+ALL_PRODI = ''
+
+
+def _sync(model, rows, existing, unique_fields, update_fields):
+    """Upsert `rows` lalu hapus row `existing` {key: pk} yang tidak ada lagi di `rows`"""
+    model.objects.bulk_create(
+        list(rows.values()),
+        batch_size=1000,
+        update_conflicts=True,
+        unique_fields=unique_fields,
+        update_fields=update_fields,
+    )
+    stale = [pk for key, pk in existing.items() if key not in rows]
+    if stale:
+        model.objects.filter(pk__in=stale).delete()
+
+
+def refresh_students(mahasiswa_ids):
+    """Hitung ulang SkillEndorsementLeaderboard untuk mahasiswa ini; return tag id yang terdampak"""
+    mahasiswa_ids = set(mahasiswa_ids)
+    if not mahasiswa_ids:
+        return set()
+    existing = {
+        (tag_id, mahasiswa_id): pk
+        for pk, tag_id, mahasiswa_id in SkillEndorsementLeaderboard.objects.filter(
+            mahasiswa__in=mahasiswa_ids
+        ).values_list('pk', 'tag_id', 'mahasiswa_id')
+    }
+    totals = (
+        Skill.objects.filter(mahasiswa__in=mahasiswa_ids, mahasiswa__is_active=True, tag__isnull=False)
+        .order_by().values('tag', 'mahasiswa', 'mahasiswa__prodi')
+        .annotate(total=Sum('endorsement_count'))
+    )
+    rows = {
+        (row['tag'], row['mahasiswa']): SkillEndorsementLeaderboard(
+            tag_id=row['tag'], mahasiswa_id=row['mahasiswa'], prodi=row['mahasiswa__prodi'], endorsements=row['total'],
+        )
+        for row in totals
+    }
+    _sync(SkillEndorsementLeaderboard, rows, existing, ['tag', 'mahasiswa'], ['prodi', 'endorsements'])
+    return {tag_id for tag_id, _ in existing} | {tag_id for tag_id, _ in rows}
+
+
+def refresh_tags(tag_ids):
+    """Hitung ulang SkillLeaderboard (semua prodi + agregat) untuk tag ini"""
+    tag_ids = set(tag_ids)
+    if not tag_ids:
+        return
+    existing = {
+        (prodi, tag_id): pk
+        for pk, prodi, tag_id in SkillLeaderboard.objects.filter(tag__in=tag_ids).values_list('pk', 'prodi', 'tag_id')
+    }
+    students = SkillEndorsementLeaderboard.objects.filter(tag__in=tag_ids).order_by()
+    rows = {}
+    per_prodi = students.values('prodi', 'tag').annotate(students=Count('pk'), endorsements=Sum('endorsements'))
+    overall = students.values('tag').annotate(students=Count('pk'), endorsements=Sum('endorsements'))
+    for row in [*per_prodi, *overall]:
+        prodi = row.get('prodi', ALL_PRODI)
+        rows[(prodi, row['tag'])] = SkillLeaderboard(
+            prodi=prodi, tag_id=row['tag'], students=row['students'], endorsements=row['endorsements'],
+        )
+    _sync(SkillLeaderboard, rows, existing, ['prodi', 'tag'], ['students', 'endorsements', 'updated_at'])
+
+
+def refresh(mahasiswa_ids=(), tag_ids=()):
+    with transaction.atomic():
+        refresh_tags(set(tag_ids) | refresh_students(mahasiswa_ids))
+
+
+class LeaderboardQueue(BufferedWriter):
+    """Mahasiswa & tag yang leaderboard-nya perlu dihitung ulang"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._pending = (set(), set())
+
+    def add(self, mahasiswa_id=None, tag_id=None):
+        with self._lock:
+            mahasiswa_ids, tag_ids = self._pending
+            added = 0
+            for key, pending in ((mahasiswa_id, mahasiswa_ids), (tag_id, tag_ids)):
+                if key is not None and key not in pending:
+                    pending.add(key)
+                    added += 1
+            if not added:
+                return
+            flush_now = self._buffered(added)
+        if flush_now:
+            self._flush_full()
+
+    def _swap(self):
+        batch, self._pending = self._pending, (set(), set())
+        if not any(batch):
+            return None
+        return batch
+
+    def _merge(self, batch):
+        added = 0
+        for pending, keys in zip(self._pending, batch):
+            added += len(keys - pending)
+            pending |= keys
+        return added
+
+    def _write(self, batch):
+        mahasiswa_ids, tag_ids = batch
+        refresh(mahasiswa_ids, tag_ids)
+        return len(mahasiswa_ids) + len(tag_ids)
+
+    def _split(self, batch):
+        mahasiswa_ids, tag_ids = batch
+        return [({mahasiswa_id}, set()) for mahasiswa_id in mahasiswa_ids] + [(set(), {tag_id}) for tag_id in tag_ids]
+
+    def _describe(self, part):
+        return [sorted(keys) for keys in part]
+
+
+leaderboard_queue = LeaderboardQueue()
+
+
+def _flush_on_exit():
+    try:
+        leaderboard_queue.flush()
+    except Exception:
+        logger.exception('LeaderboardQueue: flush saat exit gagal')
+
+
+atexit.register(_flush_on_exit)
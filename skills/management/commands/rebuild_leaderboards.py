@@ -0,0 +1,30 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from mahasiswa.models import Mahasiswa
+from skills import leaderboards
+from skills.models import SkillTag
+
+
+class Command(BaseCommand):
+    help = 'Bangun ulang leaderboard skill (SkillEndorsementLeaderboard & SkillLeaderboard) dari data Skill'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size <= 0:
+            raise CommandError('--batch-size harus lebih dari 0')
+
+        # Per mahasiswa dulu, agregat per tag sekali di akhir (bukan per batch mahasiswa)
+        mahasiswa_ids = list(Mahasiswa.objects.order_by('pk').values_list('pk', flat=True))
+        for start in range(0, len(mahasiswa_ids), batch_size):
+            leaderboards.refresh_students(mahasiswa_ids[start:start + batch_size])
+
+        tag_ids = list(SkillTag.objects.order_by('pk').values_list('pk', flat=True))
+        for start in range(0, len(tag_ids), batch_size):
+            leaderboards.refresh_tags(tag_ids[start:start + batch_size])
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Leaderboard dibangun ulang: {len(mahasiswa_ids)} mahasiswa, {len(tag_ids)} skill'
+        ))
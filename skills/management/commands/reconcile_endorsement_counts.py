@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from skills import leaderboards
+from skills.models import Skill, SkillEndorsement
+
+
+class Command(BaseCommand):
+    help = 'Perbaiki Skill.endorsement_count yang tidak sama dengan jumlah endorsement sebenarnya'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--sleep', type=float, default=0,
+                            help='Jeda antar batch (detik) supaya tidak membebani database')
+        parser.add_argument('--dry-run', action='store_true', help='Hanya laporkan jumlah skill yang drift')
+
+    def handle(self, *args, **options):
+        batch_size = options['batch_size']
+        if batch_size <= 0:
+            raise CommandError('--batch-size harus lebih dari 0')
+
+        actual = Coalesce(Subquery(
+            SkillEndorsement.objects.filter(skill=OuterRef('pk')).order_by().values('skill')
+            .annotate(total=Count('pk')).values('total')
+        ), 0)
+        checked = repaired = 0
+        last_pk = 0
+        while True:
+            # Keyset per pk: tiap batch satu UPDATE kecil, aman saat endorse berjalan
+            pks = list(Skill.objects.filter(pk__gt=last_pk).order_by('pk').values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            last_pk = pks[-1]
+            checked += len(pks)
+            drifted = Skill.objects.filter(pk__in=pks).alias(actual=actual).exclude(endorsement_count=F('actual'))
+            if options['dry_run']:
+                repaired += drifted.count()
+            else:
+                affected = list(drifted.values_list('mahasiswa_id', 'tag_id'))
+                repaired += drifted.update(endorsement_count=actual)
+                if affected:
+                    leaderboards.refresh(*map(set, zip(*affected)))
+            if options['sleep']:
+                time.sleep(options['sleep'])
+
+        verb = 'drift' if options['dry_run'] else 'diperbaiki'
+        self.stdout.write(self.style.SUCCESS(f'{checked} skill diperiksa, {repaired} {verb}'))
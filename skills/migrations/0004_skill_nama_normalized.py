@@ -0,0 +1,32 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:15
+
+from django.db import migrations, models
+
+
+def fill_nama_normalized(apps, schema_editor):
+    Skill = apps.get_model('skills', 'Skill')
+    skills = list(Skill.objects.only('id', 'nama'))
+    for skill in skills:
+        skill.nama_normalized = ' '.join((skill.nama or '').casefold().split())
+    Skill.objects.bulk_update(skills, ['nama_normalized'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mahasiswa', '0012_profile_viewer_sketches'),
+        ('skills', '0003_skill_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='nama_normalized',
+            field=models.CharField(blank=True, editable=False, max_length=100),
+        ),
+        migrations.RunPython(fill_nama_normalized, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['nama_normalized', 'mahasiswa'], name='skills_skil_nama_no_a89b67_idx'),
+        ),
+    ]
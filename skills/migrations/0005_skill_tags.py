@@ -0,0 +1,100 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:25
+
+import django.db.models.deletion
+from collections import Counter
+
+from django.db import migrations, models
+
+# Alias umum; hanya dibuat jika nama kanonik-nya sudah dipakai mahasiswa
+DEFAULT_ALIASES = {
+    'javascript': ['js'],
+    'typescript': ['ts'],
+    'python': ['py'],
+    'react': ['reactjs', 'react.js'],
+    'vue': ['vuejs', 'vue.js'],
+    'node.js': ['nodejs', 'node'],
+    'postgresql': ['postgres'],
+    'c++': ['cpp'],
+    'c#': ['csharp'],
+    'machine learning': ['ml'],
+    'ui/ux': ['ui ux', 'uiux'],
+}
+
+
+def fill_skill_tags(apps, schema_editor):
+    Skill = apps.get_model('skills', 'Skill')
+    SkillTag = apps.get_model('skills', 'SkillTag')
+    SkillTagAlias = apps.get_model('skills', 'SkillTagAlias')
+
+    # Nama tampilan tag = penulisan yang paling sering dipakai
+    spellings = {}
+    for nama_normalized, nama in Skill.objects.exclude(nama_normalized='').values_list('nama_normalized', 'nama').iterator():
+        spellings.setdefault(nama_normalized, Counter())[' '.join(nama.split())] += 1
+    SkillTag.objects.bulk_create(
+        [SkillTag(nama=counts.most_common(1)[0][0], nama_normalized=key) for key, counts in spellings.items()],
+        batch_size=500,
+    )
+    tags = dict(SkillTag.objects.values_list('nama_normalized', 'id'))
+
+    # Tag yang sebenarnya alias digabung ke tag kanoniknya
+    for canonical, aliases in DEFAULT_ALIASES.items():
+        if canonical not in tags:
+            continue
+        for alias in aliases:
+            alias_id = tags.pop(alias, None)
+            if alias_id is not None:
+                Skill.objects.filter(nama_normalized=alias).update(tag_id=tags[canonical])
+                SkillTag.objects.filter(pk=alias_id).delete()
+            SkillTagAlias.objects.create(tag_id=tags[canonical], alias=alias)
+
+    for nama_normalized, tag_id in tags.items():
+        Skill.objects.filter(nama_normalized=nama_normalized).update(tag_id=tag_id)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mahasiswa', '0013_profile_recommendations'),
+        ('skills', '0004_skill_nama_normalized'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillTag',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('nama', models.CharField(max_length=100)),
+                ('nama_normalized', models.CharField(max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['nama'],
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillTagAlias',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('alias', models.CharField(max_length=100, unique=True)),
+            ],
+            options={
+                'verbose_name_plural': 'Skill tag aliases',
+                'ordering': ['alias'],
+            },
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='tag',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='skills', to='skills.skilltag'),
+        ),
+        migrations.AddField(
+            model_name='skilltagalias',
+            name='tag',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='aliases', to='skills.skilltag'),
+        ),
+        migrations.RunPython(fill_skill_tags, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['tag', 'mahasiswa'], name='skills_skil_tag_id_29dcc6_idx'),
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:29
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_endorsement_count(apps, schema_editor):
+    Skill = apps.get_model('skills', 'Skill')
+    SkillEndorsement = apps.get_model('skills', 'SkillEndorsement')
+    actual = (
+        SkillEndorsement.objects.filter(skill=OuterRef('pk')).order_by().values('skill')
+        .annotate(total=Count('pk')).values('total')
+    )
+    Skill.objects.filter(endorsements__isnull=False).update(endorsement_count=Coalesce(Subquery(actual), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('skills', '0005_skill_tags'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='endorsement_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_endorsement_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.9 on 2026-10-18 18:31
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('mahasiswa', '0014_profile_minhash_lsh'),
+        ('skills', '0006_skill_endorsement_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SkillEndorsementLeaderboard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prodi', models.CharField(max_length=100)),
+                ('endorsements', models.PositiveIntegerField(default=0)),
+                ('mahasiswa', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='mahasiswa.mahasiswa')),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='skills.skilltag')),
+            ],
+            options={
+                'verbose_name': 'Skill Endorsement Leaderboard',
+                'verbose_name_plural': 'Skill Endorsement Leaderboards',
+                'indexes': [models.Index(fields=['tag', 'endorsements', 'id'], name='skills_skil_tag_id_a94dad_idx'), models.Index(fields=['tag', 'prodi', 'endorsements', 'id'], name='skills_skil_tag_id_8a4263_idx')],
+                'constraints': [models.UniqueConstraint(fields=('tag', 'mahasiswa'), name='unique_skill_endorsement_leaderboard')],
+            },
+        ),
+        migrations.CreateModel(
+            name='SkillLeaderboard',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prodi', models.CharField(blank=True, max_length=100)),
+                ('students', models.PositiveIntegerField(default=0)),
+                ('endorsements', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('tag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='skills.skilltag')),
+            ],
+            options={
+                'verbose_name': 'Skill Leaderboard',
+                'verbose_name_plural': 'Skill Leaderboards',
+                'indexes': [models.Index(fields=['prodi', 'students', 'id'], name='skills_skil_prodi_ee2a6a_idx'), models.Index(fields=['prodi', 'endorsements', 'id'], name='skills_skil_prodi_2530a4_idx')],
+                'constraints': [models.UniqueConstraint(fields=('prodi', 'tag'), name='unique_skill_leaderboard')],
+            },
+        ),
+    ]
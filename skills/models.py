@@ -1,21 +1,115 @@
 from django.db import models
 from django.contrib.auth.models import User
+from mahasiswa import cache
 from mahasiswa.models import Mahasiswa
 
+
+def normalize_skill_name(nama):
+    """Bentuk kanonik nama skill untuk pencocokan (huruf besar/kecil & spasi diabaikan)"""
+    return ' '.join((nama or '').casefold().split())
+
+
+class SkillTagManager(models.Manager):
+    def resolve(self, names):
+        """
+        Map nama skill (sudah dinormalisasi) -> SkillTag, lewat nama kanonik atau alias.
+        Tag baru dibuat untuk nama yang belum dikenal. Dua query untuk nama yang sudah ada.
+        """
+        display = {}
+        for nama in names:
+            normalized = normalize_skill_name(nama)
+            if normalized:
+                display.setdefault(normalized, ' '.join(nama.split()))
+        if not display:
+            return {}
+
+        tags = {tag.nama_normalized: tag for tag in self.filter(nama_normalized__in=display)}
+        unknown = set(display) - set(tags)
+        if unknown:
+            for alias in SkillTagAlias.objects.filter(alias__in=unknown).select_related('tag'):
+                tags[alias.alias] = alias.tag
+                unknown.discard(alias.alias)
+        if unknown:
+            # ignore_conflicts: request lain bisa membuat tag yang sama bersamaan
+            self.bulk_create(
+                [self.model(nama=display[normalized], nama_normalized=normalized) for normalized in unknown],
+                ignore_conflicts=True,
+            )
+            tags.update((tag.nama_normalized, tag) for tag in self.filter(nama_normalized__in=unknown))
+            # bulk_create tidak mengirim signal: index autocomplete skill perlu dibangun ulang
+            cache.invalidate(cache.SKILL_SUGGEST)
+        return tags
+
+
+class SkillTag(models.Model):
+    """Kamus skill kanonik; Skill milik mahasiswa menunjuk ke sini lewat Skill.tag"""
+    nama = models.CharField(max_length=100)
+    nama_normalized = models.CharField(max_length=100, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    objects = SkillTagManager()
+
+    class Meta:
+        ordering = ['nama']
+
+    def __str__(self):
+        return self.nama
+
+    def save(self, *args, **kwargs):
+        self.nama_normalized = normalize_skill_name(self.nama)
+        super().save(*args, **kwargs)
+
+
+class SkillTagAlias(models.Model):
+    """Nama lain untuk SkillTag, mis. 'js' -> JavaScript (disimpan dalam bentuk normalized)"""
+    tag = models.ForeignKey(SkillTag, related_name='aliases', on_delete=models.CASCADE)
+    alias = models.CharField(max_length=100, unique=True)
+
+    class Meta:
+        ordering = ['alias']
+        verbose_name_plural = 'Skill tag aliases'
+
+    def __str__(self):
+        return f"{self.alias} -> {self.tag.nama}"
+
+    def save(self, *args, **kwargs):
+        self.alias = normalize_skill_name(self.alias)
+        super().save(*args, **kwargs)
+
+
 class Skill(models.Model):
     mahasiswa = models.ForeignKey(Mahasiswa, related_name='skills', on_delete=models.CASCADE)
     nama = models.CharField(max_length=100)
+    # Inverted index skill -> mahasiswa untuk rekomendasi (lihat mahasiswa.recommendations)
+    nama_normalized = models.CharField(max_length=100, blank=True, editable=False)
+    # Skill kanonik (integer key untuk join / group by); di-resolve dari nama saat save
+    tag = models.ForeignKey(SkillTag, related_name='skills', null=True, blank=True, on_delete=models.SET_NULL)
     level = models.CharField(max_length=50, blank=True)  # contoh: Beginner, Intermediate, Expert
+    # Denormalisasi COUNT(endorsements): diubah atomik dengan F() oleh endorse/remove,
+    # drift diperbaiki command reconcile_endorsement_counts
+    endorsement_count = models.PositiveIntegerField(default=0, editable=False)
+    updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-id']
+        indexes = [
+            models.Index(fields=['nama_normalized', 'mahasiswa']),
+            models.Index(fields=['tag', 'mahasiswa']),
+        ]
 
     def __str__(self):
         return f"{self.nama} ({self.mahasiswa.nama})"
-    
-    def endorsement_count(self):
-        """Count total endorsements for this skill"""
-        return self.endorsements.count()
+
+    def save(self, *args, **kwargs):
+        normalized = normalize_skill_name(self.nama)
+        # Resolve tag hanya untuk skill baru tanpa tag atau jika nama berubah
+        if self.tag_id is None or (not self._state.adding and normalized != self.nama_normalized):
+            self.tag = SkillTag.objects.resolve([self.nama]).get(normalized)
+        self.nama_normalized = normalized
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'nama' in update_fields:
+            kwargs['update_fields'] = {*update_fields, 'nama_normalized', 'tag'}
+        super().save(*args, **kwargs)
 
 
 class SkillEndorsement(models.Model):
@@ -31,4 +125,67 @@ class SkillEndorsement(models.Model):
         verbose_name_plural = 'Skill Endorsements'
     
     def __str__(self):
-        return f"{self.endorsed_by.username} endorsed {self.skill.nama}"
\ No newline at end of file
+        return f"{self.endorsed_by.username} endorsed {self.skill.nama}"
+
+
+# Jumlah endorsement terbaru yang ikut di-embed di payload skill / profil;
+# daftar lengkap lewat endpoint paginated /api/skills/<pk>/endorsements/
+RECENT_ENDORSEMENTS = 3
+
+
+def recent_endorsements_prefetch():
+    """Satu query (window function per skill) untuk endorsement terbaru + username endorser"""
+    return models.Prefetch(
+        'endorsements',
+        queryset=SkillEndorsement.objects.select_related('endorsed_by').order_by('-created_at', '-id')[:RECENT_ENDORSEMENTS],
+        to_attr='recent_endorsements',
+    )
+
+
+class SkillLeaderboard(models.Model):
+    """
+    Agregat per (prodi, tag): jumlah mahasiswa aktif yang punya skill & total endorsement-nya.
+    prodi '' = semua prodi. Diperbarui incremental oleh skills.leaderboards.
+    """
+    prodi = models.CharField(max_length=100, blank=True)
+    tag = models.ForeignKey(SkillTag, related_name='+', on_delete=models.CASCADE)
+    students = models.PositiveIntegerField(default=0)
+    endorsements = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = 'Skill Leaderboard'
+        verbose_name_plural = 'Skill Leaderboards'
+        constraints = [
+            models.UniqueConstraint(fields=['prodi', 'tag'], name='unique_skill_leaderboard'),
+        ]
+        indexes = [
+            # Keyset pagination (nilai, id) per prodi
+            models.Index(fields=['prodi', 'students', 'id']),
+            models.Index(fields=['prodi', 'endorsements', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.prodi or '*'} / {self.tag_id}: {self.students}"
+
+
+class SkillEndorsementLeaderboard(models.Model):
+    """Total endorsement per (tag, mahasiswa aktif); prodi disalin dari profil untuk filter"""
+    tag = models.ForeignKey(SkillTag, related_name='+', on_delete=models.CASCADE)
+    mahasiswa = models.ForeignKey(Mahasiswa, related_name='+', on_delete=models.CASCADE)
+    prodi = models.CharField(max_length=100)
+    endorsements = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        verbose_name = 'Skill Endorsement Leaderboard'
+        verbose_name_plural = 'Skill Endorsement Leaderboards'
+        constraints = [
+            models.UniqueConstraint(fields=['tag', 'mahasiswa'], name='unique_skill_endorsement_leaderboard'),
+        ]
+        indexes = [
+            models.Index(fields=['tag', 'endorsements', 'id']),
+            models.Index(fields=['tag', 'prodi', 'endorsements', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.tag_id} / {self.mahasiswa_id}: {self.endorsements}"
@@ -1,5 +1,7 @@
 from rest_framework import serializers
-from .models import Skill, SkillEndorsement
+from .models import (
+    RECENT_ENDORSEMENTS, Skill, SkillEndorsement, SkillEndorsementLeaderboard, SkillLeaderboard,
+)
 
 class SkillEndorsementSerializer(serializers.ModelSerializer):
     endorsed_by_username = serializers.CharField(source='endorsed_by.username', read_only=True)
@@ -11,12 +13,42 @@ class SkillEndorsementSerializer(serializers.ModelSerializer):
 
 
 class SkillSerializer(serializers.ModelSerializer):
-    endorsement_count = serializers.SerializerMethodField()
-    endorsements = SkillEndorsementSerializer(many=True, read_only=True)
-    
-    def get_endorsement_count(self, obj):
-        return obj.endorsement_count()
-    
+    # Hanya RECENT_ENDORSEMENTS endorsement terbaru (total di endorsement_count);
+    # daftar lengkap lewat /api/skills/<pk>/endorsements/
+    endorsements = serializers.SerializerMethodField()
+
+    def get_endorsements(self, obj):
+        # Pakai hasil recent_endorsements_prefetch() jika queryset sudah mem-prefetch
+        recent = getattr(obj, 'recent_endorsements', None)
+        if recent is None:
+            recent = obj.endorsements.select_related('endorsed_by').order_by('-created_at', '-id')[:RECENT_ENDORSEMENTS]
+        return SkillEndorsementSerializer(recent, many=True).data
+
     class Meta:
         model = Skill
-        fields = ['id', 'mahasiswa', 'nama', 'level', 'endorsement_count', 'endorsements']
\ No newline at end of file
+        fields = ['id', 'mahasiswa', 'nama', 'tag', 'level', 'endorsement_count', 'endorsements']
+        read_only_fields = ['tag']
+
+
+class SkillSummarySerializer(SkillSerializer):
+    """Skill tanpa daftar endorsements (hanya endorsement_count)"""
+    class Meta(SkillSerializer.Meta):
+        fields = ['id', 'mahasiswa', 'nama', 'tag', 'level', 'endorsement_count']
+
+
+class SkillLeaderboardSerializer(serializers.ModelSerializer):
+    nama = serializers.CharField(source='tag.nama', read_only=True)
+
+    class Meta:
+        model = SkillLeaderboard
+        fields = ['tag', 'nama', 'prodi', 'students', 'endorsements', 'updated_at']
+
+
+class SkillEndorsementLeaderboardSerializer(serializers.ModelSerializer):
+    nama = serializers.CharField(source='mahasiswa.nama', read_only=True)
+    nim = serializers.CharField(source='mahasiswa.nim', read_only=True)
+    foto_profil = serializers.ImageField(source='mahasiswa.foto_profil', read_only=True)
+
+    class Meta:
+        model = SkillEndorsementLeaderboard
+        fields = ['mahasiswa', 'nama', 'nim', 'prodi', 'foto_profil', 'endorsements']
@@ -0,0 +1,100 @@
+"""
+Autocomplete nama skill untuk editor profil.
+
+Index prefix in-process (SkillPrefixIndex): list terurut key -> tag, di mana key
+adalah nama kanonik SkillTag, setiap awal kata di nama itu ("learning" untuk
+"Machine Learning") dan alias-nya. Prefix dicari dengan bisect, lalu tag yang cocok
+diurutkan berdasarkan jumlah mahasiswa yang memakainya.
+
+Index dibangun ulang secara lazy jika versi cache 'skill_suggest' naik (tag/alias
+baru, diubah atau dihapus; lihat mahasiswa.signals dan SkillTagManager.resolve),
+atau jika sudah lebih tua dari SKILL_SUGGEST_MAX_AGE detik supaya bobot frekuensi
+tidak terlalu usang.
+"""
+import bisect
+import heapq
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import Count
+
+from mahasiswa import cache
+
+from .models import Skill, SkillTag, SkillTagAlias, normalize_skill_name
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 20
+DEFAULT_MAX_AGE = 300
+_MAX_CHAR = chr(0x10FFFF)
+
+
+class SkillPrefixIndex:
+    """Key terurut (prefix lookup) + peringkat tag berdasarkan frekuensi"""
+
+    def __init__(self, tags, aliases):
+        # tags: list (tag_id, nama, nama_normalized, jumlah mahasiswa); aliases: list (tag_id, alias)
+        ranked = sorted(tags, key=lambda tag: (-tag[3], tag[1].casefold()))
+        self.tags = {tag_id: (nama, count) for tag_id, nama, _, count in ranked}
+        self.rank = {tag[0]: position for position, tag in enumerate(ranked)}
+
+        keys = set()
+        for tag_id, _, nama_normalized, _ in ranked:
+            words = nama_normalized.split(' ')
+            keys.update((' '.join(words[i:]), tag_id) for i in range(len(words)))
+        keys.update((alias, tag_id) for tag_id, alias in aliases if tag_id in self.tags)
+        self.keys = sorted(keys)
+
+    @classmethod
+    def build(cls):
+        counts = dict(
+            Skill.objects.filter(tag__isnull=False, mahasiswa__is_active=True)
+            .order_by().values('tag').annotate(total=Count('mahasiswa', distinct=True))
+            .values_list('tag', 'total')
+        )
+        tags = [
+            (tag_id, nama, nama_normalized, counts[tag_id])
+            for tag_id, nama, nama_normalized in SkillTag.objects.filter(pk__in=counts).values_list(
+                'pk', 'nama', 'nama_normalized'
+            ).iterator()
+        ]
+        aliases = list(SkillTagAlias.objects.values_list('tag_id', 'alias'))
+        return cls(tags, aliases)
+
+    def search(self, prefix, limit):
+        prefix = normalize_skill_name(prefix)
+        if not prefix:
+            return []
+        start = bisect.bisect_left(self.keys, (prefix,))
+        stop = bisect.bisect_left(self.keys, (prefix + _MAX_CHAR,), start)
+        matches = {tag_id for _, tag_id in self.keys[start:stop]}
+        best = heapq.nsmallest(limit, matches, key=self.rank.__getitem__)
+        return [{'tag': tag_id, 'nama': self.tags[tag_id][0], 'count': self.tags[tag_id][1]} for tag_id in best]
+
+
+_index = None
+_index_version = None
+_index_built_at = 0.0
+_index_lock = threading.Lock()
+
+
+def _is_stale(version):
+    max_age = getattr(settings, 'SKILL_SUGGEST_MAX_AGE', DEFAULT_MAX_AGE)
+    return _index is None or _index_version != version or time.monotonic() - _index_built_at > max_age
+
+
+def get_index():
+    """SkillPrefixIndex proses ini, dibangun ulang jika versi cache berubah atau sudah terlalu tua"""
+    global _index, _index_version, _index_built_at
+    version = cache.get_version(cache.SKILL_SUGGEST)
+    if _is_stale(version):
+        with _index_lock:
+            if _is_stale(version):
+                _index = SkillPrefixIndex.build()
+                _index_version = version
+                _index_built_at = time.monotonic()
+    return _index
+
+
+def suggest(prefix, limit=DEFAULT_LIMIT):
+    return get_index().search(prefix, limit)
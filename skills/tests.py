@@ -1,3 +1,270 @@
-from django.test import TestCase
+import io
+from importlib import import_module
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps
+from django.contrib.auth.models import User
+from django.core.cache import cache as django_cache
+from django.core.management import call_command
+from django.db import OperationalError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from mahasiswa.models import Mahasiswa
+
+from . import leaderboards, suggest
+from .leaderboards import leaderboard_queue
+from .models import Skill, SkillEndorsement, SkillEndorsementLeaderboard, SkillLeaderboard, SkillTag, SkillTagAlias
+
+
+def create_mahasiswa(username, nim):
+    return Mahasiswa.objects.create(
+        user=User.objects.create(username=username),
+        nama=username, nim=nim, prodi='Informatika', email=f'{username}@example.com',
+    )
+
+
+@override_settings(VIEW_COUNT_FLUSH_INTERVAL=0)
+class BulkEndorseTest(TestCase):
+    """Bulk endorse: endorsement_count selalu sama dengan jumlah row endorsement"""
+
+    def setUp(self):
+        self.owner = create_mahasiswa('owner', 'L200001')
+        self.skills = [Skill.objects.create(mahasiswa=self.owner, nama=name) for name in ('Python', 'Go', 'SQL')]
+        self.endorser = User.objects.create(username='endorser')
+        self.client = APIClient()
+        self.client.force_authenticate(self.endorser)
+
+    def endorse(self, skill_ids):
+        return self.client.post(reverse('skill-endorse-bulk'), {'skill_ids': skill_ids}, format='json')
+
+    def assert_counts_match_rows(self):
+        for skill in Skill.objects.all():
+            self.assertEqual(skill.endorsement_count, skill.endorsements.count(), skill.nama)
+
+    def test_endorses_new_skills_once(self):
+        python, go, _ = self.skills
+        self.client.post(reverse('skill-endorse', args=[python.pk]))
+
+        response = self.endorse([python.pk, go.pk, go.pk])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data['created'], response.data['already_endorsed']), ([go.pk], [python.pk]))
+        self.assertEqual(self.endorse([python.pk, go.pk]).status_code, 200)
+        self.assert_counts_match_rows()
+
+    def test_concurrent_single_endorse_does_not_fail_or_drift(self):
+        python, go, _ = self.skills
+        bulk_create = SkillEndorsement.objects.bulk_create
+
+        def race(objs, **kwargs):
+            # endorse_skill untuk skill yang sama masuk setelah cek endorsement yang sudah ada
+            SkillEndorsement.objects.create(skill=python, endorsed_by=self.endorser)
+            return bulk_create(objs, **kwargs)
+
+        with mock.patch.object(SkillEndorsement.objects, 'bulk_create', side_effect=race):
+            response = self.endorse([python.pk, go.pk])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(SkillEndorsement.objects.filter(endorsed_by=self.endorser).count(), 2)
+        self.assert_counts_match_rows()
+
+    def test_rejects_non_integer_ids(self):
+        for skill_ids in ([True], [1.0], ['1'], [None], 'abc', []):
+            self.assertEqual(self.endorse(skill_ids).status_code, 400, skill_ids)
+        self.assertFalse(SkillEndorsement.objects.exists())
+
+    def test_own_and_missing_skills_are_rejected(self):
+        self.client.force_authenticate(self.owner.user)
+        self.assertEqual(self.endorse([self.skills[0].pk]).status_code, 400)
+        self.client.force_authenticate(self.endorser)
+        self.assertEqual(self.endorse([self.skills[0].pk, 10 ** 6]).status_code, 404)
+        self.assertFalse(SkillEndorsement.objects.exists())
+
+
+class EndorsementCountTest(TestCase):
+    """Skill.endorsement_count ikut endorse/remove; drift diperbaiki reconcile_endorsement_counts"""
+
+    def setUp(self):
+        self.owner = create_mahasiswa('owner', 'L200001')
+        self.python = Skill.objects.create(mahasiswa=self.owner, nama='Python')
+        self.go = Skill.objects.create(mahasiswa=self.owner, nama='Go')
+        self.client = APIClient()
+
+    def endorse(self, username, skill):
+        self.client.force_authenticate(User.objects.get_or_create(username=username)[0])
+        return self.client.post(reverse('skill-endorse', args=[skill.pk]))
+
+    def test_count_follows_endorse_and_remove(self):
+        self.endorse('a', self.python)
+        self.endorse('b', self.python)
+        self.assertEqual(self.endorse('b', self.python).status_code, 200)
+        self.client.delete(reverse('skill-remove-endorsement', args=[self.python.pk]))
+        self.assertEqual(self.client.delete(reverse('skill-remove-endorsement', args=[self.python.pk])).status_code, 404)
+
+        self.python.refresh_from_db()
+        self.assertEqual(self.python.endorsement_count, 1)
+        response = self.client.get(reverse('skill-detail', args=[self.python.pk]))
+        self.assertEqual(response.data['endorsement_count'], 1)
+
+    def test_reconcile_repairs_drift_and_leaderboard(self):
+        self.endorse('a', self.python)
+        leaderboard_queue.flush()
+        # Drift: row endorsement ditulis tanpa counter, counter skill lain salah
+        SkillEndorsement.objects.create(skill=self.python, endorsed_by=User.objects.create(username='b'))
+        Skill.objects.filter(pk=self.go.pk).update(endorsement_count=5)
+
+        stdout = io.StringIO()
+        call_command('reconcile_endorsement_counts', dry_run=True, stdout=stdout)
+        self.assertIn('2 skill diperiksa, 2 drift', stdout.getvalue())
+        self.go.refresh_from_db()
+        self.assertEqual(self.go.endorsement_count, 5)
+
+        stdout = io.StringIO()
+        call_command('reconcile_endorsement_counts', batch_size=1, stdout=stdout)
+        self.assertIn('2 diperbaiki', stdout.getvalue())
+        self.assertEqual(dict(Skill.objects.values_list('nama', 'endorsement_count')), {'Python': 2, 'Go': 0})
+        self.assertEqual(
+            SkillEndorsementLeaderboard.objects.get(mahasiswa=self.owner, tag=self.python.tag).endorsements, 2,
+        )
+
+
+class LeaderboardQueueTest(TestCase):
+    """Leaderboard skill per prodi diperbarui dari antrian perubahan skill, endorsement dan profil"""
+
+    def setUp(self):
+        self.owner = create_mahasiswa('owner', 'L200001')
+        self.other = create_mahasiswa('other', 'L200002')
+        Mahasiswa.objects.filter(pk=self.other.pk).update(prodi='Manajemen')
+        self.other.refresh_from_db()
+        self.python = Skill.objects.create(mahasiswa=self.owner, nama='Python')
+        Skill.objects.create(mahasiswa=self.owner, nama='Go')
+        Skill.objects.create(mahasiswa=self.other, nama='python')
+        self.client = APIClient()
+        for username in ('a', 'b'):
+            self.client.force_authenticate(User.objects.create(username=username))
+            self.client.post(reverse('skill-endorse', args=[self.python.pk]))
+        leaderboard_queue.flush()
+
+    def top_skills(self, **params):
+        response = self.client.get(reverse('skill-leaderboard'), params)
+        return [(row['nama'], row['students'], row['endorsements']) for row in response.data['results']]
+
+    def test_leaderboards_per_prodi(self):
+        self.assertEqual(self.top_skills(), [('Python', 2, 2), ('Go', 1, 0)])
+        self.assertEqual(self.top_skills(prodi='Manajemen'), [('Python', 1, 0)])
+        self.assertEqual(self.top_skills(ordering='-endorsements')[0], ('Python', 2, 2))
+
+        response = self.client.get(reverse('skill-endorsement-leaderboard', args=[self.python.tag_id]))
+        self.assertEqual(
+            [(row['mahasiswa'], row['endorsements']) for row in response.data['results']],
+            [(self.owner.pk, 2), (self.other.pk, 0)],
+        )
+
+    def test_refreshed_when_profile_or_skills_change(self):
+        self.other.prodi = 'Informatika'
+        self.other.save()
+        self.owner.is_active = False
+        self.owner.save()
+        Skill.objects.create(mahasiswa=self.other, nama='SQL')
+        leaderboard_queue.flush()
+
+        self.assertEqual(sorted(self.top_skills()), [('Python', 1, 0), ('SQL', 1, 0)])
+        self.assertEqual(self.top_skills(prodi='Manajemen'), [])
+        self.assertEqual(sorted(self.top_skills(prodi='Informatika')), [('Python', 1, 0), ('SQL', 1, 0)])
+
+    def test_rebuild_matches_incremental(self):
+        expected = self.top_skills()
+        SkillLeaderboard.objects.all().delete()
+        SkillEndorsementLeaderboard.objects.all().delete()
+        call_command('rebuild_leaderboards', batch_size=1, stdout=io.StringIO())
+        self.assertEqual(self.top_skills(), expected)
+
+    def test_flush_on_exit_logs_failure(self):
+        with mock.patch.object(leaderboards.leaderboard_queue, 'flush', side_effect=OperationalError('database is down')), \
+                self.assertLogs('skills.leaderboards', 'ERROR'):
+            leaderboards._flush_on_exit()
+
+
+class SkillTagTest(TestCase):
+    """Kamus skill kanonik: nama & alias di-resolve ke SkillTag, backfill migrasi 0005"""
+
+    def setUp(self):
+        self.owner = create_mahasiswa('owner', 'L200001')
+        self.other = create_mahasiswa('other', 'L200002')
+
+    def test_names_and_aliases_resolve_to_one_tag(self):
+        python = Skill.objects.create(mahasiswa=self.owner, nama='Python')
+        spelled = Skill.objects.create(mahasiswa=self.other, nama='  PYTHON ')
+        self.assertEqual(spelled.tag_id, python.tag_id)
+
+        SkillTagAlias.objects.create(tag=python.tag, alias='Py')
+        self.assertEqual(Skill.objects.create(mahasiswa=self.other, nama='py').tag_id, python.tag_id)
+
+        # Nama diubah: tag di-resolve ulang (tag baru dibuat untuk nama yang belum dikenal)
+        spelled.nama = 'Rust'
+        spelled.save(update_fields=['nama'])
+        spelled.refresh_from_db()
+        self.assertEqual((spelled.tag.nama, spelled.nama_normalized), ('Rust', 'rust'))
+        self.assertEqual(SkillTag.objects.count(), 2)
+
+    def test_backfill_merges_spellings_and_aliases(self):
+        for mahasiswa, names in ((self.owner, ['Python', 'JS', 'Go']), (self.other, ['python', 'Python', 'JavaScript'])):
+            for nama in names:
+                Skill.objects.create(mahasiswa=mahasiswa, nama=nama)
+        # Kondisi sebelum migrasi: belum ada tag
+        Skill.objects.update(tag=None)
+        SkillTag.objects.all().delete()
+
+        fill_skill_tags = import_module('skills.migrations.0005_skill_tags').fill_skill_tags
+        fill_skill_tags(apps, None)
+
+        self.assertEqual(
+            sorted(SkillTag.objects.values_list('nama', 'nama_normalized')),
+            [('Go', 'go'), ('JavaScript', 'javascript'), ('Python', 'python')],
+        )
+        self.assertFalse(Skill.objects.filter(tag__isnull=True).exists())
+        tags = dict(Skill.objects.values_list('nama', 'tag__nama_normalized'))
+        self.assertEqual((tags['JS'], tags['python']), ('javascript', 'python'))
+        self.assertEqual(SkillTagAlias.objects.get(alias='js').tag.nama, 'JavaScript')
+        self.assertFalse(SkillTagAlias.objects.filter(alias='ts').exists())
+
+
+class SkillSuggestTest(TestCase):
+    """Autocomplete skill: prefix nama / awal kata / alias, urut jumlah pemakai; index dibangun ulang"""
+
+    def setUp(self):
+        django_cache.clear()
+        # Index in-process dari test lain bisa punya nomor versi yang sama
+        self.enterContext(mock.patch.object(suggest, '_index', None))
+        owner = create_mahasiswa('owner', 'L200001')
+        self.other = create_mahasiswa('other', 'L200002')
+        for mahasiswa, names in ((owner, ['JavaScript', 'Java', 'Machine Learning']), (self.other, ['Java'])):
+            for nama in names:
+                Skill.objects.create(mahasiswa=mahasiswa, nama=nama)
+        SkillTagAlias.objects.create(tag=SkillTag.objects.get(nama='JavaScript'), alias='JS')
+
+    def suggest(self, query, **params):
+        response = self.client.get(reverse('skill-suggest'), {'q': query, **params})
+        return [(row['nama'], row['count']) for row in response.data['results']]
+
+    def test_prefix_word_and_alias_matches(self):
+        self.assertEqual(self.suggest('jav'), [('Java', 2), ('JavaScript', 1)])
+        self.assertEqual(self.suggest('jav', limit=1), [('Java', 2)])
+        self.assertEqual(self.suggest('learn'), [('Machine Learning', 1)])
+        self.assertEqual(self.suggest(' js'), [('JavaScript', 1)])
+        self.assertEqual(self.suggest(''), [])
+
+    def test_index_rebuilt_for_new_tags(self):
+        self.assertEqual(self.suggest('ko'), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(mahasiswa=self.other, nama='Kotlin')
+        self.assertEqual(self.suggest('ko'), [('Kotlin', 1)])
+
+    def test_counts_refreshed_after_max_age(self):
+        self.suggest('ja')
+        with self.captureOnCommitCallbacks(execute=True):
+            Skill.objects.create(mahasiswa=self.other, nama='javascript')
+        # Tag lama: versi tidak naik, bobot frekuensi diperbarui setelah SKILL_SUGGEST_MAX_AGE
+        self.assertEqual(self.suggest('javas'), [('JavaScript', 1)])
+        with override_settings(SKILL_SUGGEST_MAX_AGE=0):
+            self.assertEqual(self.suggest('javas'), [('JavaScript', 2)])
@@ -4,6 +4,12 @@ from . import views
 urlpatterns = [
     path('', views.SkillListCreateView.as_view(), name='skill-list'),
     path('<int:pk>/', views.SkillDetailView.as_view(), name='skill-detail'),
+    path('suggest/', views.suggest_skills, name='skill-suggest'),
+    path('endorse/bulk/', views.bulk_endorse_skills, name='skill-endorse-bulk'),
+    path('leaderboard/', views.SkillLeaderboardView.as_view(), name='skill-leaderboard'),
+    path('leaderboard/<int:tag_id>/students/', views.SkillEndorsementLeaderboardView.as_view(),
+         name='skill-endorsement-leaderboard'),
+    path('<int:pk>/endorsements/', views.SkillEndorsementListView.as_view(), name='skill-endorsements'),
     path('<int:pk>/endorse/', views.endorse_skill, name='skill-endorse'),
     path('<int:pk>/remove-endorsement/', views.remove_endorsement, name='skill-remove-endorsement'),
 ]
@@ -1,21 +1,96 @@
-from rest_framework import generics, status
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery
+from django.shortcuts import get_object_or_404
+from rest_framework import filters, generics, status
 from rest_framework.decorators import api_view, permission_classes
-from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from rest_framework.permissions import AllowAny, IsAuthenticated, IsAuthenticatedOrReadOnly
 from rest_framework.response import Response
-from .models import Skill, SkillEndorsement
-from .serializers import SkillSerializer, SkillEndorsementSerializer
+from pusat.pagination import KeysetCursorPagination
+from .leaderboards import ALL_PRODI, leaderboard_queue
+from .models import (
+    Skill, SkillEndorsement, SkillEndorsementLeaderboard, SkillLeaderboard, SkillTag, recent_endorsements_prefetch,
+)
+from .suggest import suggest, DEFAULT_LIMIT as SUGGEST_DEFAULT_LIMIT, MAX_LIMIT as SUGGEST_MAX_LIMIT
+from .serializers import (
+    SkillSerializer, SkillEndorsementSerializer, SkillLeaderboardSerializer, SkillEndorsementLeaderboardSerializer,
+)
+
+MAX_BULK_ENDORSEMENTS = 100
 
 class SkillListCreateView(generics.ListCreateAPIView):
-    queryset = Skill.objects.all()
+    queryset = Skill.objects.prefetch_related(recent_endorsements_prefetch())
     serializer_class = SkillSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
 class SkillDetailView(generics.RetrieveUpdateDestroyAPIView):
-    queryset = Skill.objects.all()
+    queryset = Skill.objects.prefetch_related(recent_endorsements_prefetch())
     serializer_class = SkillSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
 
+class SkillEndorsementListView(generics.ListAPIView):
+    """Semua endorsement satu skill (paginated, terbaru dulu)"""
+    serializer_class = SkillEndorsementSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+
+    def get_queryset(self):
+        skill = get_object_or_404(Skill.objects.only('pk'), pk=self.kwargs['pk'])
+        return SkillEndorsement.objects.filter(skill=skill).select_related('endorsed_by').order_by('-created_at', '-id')
+
+
+class SkillLeaderboardView(generics.ListAPIView):
+    """
+    GET: Top skills (materialized) per prodi (?prodi=Informatika, default semua prodi).
+    ?ordering=-students (default) atau -endorsements; keyset pagination (?cursor=).
+    """
+    serializer_class = SkillLeaderboardSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetCursorPagination
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['students', 'endorsements']
+    ordering = ['-students']
+
+    def get_queryset(self):
+        prodi = self.request.query_params.get('prodi', ALL_PRODI).strip()
+        return SkillLeaderboard.objects.filter(prodi=prodi).select_related('tag')
+
+
+class SkillEndorsementLeaderboardView(generics.ListAPIView):
+    """
+    GET: Mahasiswa dengan endorsement terbanyak untuk satu skill (SkillTag), opsional ?prodi=.
+    Keyset pagination (?cursor=), urut -endorsements.
+    """
+    serializer_class = SkillEndorsementLeaderboardSerializer
+    permission_classes = [IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetCursorPagination
+    filter_backends = [filters.OrderingFilter]
+    ordering_fields = ['endorsements']
+    ordering = ['-endorsements']
+
+    def get_queryset(self):
+        tag = get_object_or_404(SkillTag.objects.only('pk'), pk=self.kwargs['tag_id'])
+        queryset = SkillEndorsementLeaderboard.objects.filter(tag=tag).select_related('mahasiswa')
+        prodi = self.request.query_params.get('prodi', '').strip()
+        if prodi:
+            queryset = queryset.filter(prodi=prodi)
+        return queryset
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def suggest_skills(request):
+    """Autocomplete nama skill untuk editor profil: ?q=<prefix>&limit=10, urut jumlah pemakai"""
+    query = request.GET.get('q', '')
+    try:
+        limit = max(1, min(int(request.GET.get('limit', SUGGEST_DEFAULT_LIMIT)), SUGGEST_MAX_LIMIT))
+    except ValueError:
+        limit = SUGGEST_DEFAULT_LIMIT
+    return Response({
+        'query': query,
+        'results': suggest(query, limit)
+    })
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def endorse_skill(request, pk):
@@ -36,10 +111,15 @@ def endorse_skill(request, pk):
         pass  # User doesn't have mahasiswa profile, allow endorsement
     
     # Create or check existing endorsement
-    endorsement, created = SkillEndorsement.objects.get_or_create(
-        skill=skill,
-        endorsed_by=request.user
-    )
+    with transaction.atomic():
+        endorsement, created = SkillEndorsement.objects.get_or_create(
+            skill=skill,
+            endorsed_by=request.user
+        )
+        if created:
+            Skill.objects.filter(pk=skill.pk).update(endorsement_count=F('endorsement_count') + 1)
+    if created:
+        leaderboard_queue.add(mahasiswa_id=skill.mahasiswa_id, tag_id=skill.tag_id)
     
     if not created:
         return Response({
@@ -54,6 +134,74 @@ def endorse_skill(request, pk):
     }, status=status.HTTP_201_CREATED)
 
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_endorse_skills(request):
+    """
+    Endorse beberapa skill sekaligus: {"skill_ids": [1, 2, 3]}.
+    Validasi (skill ada, bukan skill sendiri) untuk seluruh list dalam satu query join
+    yang sekaligus mengunci row skill, lalu satu bulk_create (ignore_conflicts) dan satu
+    UPDATE yang menghitung ulang endorsement_count dari tabel endorsement.
+    """
+    skill_ids = request.data.get('skill_ids')
+    if not isinstance(skill_ids, list) or not skill_ids:
+        return Response({'error': 'skill_ids must be a non-empty list'}, status=status.HTTP_400_BAD_REQUEST)
+    if len(skill_ids) > MAX_BULK_ENDORSEMENTS:
+        return Response({
+            'error': f'Maximum {MAX_BULK_ENDORSEMENTS} skills per request'
+        }, status=status.HTTP_400_BAD_REQUEST)
+    # bool adalah subclass int: true/false tidak boleh lolos sebagai id 1/0
+    if any(isinstance(skill_id, bool) or not isinstance(skill_id, int) for skill_id in skill_ids):
+        return Response({'error': 'skill_ids must contain integers'}, status=status.HTTP_400_BAD_REQUEST)
+    skill_ids = list(dict.fromkeys(skill_ids))
+
+    with transaction.atomic():
+        # Row skill dikunci (urut pk supaya tidak deadlock) sampai commit: request paralel untuk
+        # skill yang sama menunggu, jadi cek endorsement yang sudah ada, insert dan increment
+        # endorsement_count selalu konsisten
+        owners = {
+            pk: (user_id, mahasiswa_id, tag_id)
+            for pk, user_id, mahasiswa_id, tag_id in Skill.objects.select_for_update(of=('self',))
+            .filter(pk__in=skill_ids).order_by('pk')
+            .values_list('pk', 'mahasiswa__user_id', 'mahasiswa_id', 'tag_id')
+        }
+        missing = [skill_id for skill_id in skill_ids if skill_id not in owners]
+        if missing:
+            return Response({'error': 'Skill not found', 'skill_ids': missing}, status=status.HTTP_404_NOT_FOUND)
+        own = [skill_id for skill_id in skill_ids if owners[skill_id][0] == request.user.pk]
+        if own:
+            return Response({
+                'error': 'Cannot endorse your own skill',
+                'detail': 'You cannot endorse your own skills',
+                'skill_ids': own,
+            }, status=status.HTTP_400_BAD_REQUEST)
+
+        existing = set(
+            SkillEndorsement.objects.filter(endorsed_by=request.user, skill__in=skill_ids)
+            .values_list('skill_id', flat=True)
+        )
+        created = [skill_id for skill_id in skill_ids if skill_id not in existing]
+        # endorse_skill tidak mengunci row skill: endorsement yang sama bisa masuk di antara cek
+        # di atas dan insert. Konflik dilewati dan counter dihitung ulang, bukan F() + 1
+        SkillEndorsement.objects.bulk_create(
+            [SkillEndorsement(skill_id=skill_id, endorsed_by=request.user) for skill_id in created],
+            ignore_conflicts=True,
+        )
+        if created:
+            Skill.objects.filter(pk__in=created).update(endorsement_count=Subquery(
+                SkillEndorsement.objects.filter(skill=OuterRef('pk'))
+                .order_by().values('skill').annotate(total=Count('pk')).values('total')
+            ))
+    for skill_id in created:
+        leaderboard_queue.add(mahasiswa_id=owners[skill_id][1], tag_id=owners[skill_id][2])
+
+    return Response({
+        'message': f'{len(created)} skill(s) endorsed',
+        'created': created,
+        'already_endorsed': [skill_id for skill_id in skill_ids if skill_id in existing],
+    }, status=status.HTTP_201_CREATED if created else status.HTTP_200_OK)
+
+
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
 def remove_endorsement(request, pk):
@@ -61,7 +209,15 @@ def remove_endorsement(request, pk):
     try:
         skill = Skill.objects.get(pk=pk)
         endorsement = SkillEndorsement.objects.get(skill=skill, endorsed_by=request.user)
-        endorsement.delete()
+        with transaction.atomic():
+            deleted, _ = SkillEndorsement.objects.filter(pk=endorsement.pk).delete()
+            if deleted:
+                # Request paralel bisa sudah menghapus endorsement yang sama
+                Skill.objects.filter(pk=skill.pk, endorsement_count__gt=0).update(
+                    endorsement_count=F('endorsement_count') - 1
+                )
+        if deleted:
+            leaderboard_queue.add(mahasiswa_id=skill.mahasiswa_id, tag_id=skill.tag_id)
         return Response({'message': 'Endorsement removed'}, status=status.HTTP_200_OK)
     except Skill.DoesNotExist:
         return Response({'error': 'Skill not found'}, status=status.HTTP_404_NOT_FOUND)